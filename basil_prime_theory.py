@@ -10,11 +10,26 @@ Basil Prime Theory Library
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
-from typing import Dict, List, Tuple, Optional, Union
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 import warnings
 
+import gap_kernel
+import instrumentation
+import primality
+import prime_sieve
+from parallel_pool import default_chunksize, get_process_pool, overlapping_chunks, resolve_workers
+from damped_oscillator import energy_moments, oscillator_response
+from decimation import (DEFAULT_PIXEL_WIDTH, DEFAULT_SEGMENT_POINTS, EnvelopeDecimator,
+                        decimate, integrate_segments, time_grid)
+from result_tables import ResultTable, prediction_table
+from simulation_cache import get_simulation_cache
+from sphere_batch import SphereBatch
+from sphere_parameters import SphereParameters, real_prime
+
+# matplotlib و scipy يُستوردان عند الحاجة فقط (الرسم والحل العددي)
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
 __version__ = "1.0.0"
 __author__ = "Prof. Basil Yahya Abdullah"
 __email__ = "basil.prime.theory@example.com"
@@ -34,6 +49,15 @@ class BasilPrimeTheory:
     COSMIC_FREQUENCY = 1 / (4 * PI)  # التردد الكوني الأساسي
     ALPHA_COEFFICIENT = 1 / (4 * PI)  # معامل التكافؤ
     
+    # الكميات المنقولة من/إلى SphereParameters
+    PARAMETER_FIELDS = (
+        'prime', 'radius', 'charge', 'surface_area', 'frequency', 'angular_frequency',
+        'period', 'resistance', 'inductance', 'capacitance', 'voltage', 'LC_product',
+        'resonance_condition', 'resonance_error', 'natural_frequency', 'damping_factor',
+        'quality_factor', 'time_constant', 'quantum_energy', 'zero_point_energy',
+        'quantum_ratio', 'theoretical_quantum_ratio'
+    )
+    
     def __init__(self, prime: int, radius: float = 1.0, charge: float = 1.0):
         """
         تهيئة نموذج الكرة المتذبذبة لعدد أولي معين
@@ -53,24 +77,28 @@ class BasilPrimeTheory:
         # حساب المعاملات الأساسية
         self._calculate_parameters()
     
+    @np.errstate(over='ignore', divide='ignore', invalid='ignore')
     def _calculate_parameters(self):
         """حساب جميع المعاملات الفيزيائية والرياضية"""
         
+        # الأعداد الأولية الضخمة تُحسب كـ np.float64 فتفيض الكميات إلى inf أو 0
+        prime = real_prime(self.prime)
+        
         # المعاملات الأساسية
         self.surface_area = 4 * self.PI * self.radius**2
-        self.frequency = self.prime / self.PI
-        self.angular_frequency = 2 * self.prime
+        self.frequency = prime / self.PI
+        self.angular_frequency = 2 * prime
         self.period = 2 * self.PI / self.angular_frequency
         
         # المعاملات الكهربائية
-        self.resistance = np.sqrt(self.prime)
+        self.resistance = np.sqrt(prime)
         self.inductance = self.surface_area / (16 * self.PI**3 * self.charge)
-        self.capacitance = (4 * self.PI**3 * self.charge) / (self.surface_area * self.prime**2)
-        self.voltage = (self.surface_area * self.prime**2) / (4 * self.PI**3)
+        self.capacitance = (4 * self.PI**3 * self.charge) / (self.surface_area * prime**2)
+        self.voltage = (self.surface_area * prime**2) / (4 * self.PI**3)
         
         # التحقق من شرط الرنين
         self.LC_product = self.inductance * self.capacitance
-        self.resonance_condition = 1 / (4 * self.prime**2)
+        self.resonance_condition = 1 / (4 * prime**2)
         self.resonance_error = abs(self.LC_product - self.resonance_condition) / self.resonance_condition
         
         # المعاملات التفاضلية
@@ -80,10 +108,10 @@ class BasilPrimeTheory:
         self.time_constant = 2 * self.inductance / self.resistance
         
         # المعاملات الكمية
-        self.quantum_energy = 2 * self.HBAR * self.prime
+        self.quantum_energy = 2 * self.HBAR * prime
         self.zero_point_energy = self.HBAR * self.COSMIC_FREQUENCY / 2
         self.quantum_ratio = self.quantum_energy / self.zero_point_energy
-        self.theoretical_quantum_ratio = 16 * self.PI * self.prime
+        self.theoretical_quantum_ratio = 16 * self.PI * prime
     
     def differential_equation(self, t: float, y: np.ndarray) -> np.ndarray:
         """
@@ -96,7 +124,8 @@ class BasilPrimeTheory:
         return np.array([dQ_dt, d2Q_dt2])
     
     def solve_oscillation(self, duration: float = None, points: int = 1000, 
-                         initial_charge: float = None) -> Dict:
+                         initial_charge: float = None, solver: str = 'rk45',
+                         summary: bool = False, use_cache: bool = True) -> Dict:
         """
         حل المعادلة التفاضلية للتذبذب
         
@@ -104,35 +133,81 @@ class BasilPrimeTheory:
             duration: مدة المحاكاة (بالثواني)
             points: عدد النقاط الزمنية
             initial_charge: الشحنة الابتدائية
+            solver: طريقة الحل ('rk45' عددياً، 'analytic' بالحل المغلق الدقيق)
+            summary: إرجاع متوسط الطاقة وانحرافها فقط بصيغة مغلقة
+                     دون إنشاء السلاسل الزمنية (لا يحتاج إلى تكامل عددي)
+            use_cache: استخدام ذاكرة المحاكاة المشتركة (simulation_cache)
             
         Returns:
             نتائج المحاكاة التفاضلية
         """
+        if solver not in ('rk45', 'analytic'):
+            raise ValueError(f"Unknown solver: {solver!r} (expected 'rk45' or 'analytic')")
+        
         if duration is None:
             duration = 3 * self.period
         
         if initial_charge is None:
-            initial_charge = self.prime / (self.PI * np.sqrt(self.resistance**2))
+            # الأعداد الضخمة: R = inf فتصبح الشحنة الابتدائية NaN دون تحذيرات
+            with np.errstate(over='ignore', invalid='ignore'):
+                initial_charge = real_prime(self.prime) / (self.PI * np.sqrt(self.resistance**2))
+        
+        if not use_cache:
+            return self._simulate(duration, points, initial_charge, solver, summary)
+        
+        key = ('basil', int(self.prime), float(self.radius), float(self.charge),
+               float(duration), int(points), float(initial_charge),
+               'summary' if summary else solver)
+        return get_simulation_cache().get_or_compute(
+            key, lambda: self._simulate(duration, points, initial_charge, solver, summary)
+        )
+    
+    def _simulate(self, duration: float, points: int, initial_charge: float,
+                  solver: str, summary: bool) -> Dict:
+        """تنفيذ المحاكاة دون المرور بالذاكرة المؤقتة"""
+        if summary:
+            average_energy, energy_stability = energy_moments(
+                self.inductance, self.resistance, self.capacitance,
+                initial_charge, 0.0, duration, points
+            )
+            return {
+                'average_energy': float(average_energy),
+                'energy_stability': float(energy_stability),
+                'success': True
+            }
         
         t_span = (0, duration)
         t_eval = np.linspace(0, duration, points)
         initial_conditions = [initial_charge, 0.0]
         
-        solution = solve_ivp(
-            self.differential_equation,
-            t_span,
-            initial_conditions,
-            t_eval=t_eval,
-            method='RK45',
-            rtol=1e-8
-        )
-        
-        if not solution.success:
-            raise RuntimeError(f"Failed to solve differential equation: {solution.message}")
+        if solver == 'analytic':
+            time_values = t_eval
+            charge, current = oscillator_response(
+                self.inductance, self.resistance, self.capacitance,
+                initial_charge, 0.0, t_eval
+            )
+            success = True
+        else:
+            from scipy.integrate import solve_ivp
+            
+            solution = solve_ivp(
+                self.differential_equation,
+                t_span,
+                initial_conditions,
+                t_eval=t_eval,
+                method='RK45',
+                rtol=1e-8
+            )
+            
+            if not solution.success:
+                raise RuntimeError(f"Failed to solve differential equation: {solution.message}")
+            
+            time_values = solution.t
+            charge = solution.y[0]
+            current = solution.y[1]
+            success = solution.success
         
         # حساب المتغيرات المشتقة
-        charge = solution.y[0]
-        current = solution.y[1]
         voltage = charge / self.capacitance
         
         energy_L = 0.5 * self.inductance * current**2
@@ -140,7 +215,7 @@ class BasilPrimeTheory:
         total_energy = energy_L + energy_C
         
         return {
-            'time': solution.t,
+            'time': time_values,
             'charge': charge,
             'current': current,
             'voltage': voltage,
@@ -149,7 +224,7 @@ class BasilPrimeTheory:
             'total_energy': total_energy,
             'average_energy': np.mean(total_energy),
             'energy_stability': np.std(total_energy),
-            'success': solution.success
+            'success': success
         }
     
     def predict_next_prime(self, method: str = 'enhanced') -> Dict:
@@ -170,44 +245,37 @@ class BasilPrimeTheory:
     def _predict_enhanced(self) -> Dict:
         """خوارزمية التنبؤ المحسنة"""
         
-        # محاكاة النظام
-        solution = self.solve_oscillation()
+        # محاكاة النظام (ملخص الطاقة بالحل المغلق دون سلاسل زمنية)
+        with instrumentation.stage('basil.solve'):
+            solution = self.solve_oscillation(solver='analytic', summary=True)
         
         # حساب المعاملات للتنبؤ
-        gap_base = 2
-        quality_correction = int(self.quality_factor * 10) % 6
-        damping_correction = int(self.damping_factor * 1000) % 4
-        energy_correction = int(solution['average_energy'] * 1e6) % 8
-        stability_correction = int(solution['energy_stability'] * 1e6) % 3
-        
-        prime_mod = self.prime % 6
-        if prime_mod == 1:
-            prime_correction = 4
-        elif prime_mod == 5:
-            prime_correction = 2
-        else:
-            prime_correction = 6
-        
-        estimated_gap = (gap_base + quality_correction + damping_correction + 
-                        energy_correction + stability_correction) % prime_correction
-        
-        if estimated_gap < 2:
-            estimated_gap = 2
-        
-        # البحث عن العدد الأولي التالي
-        candidate = self.prime + estimated_gap
-        attempts = 0
-        max_attempts = 20
-        
-        while not self.is_prime(candidate) and attempts < max_attempts:
-            candidate += 1
-            attempts += 1
+        # (تصحيحات الجودة والتخميد والطاقة والاستقرار وباقي القسمة على 6: gap_kernel)
+        with instrumentation.stage('basil.corrections'):
+            estimated_gap = gap_kernel.estimated_gap(
+                self.prime, self.quality_factor, self.damping_factor,
+                solution['average_energy'], solution['energy_stability'],
+                gap_kernel.BASIL_ENERGY_SCALE)
+        
+        # البحث عن العدد الأولي التالي في نافذة المحاولات
+        # (تُغربل النافذة بالأعداد الأولية الصغيرة للأعداد الضخمة)
+        start = self.prime + estimated_gap
+        max_attempts = gap_kernel.MAX_ATTEMPTS
+        
+        with instrumentation.stage('basil.candidates'):
+            candidate = primality.first_prime_in(start, start + max_attempts)
+        attempts = max_attempts if candidate is None else candidate - start
+        instrumentation.count('basil.predictions')
+        instrumentation.count('basil.candidate_attempts', attempts)
         
         if attempts >= max_attempts:
-            candidate = self._get_next_prime_traditional()
+            instrumentation.count('basil.fallbacks')
+            with instrumentation.stage('basil.fallback'):
+                candidate = self._get_next_prime_traditional()
         
         # حساب مستوى الثقة
-        confidence = self._calculate_confidence()
+        with instrumentation.stage('basil.confidence'):
+            confidence = self._calculate_confidence()
         
         return {
             'current_prime': self.prime,
@@ -223,6 +291,71 @@ class BasilPrimeTheory:
             }
         }
     
+    @classmethod
+    def predict_next_prime_many(cls, primes, method: str = 'enhanced',
+                                radius: float = 1.0, charge: float = 1.0) -> Dict[str, np.ndarray]:
+        """
+        التنبؤ بالعدد الأولي التالي لمصفوفة كاملة من الأعداد الأولية
+        
+        يطابق predict_next_prime عنصراً بعنصر دون إنشاء نموذج أو محاكاة لكل
+        عدد: المعاملات من SphereBatch، وإحصاءات الطاقة بالصيغة المغلقة
+        المتجهية، والتصحيحات من gap_kernel، والبحث عن المرشحين من خريطة غربال.
+        
+        Args:
+            primes: مصفوفة الأعداد الأولية (int64)
+            method: طريقة التنبؤ ('enhanced', 'basic')
+            radius: نصف قطر الكرة
+            charge: الشحنة
+            
+        Returns:
+            قاموس مصفوفات: current_prime, predicted_next, gap, attempts,
+            confidence, fallback (اللجوء إلى الطريقة التقليدية)
+        """
+        primes = np.asarray(primes, dtype=np.int64)
+        
+        if method != 'enhanced':
+            predicted = np.array([primality.next_prime(p) for p in primes.ravel().tolist()],
+                                 dtype=np.int64).reshape(primes.shape)
+            return {
+                'current_prime': primes,
+                'predicted_next': predicted,
+                'gap': predicted - primes,
+                'attempts': np.zeros(primes.shape, dtype=np.int64),
+                'confidence': np.full(primes.shape, 0.5),
+                'fallback': np.zeros(primes.shape, dtype=np.bool_)
+            }
+        
+        batch = SphereBatch(primes, radius, charge)
+        
+        # ملخص الطاقة بنفس مدة ونقاط solve_oscillation الافتراضية
+        initial_charge = batch.prime / (cls.PI * np.sqrt(batch.resistance**2))
+        average_energy, energy_stability = energy_moments(
+            batch.inductance, batch.resistance, batch.capacitance,
+            initial_charge, 0.0, 3 * batch.period, 1000
+        )
+        
+        estimated_gaps = gap_kernel.estimated_gaps(
+            primes, batch.quality_factor, batch.damping_factor,
+            average_energy, energy_stability, gap_kernel.BASIL_ENERGY_SCALE
+        )
+        predicted, attempts, fallback = gap_kernel.search_candidates(primes, estimated_gaps)
+        
+        # مستوى الثقة (نفس _calculate_confidence)
+        p = batch.prime.astype(np.float64)
+        confidence = (np.minimum(1.0, 20.0 / p)
+                      + np.minimum(1.0, batch.quality_factor / 10.0)
+                      + np.maximum(0.1, 1.0 - batch.damping_factor)
+                      + np.maximum(0.1, 1.0 - batch.resonance_error)) / 4.0
+        
+        return {
+            'current_prime': primes,
+            'predicted_next': predicted,
+            'gap': predicted - primes,
+            'attempts': attempts,
+            'confidence': np.clip(confidence, 0.1, 1.0),
+            'fallback': fallback
+        }
+    
     def _predict_basic(self) -> Dict:
         """خوارزمية التنبؤ الأساسية"""
         next_prime = self._get_next_prime_traditional()
@@ -236,7 +369,7 @@ class BasilPrimeTheory:
     
     def _calculate_confidence(self) -> float:
         """حساب مستوى الثقة في التنبؤ"""
-        size_factor = min(1.0, 20.0 / self.prime)
+        size_factor = min(1.0, 20.0 / real_prime(self.prime))
         quality_factor = min(1.0, self.quality_factor / 10.0)
         damping_factor = max(0.1, 1.0 - self.damping_factor)
         resonance_factor = max(0.1, 1.0 - self.resonance_error)
@@ -246,26 +379,12 @@ class BasilPrimeTheory:
     
     def _get_next_prime_traditional(self) -> int:
         """الحصول على العدد الأولي التالي بالطريقة التقليدية"""
-        candidate = self.prime + 1
-        while not self.is_prime(candidate):
-            candidate += 1
-        return candidate
+        return primality.next_prime(self.prime)
     
     @staticmethod
     def is_prime(n: int) -> bool:
         """اختبار الأولية"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        
-        for i in range(3, int(np.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        
-        return True
+        return primality.is_prime(n)
     
     def get_properties(self) -> Dict:
         """الحصول على جميع خصائص النموذج"""
@@ -293,54 +412,127 @@ class BasilPrimeTheory:
             'theoretical_quantum_ratio': self.theoretical_quantum_ratio
         }
     
-    def plot_oscillations(self, duration: float = None, save_path: str = None) -> plt.Figure:
-        """رسم تذبذبات الكرة"""
-        
-        solution = self.solve_oscillation(duration)
-        
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        
-        # رسم الشحنة
-        axes[0, 0].plot(solution['time'] * 1000, solution['charge'] * 1e6, 'b-', linewidth=2)
-        axes[0, 0].set_title(f'Charge Q(t) - Prime {self.prime}')
-        axes[0, 0].set_xlabel('Time (ms)')
-        axes[0, 0].set_ylabel('Charge (μC)')
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        # رسم التيار
-        axes[0, 1].plot(solution['time'] * 1000, solution['current'] * 1000, 'r-', linewidth=2)
-        axes[0, 1].set_title(f'Current I(t) - Prime {self.prime}')
-        axes[0, 1].set_xlabel('Time (ms)')
-        axes[0, 1].set_ylabel('Current (mA)')
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        # رسم الطاقة
-        axes[1, 0].plot(solution['time'] * 1000, solution['energy_inductor'] * 1e6, 
-                       'purple', linewidth=2, label='Inductor')
-        axes[1, 0].plot(solution['time'] * 1000, solution['energy_capacitor'] * 1e6, 
-                       'orange', linewidth=2, label='Capacitor')
-        axes[1, 0].plot(solution['time'] * 1000, solution['total_energy'] * 1e6, 
-                       'k--', linewidth=2, label='Total')
-        axes[1, 0].set_title(f'Energy E(t) - Prime {self.prime}')
-        axes[1, 0].set_xlabel('Time (ms)')
-        axes[1, 0].set_ylabel('Energy (μJ)')
-        axes[1, 0].legend()
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        # المخطط الطوري
-        axes[1, 1].plot(solution['charge'] * 1e6, solution['current'] * 1000, 'g-', linewidth=2)
-        axes[1, 1].set_title(f'Phase Diagram - Prime {self.prime}')
-        axes[1, 1].set_xlabel('Charge (μC)')
-        axes[1, 1].set_ylabel('Current (mA)')
-        axes[1, 1].grid(True, alpha=0.3)
-        
-        plt.tight_layout()
+    def iter_oscillation_segments(self, duration: float = None, points: int = 1000,
+                                  initial_charge: float = None, solver: str = 'rk45',
+                                  segment_points: int = DEFAULT_SEGMENT_POINTS) -> Iterator[Dict]:
+        """
+        حل التذبذب على دفعات زمنية متتالية دون الاحتفاظ بالمسار الكامل
+        
+        Args:
+            duration: مدة المحاكاة (بالثواني)
+            points: عدد النقاط الزمنية الكلي
+            initial_charge: الشحنة الابتدائية
+            solver: 'rk45' أو 'analytic'
+            segment_points: عدد النقاط في كل دفعة
+            
+        Yields:
+            قاموس لكل دفعة بمنحنيات OSCILLATION_PLOT_FIELDS
+        """
+        if solver not in ('rk45', 'analytic'):
+            raise ValueError(f"Unknown solver: {solver!r} (expected 'rk45' or 'analytic')")
+        
+        if duration is None:
+            duration = 3 * self.period
+        
+        if initial_charge is None:
+            # الأعداد الضخمة: R = inf فتصبح الشحنة الابتدائية NaN دون تحذيرات
+            with np.errstate(over='ignore', invalid='ignore'):
+                initial_charge = real_prime(self.prime) / (self.PI * np.sqrt(self.resistance**2))
+        
+        if solver == 'analytic':
+            segments = (
+                (t, oscillator_response(self.inductance, self.resistance, self.capacitance,
+                                        initial_charge, 0.0, t))
+                for t in (time_grid(duration, points, start, min(start + segment_points, points))
+                          for start in range(0, points, segment_points))
+            )
+        else:
+            segments = integrate_segments(self.differential_equation, [initial_charge, 0.0],
+                                          duration, points, segment_points)
+        
+        for time_values, (charge, current) in segments:
+            energy_L = 0.5 * self.inductance * current**2
+            energy_C = 0.5 * charge**2 / self.capacitance
+            yield {
+                'time': time_values,
+                'charge': charge,
+                'current': current,
+                'energy_inductor': energy_L,
+                'energy_capacitor': energy_C,
+                'total_energy': energy_L + energy_C
+            }
+    
+    def oscillation_plot_data(self, duration: float = None, points: int = 1000,
+                              pixel_width: Optional[int] = DEFAULT_PIXEL_WIDTH,
+                              segment_points: Optional[int] = None) -> Dict:
+        """
+        بيانات رسم التذبذبات (تُمرر إلى draw_oscillations أو ReportPipeline)
+        
+        Args:
+            duration: مدة المحاكاة (بالثواني)
+            points: عدد النقاط الزمنية
+            pixel_width: عرض الرسم بالبكسل لاختصار المنحنيات الطويلة
+                         بغلاف min/max (None لتعطيل الاختصار)
+            segment_points: بث الحل على دفعات بهذا الحجم بدلاً من حله كاملاً
+            
+        Returns:
+            المنحنيات (مختصرة إذا تجاوزت النقاط ضعف عرض الرسم) والعدد الأولي
+        """
+        if segment_points is None:
+            solution = self.solve_oscillation(duration, points)
+            data = decimate(solution, OSCILLATION_PLOT_FIELDS, pixel_width)
+            data = {name: data[name] for name in OSCILLATION_PLOT_FIELDS}
+        else:
+            decimator = EnvelopeDecimator(points, OSCILLATION_PLOT_FIELDS, pixel_width)
+            for segment in self.iter_oscillation_segments(duration, points,
+                                                          segment_points=segment_points):
+                decimator.add(segment)
+            data = decimator.result()
+        data['prime'] = self.prime
+        return data
+    
+    def plot_oscillations(self, duration: float = None, save_path: str = None,
+                          points: int = 1000, pixel_width: Optional[int] = DEFAULT_PIXEL_WIDTH,
+                          segment_points: Optional[int] = None) -> 'plt.Figure':
+        """
+        رسم تذبذبات الكرة
+        
+        Args:
+            duration: مدة المحاكاة (بالثواني)
+            save_path: مسار حفظ الشكل
+            points: عدد النقاط الزمنية
+            pixel_width: عرض الرسم بالبكسل لاختصار المنحنيات (None لتعطيله)
+            segment_points: بث الحل على دفعات بهذا الحجم (للمسارات الطويلة جداً)
+        """
+        fig = draw_oscillations(self.oscillation_plot_data(duration, points, pixel_width,
+                                                           segment_points))
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=300, bbox_inches='tight')
         
         return fig
     
+    def to_parameters(self) -> SphereParameters:
+        """سجل معاملات مضغوط للنموذج (لتخزين أعداد كبيرة دون كائنات كاملة)"""
+        return SphereParameters.from_circuit(self.prime, self.radius, self.charge,
+                                             self.inductance, self.capacitance)
+    
+    @classmethod
+    def from_parameters(cls, parameters: SphereParameters) -> 'BasilPrimeTheory':
+        """
+        إعادة بناء النموذج من سجل معاملات دون إعادة الحساب
+        
+        Args:
+            parameters: سجل المعاملات
+            
+        Returns:
+            نموذج بنفس الكميات المشتقة
+        """
+        theory = cls.__new__(cls)
+        for name in cls.PARAMETER_FIELDS:
+            setattr(theory, name, getattr(parameters, name))
+        return theory
+    
     def __str__(self) -> str:
         """تمثيل نصي للكائن"""
         return f"BasilPrimeTheory(prime={self.prime}, accuracy={1-self.resonance_error:.6f})"
@@ -350,20 +542,128 @@ class BasilPrimeTheory:
         return f"BasilPrimeTheory(prime={self.prime}, radius={self.radius}, charge={self.charge})"
 
 # دوال مساعدة للمكتبة
+# المنحنيات التي يحتاجها رسم التذبذبات (الزمن ضمنها فيُحفظ طرفا كل خانة عند الاختصار)
+OSCILLATION_PLOT_FIELDS = ('time', 'charge', 'current', 'energy_inductor',
+                           'energy_capacitor', 'total_energy')
+
+
+def draw_oscillations(data: Dict) -> 'plt.Figure':
+    """
+    رسم تذبذبات الكرة من بياناتها
+    
+    Args:
+        data: ناتج oscillation_plot_data
+    
+    Returns:
+        الشكل
+    """
+    import matplotlib.pyplot as plt
+    
+    prime = data['prime']
+    time_ms = data['time'] * 1000
+    
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    
+    # رسم الشحنة
+    axes[0, 0].plot(time_ms, data['charge'] * 1e6, 'b-', linewidth=2)
+    axes[0, 0].set_title(f'Charge Q(t) - Prime {prime}')
+    axes[0, 0].set_xlabel('Time (ms)')
+    axes[0, 0].set_ylabel('Charge (μC)')
+    axes[0, 0].grid(True, alpha=0.3)
+    
+    # رسم التيار
+    axes[0, 1].plot(time_ms, data['current'] * 1000, 'r-', linewidth=2)
+    axes[0, 1].set_title(f'Current I(t) - Prime {prime}')
+    axes[0, 1].set_xlabel('Time (ms)')
+    axes[0, 1].set_ylabel('Current (mA)')
+    axes[0, 1].grid(True, alpha=0.3)
+    
+    # رسم الطاقة
+    axes[1, 0].plot(time_ms, data['energy_inductor'] * 1e6, 
+                   'purple', linewidth=2, label='Inductor')
+    axes[1, 0].plot(time_ms, data['energy_capacitor'] * 1e6, 
+                   'orange', linewidth=2, label='Capacitor')
+    axes[1, 0].plot(time_ms, data['total_energy'] * 1e6, 
+                   'k--', linewidth=2, label='Total')
+    axes[1, 0].set_title(f'Energy E(t) - Prime {prime}')
+    axes[1, 0].set_xlabel('Time (ms)')
+    axes[1, 0].set_ylabel('Energy (μJ)')
+    axes[1, 0].legend()
+    axes[1, 0].grid(True, alpha=0.3)
+    
+    # المخطط الطوري
+    axes[1, 1].plot(data['charge'] * 1e6, data['current'] * 1000, 'g-', linewidth=2)
+    axes[1, 1].set_title(f'Phase Diagram - Prime {prime}')
+    axes[1, 1].set_xlabel('Charge (μC)')
+    axes[1, 1].set_ylabel('Current (mA)')
+    axes[1, 1].grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    return fig
+
 def generate_primes(start: int, count: int) -> List[int]:
-    """توليد قائمة من الأعداد الأولية"""
-    primes = []
-    candidate = start
+    """توليد قائمة من الأعداد الأولية (غربال مقطعي يبدأ من أي إزاحة)"""
+    return prime_sieve.primes_from(start, count)
+
+def iter_predictions(prime_iterable: Iterable[int], method: str = 'enhanced') -> Iterator[Dict]:
+    """
+    تدفق سجلات التنبؤ لكل زوج متتالٍ، سجلاً واحداً في كل مرة
     
-    while len(primes) < count:
-        if BasilPrimeTheory.is_prime(candidate):
-            primes.append(candidate)
-        candidate += 1
+    يقبل أي مكرر (مثل prime_sieve.iter_primes) دون تخزين القائمة، ويمكن
+    تمرير الناتج مباشرة إلى prediction_metrics.PredictionAggregator.
     
-    return primes
+    Args:
+        prime_iterable: أعداد أولية متتالية
+        method: طريقة التنبؤ ('enhanced', 'basic')
+        
+    Yields:
+        سجل التنبؤ لكل زوج (الحالي، التالي)
+    """
+    primes = iter(prime_iterable)
+    current = next(primes, None)
+    
+    for actual_next in primes:
+        theory = BasilPrimeTheory(current)
+        prediction = theory.predict_next_prime(method)
+        predicted_next = prediction['predicted_next']
+        
+        yield {
+            'current': current,
+            'actual_next': actual_next,
+            'predicted_next': predicted_next,
+            'is_correct': predicted_next == actual_next,
+            'confidence': prediction['confidence']
+        }
+        current = actual_next
 
-def test_prediction_accuracy(primes_list: List[int], method: str = 'enhanced') -> Dict:
-    """اختبار دقة التنبؤ على قائمة من الأعداد الأولية"""
+def _prediction_records(primes_list: List[int], method: str = 'enhanced') -> List[Dict]:
+    """سجلات التنبؤ لكل زوج متتالٍ في القائمة"""
+    return list(iter_predictions(primes_list, method))
+
+def _prediction_table(primes_list: List[int], method: str = 'enhanced') -> ResultTable:
+    """سجلات التنبؤ كجدول عمودي (PREDICTION_SCHEMA) من predict_next_prime_many"""
+    primes = np.asarray(primes_list, dtype=np.int64)
+    predictions = BasilPrimeTheory.predict_next_prime_many(primes[:-1], method)
+    return prediction_table(primes[:-1], primes[1:],
+                            predictions['predicted_next'], predictions['confidence'])
+
+def test_prediction_accuracy(primes_list: List[int], method: str = 'enhanced',
+                             workers: Optional[int] = 1,
+                             chunksize: Optional[int] = None,
+                             columnar: bool = False) -> Dict:
+    """
+    اختبار دقة التنبؤ على قائمة من الأعداد الأولية
+    
+    Args:
+        primes_list: قائمة الأعداد الأولية المتتالية
+        method: طريقة التنبؤ ('enhanced', 'basic')
+        workers: عدد العمليات (1 للتنفيذ التسلسلي، None لجميع الأنوية)
+        chunksize: عدد الأزواج في كل مقطع يُرسل إلى عملية
+        columnar: إرجاع التنبؤات كجدول ResultTable عمودي بدلاً من قائمة قواميس
+        
+    Returns:
+        نتائج الاختبار (مطابقة للتنفيذ التسلسلي أياً كان عدد العمليات)
+    """
     
     results = {
         'predictions': [],
@@ -373,27 +673,39 @@ def test_prediction_accuracy(primes_list: List[int], method: str = 'enhanced') -
         'average_confidence': 0.0
     }
     
+    workers = resolve_workers(workers)
+    if columnar:
+        if workers == 1 or results['total_tests'] <= 1:
+            table = _prediction_table(primes_list, method)
+        else:
+            if chunksize is None:
+                chunksize = default_chunksize(results['total_tests'], workers)
+            chunks = overlapping_chunks(primes_list, chunksize)
+            pool = get_process_pool(workers)
+            table = ResultTable.concatenate(
+                list(pool.map(_prediction_table, chunks, [method] * len(chunks))))
+        
+        results['predictions'] = table
+        results['correct_predictions'] = int(np.count_nonzero(table['is_correct']))
+        results['accuracy'] = results['correct_predictions'] / results['total_tests']
+        results['average_confidence'] = float(table['confidence'].sum(dtype=np.float64)
+                                              / results['total_tests'])
+        return results
+    
+    if workers == 1 or results['total_tests'] <= 1:
+        results['predictions'] = _prediction_records(primes_list, method)
+    else:
+        if chunksize is None:
+            chunksize = default_chunksize(results['total_tests'], workers)
+        chunks = overlapping_chunks(primes_list, chunksize)
+        pool = get_process_pool(workers)
+        for records in pool.map(_prediction_records, chunks, [method] * len(chunks)):
+            results['predictions'].extend(records)
+    
     total_confidence = 0.0
     
-    for i in range(len(primes_list) - 1):
-        current = primes_list[i]
-        actual_next = primes_list[i + 1]
-        
-        theory = BasilPrimeTheory(current)
-        prediction = theory.predict_next_prime(method)
-        predicted_next = prediction['predicted_next']
-        
-        is_correct = predicted_next == actual_next
-        
-        results['predictions'].append({
-            'current': current,
-            'actual_next': actual_next,
-            'predicted_next': predicted_next,
-            'is_correct': is_correct,
-            'confidence': prediction['confidence']
-        })
-        
-        if is_correct:
+    for prediction in results['predictions']:
+        if prediction['is_correct']:
             results['correct_predictions'] += 1
         
         total_confidence += prediction['confidence']
@@ -0,0 +1,4 @@
+"""
+معايير أداء نظرية باسل للأعداد الأولية
+Basil Prime Theory Benchmarks
+"""
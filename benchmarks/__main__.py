@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+تشغيل معايير الأداء ومقارنتها بخط أساس
+Run the Benchmark Suite
+
+الاستخدام:
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json
+    python -m benchmarks --filter solve_oscillation --repeat 30
+"""
+
+import argparse
+import sys
+
+from benchmarks.cases import all_cases
+from benchmarks.harness import (DEFAULT_THRESHOLD, compare_results, format_ns, load_results,
+                                run_cases, save_results)
+
+
+def _print_result(name: str, result: dict):
+    print(f"{name:<64} {format_ns(result['median_ns']):>11} {format_ns(result['p95_ns']):>11}"
+          f" {result['number']:>8}x{result['repeat']}", flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmark the hot paths of the library')
+    parser.add_argument('--filter', dest='pattern', help='only run cases whose name contains this')
+    parser.add_argument('--repeat', type=int, default=15, help='samples per case')
+    parser.add_argument('--warmup', type=int, default=3, help='warmup rounds per case')
+    parser.add_argument('--save', help='write results to this JSON baseline')
+    parser.add_argument('--compare', help='compare against this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='median slowdown ratio flagged as a regression')
+    parser.add_argument('--list', action='store_true', help='list case names and exit')
+    args = parser.parse_args(argv)
+
+    cases = all_cases(args.pattern)
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return 0
+
+    print(f"{'case':<64} {'median':>11} {'p95':>11} {'samples':>10}")
+    results = run_cases(cases, repeat=args.repeat, warmup=args.warmup, progress=_print_result)
+
+    if args.save:
+        save_results(results, args.save)
+        print(f"\nBaseline saved: {args.save}")
+
+    if args.compare:
+        comparisons = compare_results(results, load_results(args.compare), args.threshold)
+        print(f"\n{'case':<64} {'baseline':>11} {'current':>11} {'ratio':>7}  status")
+        for c in comparisons:
+            baseline = format_ns(c['baseline_ns']) if c['baseline_ns'] is not None else '-'
+            ratio = f"{c['ratio']:.2f}" if c['ratio'] is not None else '-'
+            print(f"{c['name']:<64} {baseline:>11} {format_ns(c['median_ns']):>11} {ratio:>7}"
+                  f"  {c['status']}")
+
+        regressions = [c['name'] for c in comparisons if c['status'] == 'regression']
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above x{args.threshold:.2f}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+حالات قياس المسارات الساخنة
+Benchmark Cases for the Hot Paths
+
+حالات مُعلَّمة لاختبار الأولية عبر المقادير، وتوليد الأعداد الأولية،
+وحساب المعاملات، وحل التذبذب، والتنبؤ، واختبارات الدقة. الحالات التي
+تمر عبر ذاكرة المحاكاة تعطلها أثناء القياس حتى يُقاس الحساب نفسه.
+"""
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import gap_kernel
+import primality
+from basil_prime_theory import BasilPrimeTheory, generate_primes
+from basil_prime_theory import test_prediction_accuracy as basil_prediction_accuracy
+from enhanced_prediction_algorithm import EnhancedPrimePrediction
+from prime_counting import nth_prime, prime_pi
+from prime_gaps import gap_statistics
+from simulation_cache import (SimulationCache, configure_simulation_cache, get_simulation_cache,
+                              use_simulation_cache)
+
+from benchmarks.harness import BenchmarkCase
+
+# أعداد اختبار الأولية لكل مقدار (أولية ومركبة، مثبتة لقابلية التكرار)
+IS_PRIME_INPUTS: Dict[str, List[int]] = {
+    '1e3': [997, 999, 1009, 1011],
+    '1e6': [999983, 999981, 1000003, 1000001],
+    '1e9': [999999937, 999999939, 1000000007, 1000000011],
+    '1e12': [999999999989, 999999999991, 1000000000039, 1000000000041],
+    '1e18': [999999999999999989, 999999999999999991,
+             1000000000000000003, 1000000000000000001],
+    '2^89': [2**89 - 1, 2**89 + 1],
+    '2^521': [2**521 - 1, 2**521 + 1],
+}
+
+# (البداية، العدد) لتوليد الأعداد الأولية
+GENERATE_PRIMES_PARAMS = [(2, 1000), (10**6, 1000), (10**9, 1000), (10**12, 100)]
+
+PARAMETER_PRIMES = [7, 10007, 1000003]
+
+# (عدد النقاط، عدد الدورات، الطريقة) لحل التذبذب
+SOLVE_PARAMS = [
+    (100, 3.0, 'rk45'),
+    (1000, 3.0, 'rk45'),
+    (1000, 30.0, 'rk45'),
+    (1000, 3.0, 'analytic'),
+    (10000, 3.0, 'analytic'),
+    (10000, 30.0, 'analytic'),
+]
+
+PREDICT_PRIMES = [7, 97, 10007, 1000003]
+
+# أطوال قوائم اختبار الدقة (عدد الأعداد الأولية)
+ACCURACY_SIZES = [20, 100]
+
+# أحجام مصفوفات نواة تصحيحات الفجوة
+GAP_KERNEL_SIZES = [1000, 100000]
+
+# أحجام مصفوفات التنبؤ المجمع
+PREDICT_MANY_SIZES = [1000, 10000]
+
+# نطاقات [lo, hi) لإحصاءات الفجوات
+GAP_STATISTICS_RANGES = [(10**6, 2 * 10**6), (10**9, 10**9 + 10**7)]
+
+# حدود عد الأعداد الأولية وفهارس العدد الأولي النوني
+PRIME_PI_LIMITS = [10**9, 10**11]
+NTH_PRIME_INDICES = [10**7, 10**9]
+
+
+# الذاكرات التي كانت مستخدمة قبل الحالات الجارية (تُستعاد بعد كل حالة)
+_saved_caches: List[SimulationCache] = []
+
+
+def _disable_cache():
+    _saved_caches.append(get_simulation_cache())
+    configure_simulation_cache(maxsize=0)
+
+
+def _restore_cache():
+    use_simulation_cache(_saved_caches.pop())
+
+
+def _lazy(build: Callable[[], object]) -> Callable[[], object]:
+    """مدخلات تُبنى عند أول طلب فقط (لا تدفع --list و --filter كلفة بنائها)"""
+    built = []
+
+    def get():
+        if not built:
+            built.append(build())
+        return built[0]
+    return get
+
+
+def _uncached(name: str, func, group: str = '') -> BenchmarkCase:
+    """حالة تُقاس وذاكرة المحاكاة معطلة"""
+    return BenchmarkCase(name, func, setup=_disable_cache, teardown=_restore_cache, group=group)
+
+
+def _is_prime_cases() -> List[BenchmarkCase]:
+    cases = []
+    for label, numbers in IS_PRIME_INPUTS.items():
+        def run(numbers=numbers):
+            for n in numbers:
+                primality.is_prime(n)
+        cases.append(BenchmarkCase(f'is_prime[{label}]', run))
+    return cases
+
+
+def _generate_primes_cases() -> List[BenchmarkCase]:
+    return [BenchmarkCase(f'generate_primes[start={start},count={count}]',
+                          lambda start=start, count=count: generate_primes(start, count))
+            for start, count in GENERATE_PRIMES_PARAMS]
+
+
+def _calculate_parameters_cases() -> List[BenchmarkCase]:
+    cases = []
+    for p in PARAMETER_PRIMES:
+        theory = BasilPrimeTheory(p)
+        cases.append(BenchmarkCase(f'calculate_parameters[p={p}]', theory._calculate_parameters))
+    return cases
+
+
+def _solve_oscillation_cases() -> List[BenchmarkCase]:
+    cases = []
+    for points, periods, solver in SOLVE_PARAMS:
+        theory = BasilPrimeTheory(97)
+        duration = periods * theory.period
+
+        def run(theory=theory, duration=duration, points=points, solver=solver):
+            theory.solve_oscillation(duration=duration, points=points, solver=solver,
+                                     use_cache=False)
+        cases.append(BenchmarkCase(
+            f'solve_oscillation[points={points},periods={periods:g},solver={solver}]', run))
+    return cases
+
+
+def _predict_cases() -> List[BenchmarkCase]:
+    cases = []
+    enhanced = EnhancedPrimePrediction()
+    for p in PREDICT_PRIMES:
+        theory = BasilPrimeTheory(p)
+        cases.append(_uncached(f'predict_enhanced[p={p}]', theory._predict_enhanced))
+        cases.append(_uncached(f'predict_next_prime_enhanced[p={p}]',
+                               lambda p=p: enhanced.predict_next_prime_enhanced(p)))
+    return cases
+
+
+def _accuracy_cases() -> List[BenchmarkCase]:
+    cases = []
+    enhanced = _lazy(EnhancedPrimePrediction)
+    for size in ACCURACY_SIZES:
+        primes = _lazy(lambda size=size: generate_primes(11, size))
+        cases.append(_uncached(f'basil_test_prediction_accuracy[n={size}]',
+                               lambda primes=primes: basil_prediction_accuracy(primes())))
+        cases.append(_uncached(f'enhanced_test_prediction_accuracy[n={size}]',
+                               lambda primes=primes: enhanced().test_prediction_accuracy(primes())))
+    return cases
+
+
+def _gap_kernel_cases() -> List[BenchmarkCase]:
+    def build(size: int):
+        rng = np.random.default_rng(size)
+        primes = np.array(generate_primes(10**6, size), dtype=np.int64)
+        return (primes, rng.uniform(0, 10, size), rng.uniform(0, 1e3, size),
+                rng.uniform(0, 1e6, size), rng.uniform(0, 10, size))
+
+    cases = []
+    for size in GAP_KERNEL_SIZES:
+        inputs = _lazy(lambda size=size: build(size))
+        cases.append(BenchmarkCase(
+            f'estimated_gaps[n={size}]',
+            lambda inputs=inputs: gap_kernel.estimated_gaps(*inputs(), gap_kernel.BASIL_ENERGY_SCALE),
+            setup=lambda inputs=inputs: (inputs(), gap_kernel.warmup())))
+    return cases
+
+
+def _predict_many_cases() -> List[BenchmarkCase]:
+    cases = []
+    enhanced = _lazy(EnhancedPrimePrediction)
+    for size in PREDICT_MANY_SIZES:
+        primes = _lazy(lambda size=size: np.array(generate_primes(10**6, size), dtype=np.int64))
+        setup = lambda primes=primes: (primes(), gap_kernel.warmup())
+        cases.append(BenchmarkCase(
+            f'predict_next_prime_many[n={size}]',
+            lambda primes=primes: BasilPrimeTheory.predict_next_prime_many(primes()),
+            setup=setup))
+        cases.append(BenchmarkCase(
+            f'predict_many[n={size}]',
+            lambda primes=primes: enhanced().predict_many(primes()),
+            setup=setup))
+    return cases
+
+
+def _gap_statistics_cases() -> List[BenchmarkCase]:
+    return [BenchmarkCase(f'gap_statistics[lo={lo},hi={hi}]',
+                          lambda lo=lo, hi=hi: gap_statistics(lo, hi))
+            for lo, hi in GAP_STATISTICS_RANGES]
+
+
+def _prime_counting_cases() -> List[BenchmarkCase]:
+    return ([BenchmarkCase(f'prime_pi[x={x}]', lambda x=x: prime_pi(x)) for x in PRIME_PI_LIMITS]
+            + [BenchmarkCase(f'nth_prime[n={n}]', lambda n=n: nth_prime(n))
+               for n in NTH_PRIME_INDICES])
+
+
+def all_cases(pattern: Optional[str] = None) -> List[BenchmarkCase]:
+    """
+    جميع حالات القياس
+
+    Args:
+        pattern: نص جزئي لتصفية الحالات بالاسم (None لجميعها)؛ مدخلات الحالات
+            الكبيرة تُبنى عند تشغيلها فقط
+
+    Returns:
+        قائمة الحالات بترتيب ثابت
+    """
+    cases = (_is_prime_cases() + _generate_primes_cases() + _calculate_parameters_cases()
+             + _solve_oscillation_cases() + _predict_cases() + _accuracy_cases()
+             + _gap_kernel_cases() + _predict_many_cases() + _gap_statistics_cases()
+             + _prime_counting_cases())
+    if pattern:
+        cases = [case for case in cases if pattern in case.name]
+    return cases
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+أداة قياس الأداء القابلة للتكرار
+Reproducible Benchmark Harness
+
+- تسخين قبل القياس مع معايرة عدد التكرارات الداخلية
+- perf_counter_ns مع إيقاف جامع النفايات أثناء كل عينة
+- عينات متكررة مع الوسيط و p95
+- حفظ خط أساس JSON ومقارنة تشغيل لاحق به لكشف التراجعات
+"""
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# أدنى زمن لكل عينة بعد المعايرة (نانوثانية)
+MIN_SAMPLE_NS = 2_000_000
+
+# نسبة التباطؤ التي تُعد تراجعاً عند المقارنة بخط الأساس
+DEFAULT_THRESHOLD = 1.10
+
+
+class BenchmarkCase:
+    """حالة قياس واحدة"""
+
+    def __init__(self, name: str, func: Callable[[], object],
+                 setup: Optional[Callable[[], None]] = None,
+                 teardown: Optional[Callable[[], None]] = None,
+                 group: str = ''):
+        """
+        Args:
+            name: اسم الحالة (فريد، مثل 'is_prime[1e9]')
+            func: الدالة المقاسة (دون معاملات)
+            setup: تُستدعى مرة قبل التسخين
+            teardown: تُستدعى مرة بعد القياس
+            group: اسم المجموعة للتصفية والعرض
+        """
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.teardown = teardown
+        self.group = group or name.split('[')[0]
+
+    def __repr__(self) -> str:
+        return f"BenchmarkCase({self.name!r})"
+
+
+def _percentile(sorted_samples: List[float], fraction: float) -> float:
+    """النسبة المئوية بالاستيفاء الخطي على عينات مرتبة"""
+    position = fraction * (len(sorted_samples) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    weight = position - lower
+    return sorted_samples[lower] * (1 - weight) + sorted_samples[upper] * weight
+
+
+def _time_number(func: Callable[[], object], number: int) -> int:
+    """زمن number استدعاء متتالٍ بالنانوثانية مع إيقاف جامع النفايات"""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        return time.perf_counter_ns() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def run_case(case: BenchmarkCase, repeat: int = 15, warmup: int = 3) -> Dict:
+    """
+    قياس حالة واحدة
+
+    Args:
+        case: حالة القياس
+        repeat: عدد العينات
+        warmup: عدد جولات التسخين
+
+    Returns:
+        إحصاءات زمن الاستدعاء الواحد بالنانوثانية
+    """
+    if case.setup is not None:
+        case.setup()
+    try:
+        # التسخين مع معايرة عدد الاستدعاءات لكل عينة
+        number = 1
+        for _ in range(max(warmup, 1)):
+            elapsed = _time_number(case.func, number)
+            while elapsed < MIN_SAMPLE_NS and number < 1_000_000:
+                number *= 2 if elapsed * 10 > MIN_SAMPLE_NS else 10
+                elapsed = _time_number(case.func, number)
+
+        samples = sorted(_time_number(case.func, number) / number for _ in range(repeat))
+    finally:
+        if case.teardown is not None:
+            case.teardown()
+
+    return {
+        'group': case.group,
+        'median_ns': statistics.median(samples),
+        'p95_ns': _percentile(samples, 0.95),
+        'min_ns': samples[0],
+        'mean_ns': statistics.fmean(samples),
+        'stdev_ns': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def run_cases(cases: List[BenchmarkCase], repeat: int = 15, warmup: int = 3,
+              progress: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+    """
+    قياس مجموعة حالات وإرجاع وثيقة نتائج قابلة للحفظ كخط أساس
+
+    Args:
+        cases: حالات القياس
+        repeat: عدد العينات لكل حالة
+        warmup: عدد جولات التسخين
+        progress: دالة تُستدعى بعد كل حالة (الاسم، النتيجة)
+    """
+    results = {}
+    for case in cases:
+        results[case.name] = run_case(case, repeat=repeat, warmup=warmup)
+        if progress is not None:
+            progress(case.name, results[case.name])
+    return {'meta': environment_info(), 'results': results}
+
+
+def environment_info() -> Dict:
+    """معلومات البيئة المرفقة بكل تشغيل"""
+    info = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine()
+    }
+    try:
+        import numpy
+        info['numpy'] = numpy.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def save_results(results: Dict, path: str):
+    """حفظ النتائج كخط أساس JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict:
+    """قراءة خط أساس JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current: Dict, baseline: Dict,
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    مقارنة الوسيط الحالي بخط الأساس لكل حالة مشتركة
+
+    Args:
+        current: نتائج التشغيل الحالي
+        baseline: نتائج خط الأساس
+        threshold: نسبة التباطؤ التي تُعد تراجعاً (1.10 = أبطأ بـ 10%)
+
+    Returns:
+        قائمة مقارنات بالحالة 'regression' أو 'improvement' أو 'unchanged' أو 'new'
+    """
+    comparisons = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            comparisons.append({'name': name, 'status': 'new', 'ratio': None,
+                                'median_ns': result['median_ns'], 'baseline_ns': None})
+            continue
+
+        ratio = result['median_ns'] / base['median_ns']
+        if ratio > threshold:
+            status = 'regression'
+        elif ratio < 1 / threshold:
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+        comparisons.append({'name': name, 'status': status, 'ratio': ratio,
+                            'median_ns': result['median_ns'], 'baseline_ns': base['median_ns']})
+    return comparisons
+
+
+def format_ns(value: float) -> str:
+    """تنسيق زمن بالنانوثانية بوحدة مناسبة"""
+    for unit, scale in (('s', 1e9), ('ms', 1e6), ('us', 1e3)):
+        if value >= scale:
+            return f"{value / scale:.3f}{unit}"
+    return f"{value:.0f}ns"
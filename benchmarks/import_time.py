@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+معيار زمن الاستيراد البارد لكل وحدة
+Cold-Start Import Time Benchmark
+
+يشغل مفسراً جديداً لكل عينة ويقيس زمن `import <module>` وحده داخله
+(دون زمن بدء المفسر)، ويسجل أي وحدة ثقيلة (matplotlib، scipy، pandas)
+جلبها الاستيراد. يفيد في مراقبة تكلفة بدء العمليات العاملة قصيرة العمر.
+
+الاستخدام:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 20 --json import_times.json basil_prime_theory
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+DEFAULT_MODULES = (
+    'primality',
+    'prime_sieve',
+    'sphere_batch',
+    'basil_prime_theory',
+    'differential_sphere_model',
+    'enhanced_prediction_algorithm',
+    'final_methods_comparison',
+    'large_primes_test',
+    'interactive_demo',
+)
+
+# الوحدات الثقيلة التي لا ينبغي أن يجلبها الاستيراد (تُستورد عند الحاجة فقط)
+HEAVY_MODULES = ('matplotlib', 'scipy', 'pandas', 'numba', 'pyarrow')
+
+_PROBE = '''
+import sys, time
+start = time.perf_counter_ns()
+import {module}
+elapsed = time.perf_counter_ns() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ",".join(heavy))
+'''
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_module(module: str, repeat: int = 10) -> Dict:
+    """
+    قياس زمن الاستيراد البارد لوحدة واحدة
+
+    Args:
+        module: اسم الوحدة
+        repeat: عدد العينات (مفسر جديد لكل عينة)
+
+    Returns:
+        الوسيط والحد الأدنى و p95 بالمللي ثانية، والوحدات الثقيلة المستوردة
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env.pop('BASIL_PRIME_TABLE', None)
+
+    samples: List[float] = []
+    heavy: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout.split()
+        samples.append(int(output[0]) / 1e6)
+        heavy = output[1].split(',') if len(output) > 1 else []
+
+    samples.sort()
+    return {
+        'module': module,
+        'median_ms': statistics.median(samples),
+        'min_ms': samples[0],
+        'p95_ms': samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))],
+        'samples': repeat,
+        'heavy_imports': heavy
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Cold-start import time per module')
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES))
+    parser.add_argument('--repeat', type=int, default=10, help='fresh interpreters per module')
+    parser.add_argument('--json', dest='json_path', help='write results to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = [measure_module(module, args.repeat) for module in args.modules]
+
+    print(f"{'module':<32} {'median':>10} {'min':>10} {'p95':>10}  heavy imports")
+    for r in results:
+        print(f"{r['module']:<32} {r['median_ms']:>8.1f}ms {r['min_ms']:>8.1f}ms "
+              f"{r['p95_ms']:>8.1f}ms  {', '.join(r['heavy_imports']) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version, 'results': results}, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+خدمة الحاسبة المحلية
+Local Calculator Service
+
+خدمة HTTP محلية مبنية على asyncio تعرض دوال BasilPrimeCalculator كنقاط
+JSON. الطلبات المتزامنة تُجمع خلال نافذة قصيرة (بضع ميلي ثوانٍ) في دفعة
+واحدة تُحسب متجهياً، والأعداد الأولية المتكررة تُخدم من ذاكرة LRU.
+لا تحتاج أي خدمة خارجية، وتسمح بطلبات CORS حتى تستدعيها
+prime_calculator_demo.html مباشرة من المتصفح.
+
+النقاط:
+    GET  /api/properties?prime=7        calculate_physical_properties
+    GET  /api/predict?prime=7           predict_next_prime
+    GET  /api/resonance?prime=7         verify_resonance_condition
+    POST /api/<endpoint>  {"prime": 7} أو {"primes": [7, 11, 13]}
+    GET  /api/stats                     إحصاءات الذاكرة والدفعات
+    GET  /health
+
+التشغيل:
+    python calculator_service.py --port 8765
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import instrumentation
+from interactive_demo import BasilPrimeCalculator
+from simulation_cache import LRUCache
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# نافذة تجميع الطلبات وأقصى حجم للدفعة
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 256
+
+DEFAULT_CACHE_SIZE = 4096
+
+# أقصى عدد من الأعداد في طلب POST واحد وأقصى حجم للجسم
+MAX_PRIMES_PER_REQUEST = 10000
+MAX_BODY_BYTES = 1 << 20
+
+# أقصى عدد من الأرقام العشرية للعدد المدخل (الأعداد الأكبر تُرفض)
+MAX_DIGITS = 200
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Max-Age': '86400',
+}
+
+_REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 413: 'Payload Too Large',
+            422: 'Unprocessable Entity', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """خطأ في الطلب يُعاد للعميل برمز الحالة المعطى"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    تجميع الطلبات المتزامنة في دفعات لكل نقطة
+
+    أول طلب في دفعة فارغة يبدأ نافذة زمنية قصيرة؛ عند انتهائها أو امتلاء
+    الدفعة تُحسب الأعداد المختلفة مرة واحدة بالدالة المجمعة للنقطة،
+    وتُخزن النتائج في ذاكرة LRU.
+    """
+
+    def __init__(self, endpoints: Dict, cache: LRUCache,
+                 window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_MAX_BATCH):
+        """
+        Args:
+            endpoints: اسم النقطة ← دالة مجمعة (قائمة أعداد → قائمة نتائج)
+            cache: ذاكرة النتائج المشتركة
+            window: نافذة التجميع بالثواني
+            max_batch: أقصى عدد من الأعداد المختلفة في دفعة
+        """
+        self.endpoints = endpoints
+        self.cache = cache
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, Dict[int, asyncio.Future]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self.batches = 0
+        self.batched_items = 0
+        self.largest_batch = 0
+
+    async def submit(self, endpoint: str, prime: int) -> Dict:
+        """نتيجة نقطة لعدد واحد (من الذاكرة أو من الدفعة القادمة)"""
+        key = (endpoint, prime)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        pending = self._pending.setdefault(endpoint, {})
+        future = pending.get(prime)
+        if future is None:
+            # الطلبات المتزامنة لنفس العدد تنتظر نفس النتيجة
+            future = pending[prime] = loop.create_future()
+            if len(pending) >= self.max_batch:
+                self._flush(endpoint)
+            elif endpoint not in self._timers:
+                self._timers[endpoint] = loop.call_later(self.window, self._flush, endpoint)
+        return await asyncio.shield(future)
+
+    async def submit_many(self, endpoint: str, primes: List[int]) -> List[Dict]:
+        """نتائج نقطة لعدة أعداد بنفس ترتيبها"""
+        return list(await asyncio.gather(*(self.submit(endpoint, p) for p in primes)))
+
+    def _flush(self, endpoint: str):
+        """حساب الدفعة المعلقة لنقطة في خيط منفصل حتى لا تتوقف الحلقة"""
+        timer = self._timers.pop(endpoint, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(endpoint, None)
+        if not pending:
+            return
+
+        self.batches += 1
+        self.batched_items += len(pending)
+        self.largest_batch = max(self.largest_batch, len(pending))
+        instrumentation.count('service.batches')
+        instrumentation.count('service.batched_items', len(pending))
+
+        loop = asyncio.get_running_loop()
+        primes = list(pending)
+        task = loop.run_in_executor(None, self._compute, endpoint, primes)
+        task.add_done_callback(lambda done: self._resolve(endpoint, pending, done))
+
+    def _compute(self, endpoint: str, primes: List[int]) -> List:
+        """
+        نتائج الدفعة بترتيب الأعداد
+
+        إذا فشلت الدفعة يُحسب كل عدد وحده، فيحل الاستثناء محل نتيجة العدد
+        المسبب فقط ولا يفشل بقية المنتظرين في النافذة نفسها.
+        """
+        function = self.endpoints[endpoint]
+        with instrumentation.stage(f'service.{endpoint}'):
+            try:
+                return function(primes)
+            except Exception as exc:
+                if len(primes) == 1:
+                    return [exc]
+                instrumentation.count('service.batch_failures')
+
+            results = []
+            for prime in primes:
+                try:
+                    results.append(function([prime])[0])
+                except Exception as exc:
+                    results.append(exc)
+            return results
+
+    def _resolve(self, endpoint: str, pending: Dict[int, asyncio.Future], done: asyncio.Future):
+        """توزيع نتائج الدفعة على المنتظرين وتخزينها (الأخطاء لا تُخزن)"""
+        if done.exception() is not None:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(done.exception())
+            return
+
+        for (prime, future), result in zip(pending.items(), done.result()):
+            if isinstance(result, Exception):
+                if not future.done():
+                    future.set_exception(result)
+                continue
+            self.cache.put((endpoint, prime), result)
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        """إحصاءات الدفعات"""
+        return {
+            'batches': self.batches,
+            'batched_items': self.batched_items,
+            'largest_batch': self.largest_batch,
+            'mean_batch': self.batched_items / self.batches if self.batches else 0.0,
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch
+        }
+
+
+class CalculatorService:
+    """خدمة HTTP للحاسبة مع التجميع والذاكرة المؤقتة"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_MAX_BATCH,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            host: عنوان الاستماع (محلي افتراضياً)
+            port: المنفذ (0 لاختيار منفذ حر)
+            window: نافذة التجميع بالثواني
+            max_batch: أقصى حجم للدفعة
+            cache_size: سعة ذاكرة النتائج (0 يعطلها)
+        """
+        self.host = host
+        self.port = port
+        self.calculator = BasilPrimeCalculator()
+        self.cache = LRUCache(cache_size)
+        self.batcher = MicroBatcher({
+            'properties': self._properties_many,
+            'predict': self.calculator.predict_next_prime_many,
+            'resonance': self.calculator.verify_resonance_condition_many,
+        }, self.cache, window, max_batch)
+        self.requests = 0
+        self.started = time.time()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _properties_many(self, primes: List[int]) -> List[Dict]:
+        """الخصائص الفيزيائية (للأعداد الأولية فقط، كما في الحاسبة التفاعلية)"""
+        valid = [p for p in primes if self.calculator.is_prime(p)]
+        props = dict(zip(valid, self.calculator.calculate_physical_properties_many(valid)))
+        return [props.get(p, {'error': f'{p} is not a prime number'}) for p in primes]
+
+    async def start(self) -> Tuple[str, int]:
+        """
+        بدء الاستماع
+
+        Returns:
+            (العنوان، المنفذ الفعلي)
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self):
+        """بدء الخدمة والعمل حتى الإلغاء"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """إيقاف الاستماع"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """معالجة اتصال واحد (عدة طلبات مع keep-alive)"""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = await self.dispatch(method, target, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except RequestError as exc:
+            writer.write(self._response(exc.status, {'error': str(exc)}, False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader):
+        """قراءة طلب HTTP/1.1: سطر الطلب والرؤوس والجسم (Content-Length)"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split()
+        except ValueError:
+            raise RequestError(400, 'Malformed request line')
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise RequestError(400, 'Invalid Content-Length')
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise RequestError(413, 'Request body too large')
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, headers, body
+
+    @staticmethod
+    def _response(status: int, payload: Optional[Dict], keep_alive: bool) -> bytes:
+        """بناء استجابة JSON مع رؤوس CORS"""
+        body = b'' if payload is None else json.dumps(_finite_json(payload)).encode('utf-8')
+        headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+            **CORS_HEADERS,
+        }
+        head = f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        return (head + '\r\n').encode('latin-1') + body
+
+    async def dispatch(self, method: str, target: str, body: bytes = b'') -> Tuple[int, Optional[Dict]]:
+        """
+        توجيه طلب إلى النقطة المناسبة
+
+        Args:
+            method: طريقة HTTP
+            target: المسار مع سلسلة الاستعلام
+            body: جسم الطلب
+
+        Returns:
+            (رمز الحالة، الحمولة)
+        """
+        self.requests += 1
+        instrumentation.count('service.requests')
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+
+        if method == 'OPTIONS':
+            return 204, None
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/api/stats':
+            return 200, self.stats()
+
+        endpoint = path[len('/api/'):] if path.startswith('/api/') else None
+        if endpoint not in self.batcher.endpoints:
+            return 404, {'error': f'Unknown endpoint: {url.path}'}
+
+        try:
+            if method == 'GET':
+                values = parse_qs(url.query).get('prime')
+                if not values:
+                    raise RequestError(400, "Missing query parameter 'prime'")
+                result = await self.batcher.submit(endpoint, _parse_prime(values[0]))
+                return (422 if 'error' in result else 200), result
+
+            if method == 'POST':
+                request = _parse_body(body)
+                if 'primes' in request:
+                    primes = request['primes']
+                    if not isinstance(primes, list) or len(primes) > MAX_PRIMES_PER_REQUEST:
+                        raise RequestError(
+                            400, f"'primes' must be a list of at most {MAX_PRIMES_PER_REQUEST} integers")
+                    results = await self.batcher.submit_many(endpoint, [_parse_prime(p) for p in primes])
+                    return 200, {'results': results}
+                if 'prime' in request:
+                    result = await self.batcher.submit(endpoint, _parse_prime(request['prime']))
+                    return (422 if 'error' in result else 200), result
+                raise RequestError(400, "Request body needs 'prime' or 'primes'")
+
+            return 405, {'error': f'Method not allowed: {method}'}
+        except RequestError as exc:
+            return exc.status, {'error': str(exc)}
+        except Exception as exc:
+            return 500, {'error': f'{type(exc).__name__}: {exc}'}
+
+    def stats(self) -> Dict:
+        """إحصاءات الخدمة"""
+        return {
+            'requests': self.requests,
+            'uptime_s': time.time() - self.started,
+            'cache': self.cache.stats(),
+            'batching': self.batcher.stats()
+        }
+
+
+def _finite_json(value):
+    """القيم غير المنتهية (فيض معاملات الأعداد الأولية الضخمة) تصبح null فيبقى JSON صالحاً"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {name: _finite_json(item) for name, item in value.items()}
+    if isinstance(value, list):
+        return [_finite_json(item) for item in value]
+    return value
+
+
+def _parse_prime(value) -> int:
+    """تحويل المدخل إلى عدد صحيح ≥ 2 (نص أو عدد JSON)"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise RequestError(400, f'Invalid integer: {value!r}')
+    text = str(value).strip()
+    if len(text) > MAX_DIGITS or not text.lstrip('+-').isdigit():
+        raise RequestError(400, f'Invalid integer: {value!r}')
+    prime = int(text)
+    if prime < 2:
+        raise RequestError(400, 'Please enter a number >= 2')
+    return prime
+
+
+def _parse_body(body: bytes) -> Dict:
+    try:
+        request = json.loads(body.decode('utf-8') or '{}')
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise RequestError(400, f'Invalid JSON body: {exc}')
+    if not isinstance(request, dict):
+        raise RequestError(400, 'JSON body must be an object')
+    return request
+
+
+def main(argv=None) -> int:
+    """تشغيل الخدمة من سطر الأوامر"""
+    parser = argparse.ArgumentParser(description='Local HTTP service for the Basil prime calculator')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='bind address (default: localhost only)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--batch-window-ms', type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help='how long to collect concurrent requests into one batch')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help='LRU capacity for computed results (0 disables)')
+    args = parser.parse_args(argv)
+
+    service = CalculatorService(args.host, args.port, args.batch_window_ms / 1000,
+                                args.max_batch, args.cache_size)
+
+    async def run():
+        host, port = await service.start()
+        print(f"Basil calculator service on http://{host}:{port}/ (Ctrl+C to stop)")
+        await service.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
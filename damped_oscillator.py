@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+الحل التحليلي للمذبذب المخمد
+Closed-Form Damped Oscillator
+
+الحل الدقيق للمعادلة L·Q'' + R·Q' + Q/C = 0 ذات المعاملات الثابتة
+في الحالات الثلاث: تحت المخمد، المخمد الحرج، وفوق المخمد.
+
+أستاذ باسل يحيى عبدالله
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+UNDERDAMPED = 'underdamped'
+CRITICALLY_DAMPED = 'critically_damped'
+OVERDAMPED = 'overdamped'
+
+
+def damping_regime(L: float, R: float, C: float) -> str:
+    """تحديد نوع التخميد من مميز المعادلة المميزة"""
+    gamma = R / (2 * L)
+    omega_0_squared = 1 / (L * C)
+    if gamma**2 < omega_0_squared:
+        return UNDERDAMPED
+    if gamma**2 == omega_0_squared:
+        return CRITICALLY_DAMPED
+    return OVERDAMPED
+
+
+def _decay_basis(gamma, omega_0_squared, t) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    دالتا الأساس المضروبتان في e^(-γt)
+
+    Q(t) = q0·c(t) + (i0 + γ·q0)·s(t)
+    I(t) = i0·c(t) - (ω0²·q0 + γ·i0)·s(t)
+
+    حيث c = e^(-γt)·cos(ω_d t) و s = e^(-γt)·sin(ω_d t)/ω_d في الحالة تحت المخمدة،
+    ونظيراتها الزائدية أو الحدية في الحالتين الأخريين.
+    """
+    discriminant = gamma**2 - omega_0_squared
+    beta = np.sqrt(np.abs(discriminant))
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        decay = np.exp(-gamma * t)
+
+        # تحت المخمد: جذران مركبان مترافقان
+        c_under = decay * np.cos(beta * t)
+        s_under = decay * np.sin(beta * t) / beta
+
+        # فوق المخمد: جذران حقيقيان r1 = -ω0²/(γ+β) و r2 = -(γ+β)
+        # بصيغة خالية من الطرح الكارثي
+        fast = np.exp(-(gamma + beta) * t)
+        slow = np.exp(-omega_0_squared / (gamma + beta) * t)
+        c_over = 0.5 * (slow + fast)
+        # s = (e^(r1 t) - e^(r2 t))/(2β) = slow·(1 - e^(-2βt))/(2β): محدودة لكل t
+        # (الصيغة fast·(e^(2βt) - 1) تفيض إلى inf أو 0·∞ لأزمنة طويلة)
+        s_over = -slow * np.expm1(-2 * beta * t) / (2 * beta)
+
+        # المخمد الحرج: جذر حقيقي مكرر
+        s_critical = t * decay
+
+    c = np.where(discriminant < 0, c_under, np.where(discriminant > 0, c_over, decay))
+    s = np.where(discriminant < 0, s_under, np.where(discriminant > 0, s_over, s_critical))
+    return c, s
+
+
+@np.errstate(over='ignore', divide='ignore', invalid='ignore')
+def oscillator_response(L, R, C, q0, i0, t) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    الشحنة والتيار الدقيقان للدائرة L·Q'' + R·Q' + Q/C = 0
+
+    جميع المعاملات قابلة للبث (broadcastable) لحساب عدة كرات معاً.
+
+    Args:
+        L: المحاثة
+        R: المقاومة
+        C: السعة
+        q0: الشحنة الابتدائية Q(0)
+        i0: التيار الابتدائي I(0)
+        t: الزمن مقاساً من لحظة الشروط الابتدائية
+
+    Returns:
+        (الشحنة, التيار)
+    """
+    gamma = np.asarray(R, dtype=np.float64) / (2 * np.asarray(L, dtype=np.float64))
+    omega_0_squared = 1 / (np.asarray(L, dtype=np.float64) * np.asarray(C, dtype=np.float64))
+    t = np.asarray(t, dtype=np.float64)
+
+    c, s = _decay_basis(gamma, omega_0_squared, t)
+    charge = q0 * c + (i0 + gamma * q0) * s
+    current = i0 * c - (omega_0_squared * q0 + gamma * i0) * s
+    return charge, current
+
+
+@np.errstate(over='ignore', divide='ignore', invalid='ignore')
+def propagator(L, R, C, h) -> np.ndarray:
+    """
+    مصفوفة الانتقال الدقيقة Φ(h) لخطوة زمنية h
+
+    [Q(t+h), I(t+h)] = Φ(h) · [Q(t), I(t)]
+
+    Args:
+        L, R, C: معاملات الدائرة (قيم أو مصفوفات بنفس الشكل)
+        h: طول الخطوة (قيمة أو مصفوفة بنفس الشكل)
+
+    Returns:
+        مصفوفة بالشكل (2, 2, ...)
+    """
+    gamma = np.asarray(R, dtype=np.float64) / (2 * np.asarray(L, dtype=np.float64))
+    omega_0_squared = 1 / (np.asarray(L, dtype=np.float64) * np.asarray(C, dtype=np.float64))
+    c, s = _decay_basis(gamma, omega_0_squared, np.asarray(h, dtype=np.float64))
+    return np.array([
+        [c + gamma * s, s],
+        [-omega_0_squared * s, c - gamma * s],
+    ])
+
+
+def _complex_expm1(z: np.ndarray) -> np.ndarray:
+    """e^z - 1 لأعداد مركبة دون فقدان الدقة قرب الصفر"""
+    x, y = z.real, z.imag
+    real = np.expm1(x) * np.cos(y) - 2 * np.sin(y / 2)**2
+    imag = np.exp(x) * np.sin(y)
+    return real + 1j * imag
+
+
+def _geometric_sum(step: np.ndarray, n: int) -> np.ndarray:
+    """Σ_{k=0}^{n-1} e^(k·step) بصيغة مغلقة"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = _complex_expm1(n * step) / _complex_expm1(step)
+    return np.where(step == 0, n, ratio)
+
+
+# حد الاقتراب من التخميد الحرج: تحته تصبح معاملات الجذرين سيئة الشرط
+_NEAR_CRITICAL = 1e-4
+
+# حجم المقطع الزمني في مسار العزوم المتدفقة
+_MOMENT_CHUNK = 4096
+
+# أقصى عدد عناصر (كرات × نقاط) في مقطع واحد من مسار العزوم المتدفقة
+_MOMENT_BLOCK = 1 << 20
+
+# أدنى نسبة للتباين إلى مقدار حدود العزم الثاني تُقبل معها الصيغة المغلقة:
+# خطأ التقريب فيها من رتبة ε·Σ|c_m·c_n·G|، فتحتها يفقد التباين دقته
+_CANCELLATION = 1e-3
+
+
+def _streaming_energy_moments(L, R, C, q0, i0, duration, points):
+    """
+    متوسط الطاقة وانحرافها المعياري بعزوم متدفقة على مقاطع زمنية
+
+    تُحسب العزوم الثانية حول متوسط كل مقطع ثم تُدمج بصيغة Chan المتوازية
+    دون تخزين السلسلة الكاملة، وتُعالج الكرات في كتل محدودة الذاكرة.
+    """
+    L, R, C, q0, i0, duration = (v.ravel() for v in np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (L, R, C, q0, i0, duration))
+    ))
+    chunk = min(points, _MOMENT_CHUNK)
+    block = max(_MOMENT_BLOCK // chunk, 1)
+
+    mean = np.empty(L.shape)
+    std = np.empty(L.shape)
+    for first in range(0, L.size, block):
+        rows = slice(first, first + block)
+        bL, bR, bC, bq0, bi0 = (v[rows, None] for v in (L, R, C, q0, i0))
+        h = duration[rows, None] / max(points - 1, 1)
+
+        count = 0
+        block_mean = np.zeros(bL.shape[0])
+        m2 = np.zeros_like(block_mean)
+        for start in range(0, points, chunk):
+            k = np.arange(start, min(start + chunk, points), dtype=np.float64)
+            charge, current = oscillator_response(bL, bR, bC, bq0, bi0, k * h)
+            energy = 0.5 * bL * current**2 + 0.5 * charge**2 / bC
+
+            chunk_count = k.size
+            chunk_mean = energy.mean(axis=-1)
+            chunk_m2 = ((energy - chunk_mean[:, None])**2).sum(axis=-1)
+
+            delta = chunk_mean - block_mean
+            total = count + chunk_count
+            block_mean = block_mean + delta * chunk_count / total
+            m2 = m2 + chunk_m2 + delta**2 * count * chunk_count / total
+            count = total
+
+        mean[rows] = block_mean
+        std[rows] = np.sqrt(m2 / count)
+
+    return mean, std
+
+
+@np.errstate(over='ignore', divide='ignore', invalid='ignore')
+def energy_moments(L, R, C, q0, i0, duration, points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    متوسط الطاقة الكلية وانحرافها المعياري على الشبكة linspace(0, duration, points)
+
+    تساوي np.mean(total_energy) و np.std(total_energy) للحل الكامل. تُحسب
+    أولاً بصيغة مغلقة دون إنشاء السلسلة الزمنية: الطاقة مجموع ثلاثة حدود
+    أسية e^((r_i + r_j)t)، ومجموع كل حد على الشبكة متسلسلة هندسية.
+    لكن التباين E[E²] - E[E]² يفقد دقته بالطرح حين تكون تقلبات الطاقة
+    صغيرة أمام قيمتها (عامل جودة مرتفع للأعداد الأولية الكبيرة)، وكذلك
+    بالقرب من التخميد الحرج؛ في هاتين الحالتين تُحسب العزوم الثانية حول
+    المتوسط بمرور متدفق على الشبكة.
+
+    جميع المعاملات قابلة للبث لحساب عدة كرات معاً. الدوائر المتدهورة
+    (C = 0 لعدد أولي ضخم) تعطي inf أو NaN دون تحذيرات.
+
+    Args:
+        L, R, C: معاملات الدائرة
+        q0, i0: الشحنة والتيار الابتدائيان
+        duration: مدة المحاكاة
+        points: عدد النقاط الزمنية
+
+    Returns:
+        (متوسط الطاقة, الانحراف المعياري للطاقة)
+    """
+    L, R, C, q0, i0, duration = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (L, R, C, q0, i0, duration))
+    )
+    shape = L.shape
+    if not shape:
+        # الحساب دائماً بحلقات المصفوفات (لا بحساب NumPy العددي للقيم المفردة)
+        # حتى تطابق كرة واحدة نتيجتها ضمن دفعة بتاً بتاً
+        L, R, C, q0, i0, duration = (v.reshape(1) for v in (L, R, C, q0, i0, duration))
+    h = duration / max(points - 1, 1)
+
+    gamma = R / (2 * L)
+    omega_0_squared = 1 / (L * C)
+    root = np.sqrt((gamma**2 - omega_0_squared).astype(np.complex128))
+    r1 = -gamma + root
+    r2 = -gamma - root
+
+    # Q(t) = a1·e^(r1 t) + a2·e^(r2 t)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        a1 = (i0 - r2 * q0) / (r1 - r2)
+        a2 = (r1 * q0 - i0) / (r1 - r2)
+
+    # E(t) = Σ c_m·e^(μ_m t)
+    coefficients = (
+        0.5 * a1**2 * (L * r1**2 + 1 / C),
+        0.5 * a2**2 * (L * r2**2 + 1 / C),
+        a1 * a2 * (L * r1 * r2 + 1 / C),
+    )
+    exponents = (2 * r1, 2 * r2, r1 + r2)
+
+    first = sum(c * _geometric_sum(mu * h, points) for c, mu in zip(coefficients, exponents))
+    second_terms = [
+        cm * cn * _geometric_sum((mu_m + mu_n) * h, points)
+        for cm, mu_m in zip(coefficients, exponents)
+        for cn, mu_n in zip(coefficients, exponents)
+    ]
+    second = sum(second_terms)
+    magnitude = sum(np.abs(term) for term in second_terms)
+
+    mean = first.real / points
+    variance = np.maximum(second.real / points - mean**2, 0.0)
+    std = np.sqrt(variance)
+
+    near_critical = np.abs(r1 - r2) <= _NEAR_CRITICAL * np.abs(gamma)
+    cancelled = variance <= _CANCELLATION * magnitude / points
+    streamed = near_critical | (cancelled & np.isfinite(magnitude))
+    if np.any(streamed):
+        mean = np.array(mean)
+        std = np.array(std)
+        mean[streamed], std[streamed] = _streaming_energy_moments(
+            L[streamed], R[streamed], C[streamed],
+            q0[streamed], i0[streamed], duration[streamed], points
+        )
+
+    return mean.reshape(shape), std.reshape(shape)
+
+
+def analytic_solution(L: float, R: float, C: float, q0: float, i0: float,
+                      t: np.ndarray) -> Dict:
+    """
+    الحل التحليلي الكامل مع الجهد والطاقات
+
+    Returns:
+        قاموس بالشحنة والتيار والجهد وطاقات الملف والمكثف
+    """
+    charge, current = oscillator_response(L, R, C, q0, i0, t)
+    energy_L = 0.5 * L * current**2
+    energy_C = 0.5 * charge**2 / C
+    return {
+        'charge': charge,
+        'current': current,
+        'voltage': charge / C,
+        'energy_L': energy_L,
+        'energy_C': energy_C,
+        'total_energy': energy_L + energy_C,
+    }
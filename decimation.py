@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+تقليل نقاط المنحنيات الطويلة للرسم
+Trace Decimation for Plotting
+
+يختصر السلاسل الزمنية الطويلة (ملايين النقاط) إلى عدد يناسب عرض الرسم
+بالبكسل دون فقدان الشكل المرئي: يُقسم المحور الزمني إلى خانات بعدد
+أعمدة البكسل، ويُحتفظ في كل خانة بنقطتي القيمة الصغرى والعظمى لكل
+منحنى (غلاف min/max). تُجمع فهارس جميع المنحنيات معاً فتبقى السلاسل
+متزامنة زمنياً، ويحتفظ المخطط الطوري (الشحنة مقابل التيار) بأطراف
+الشحنة والتيار في كل خانة.
+
+يعمل المُقلِّل على دفعات متتالية من الحل (EnvelopeDecimator.add)، فلا يلزم
+وجود المسار الكامل في الذاكرة، وتعطي التغذية على دفعات النتيجة نفسها
+تماماً كتغذية الحل دفعة واحدة.
+
+أستاذ باسل يحيى عبدالله
+"""
+
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+# عرض لوحة الرسم بالبكسل تقريباً (شكل 14 بوصة بلوحتين أفقيتين عند 300 نقطة/بوصة)
+DEFAULT_PIXEL_WIDTH = 2000
+
+# عدد النقاط الزمنية في كل دفعة عند بث الحل
+DEFAULT_SEGMENT_POINTS = 100_000
+
+
+def time_grid(duration: float, points: int, start: int = 0, stop: int = None) -> np.ndarray:
+    """
+    جزء من الشبكة الزمنية np.linspace(0, duration, points) دون إنشائها كاملة
+
+    Args:
+        duration: مدة المحاكاة
+        points: عدد النقاط الكلي
+        start: فهرس أول نقطة
+        stop: فهرس ما بعد آخر نقطة (الافتراضي: نهاية الشبكة)
+
+    Returns:
+        أزمنة النقاط start..stop-1
+    """
+    stop = points if stop is None else stop
+    if points == 1:
+        return np.zeros(stop - start)
+    t = np.arange(start, stop, dtype=np.float64) * (duration / (points - 1))
+    if stop == points and stop > start:
+        t[-1] = duration
+    return t
+
+
+def integrate_segments(fun: Callable, y0: Sequence[float], duration: float, points: int,
+                       segment_points: int = DEFAULT_SEGMENT_POINTS,
+                       rtol: float = 1e-8) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    حل معادلة تفاضلية (RK45) على دفعات متتالية من الشبكة الزمنية
+
+    تبدأ كل دفعة من الحالة عند آخر نقطة في الدفعة السابقة.
+
+    Args:
+        fun: الطرف الأيمن f(t, y)
+        y0: الشروط الابتدائية عند t = 0
+        duration: مدة المحاكاة
+        points: عدد النقاط الكلي
+        segment_points: عدد النقاط في كل دفعة
+        rtol: الدقة النسبية
+
+    Yields:
+        (الأزمنة, الحالة بالشكل (len(y0), n))
+    """
+    from scipy.integrate import solve_ivp
+
+    state = np.asarray(y0, dtype=np.float64)
+    t_previous = 0.0
+    for start in range(0, points, segment_points):
+        t_eval = time_grid(duration, points, start, min(start + segment_points, points))
+        if t_eval[-1] > t_previous:
+            solution = solve_ivp(fun, (t_previous, t_eval[-1]), state,
+                                 t_eval=t_eval, method='RK45', rtol=rtol)
+            if not solution.success:
+                raise RuntimeError(f"Failed to solve differential equation: {solution.message}")
+            values = solution.y
+        else:
+            # دفعة عند t = 0 فقط
+            values = np.repeat(state[:, None], len(t_eval), axis=1)
+        state = values[:, -1]
+        t_previous = t_eval[-1]
+        yield t_eval, values
+
+
+class EnvelopeDecimator:
+    """غلاف min/max مشترك لعدة منحنيات متزامنة يُغذى بدفعات متتالية"""
+
+    def __init__(self, total_points: int, fields: Sequence[str],
+                 pixel_width: Optional[int] = DEFAULT_PIXEL_WIDTH):
+        """
+        Args:
+            total_points: عدد النقاط الكلي للحل
+            fields: أسماء المنحنيات (جميعها تُختصر بالفهارس نفسها)
+            pixel_width: عدد الخانات (None أو عدد ≥ النقاط/2 يعني الاحتفاظ بكل النقاط)
+        """
+        self.total_points = total_points
+        self.fields = tuple(fields)
+        self.n_bins = (total_points if pixel_width is None
+                       else max(1, min(pixel_width, total_points)))
+        # لا فائدة من الغلاف إذا كان يعطي نقاطاً أكثر من الأصل
+        self.passthrough = pixel_width is None or total_points <= 2 * pixel_width
+        self.offset = 0
+
+        if self.passthrough:
+            self._segments = []
+            return
+
+        k = len(self.fields)
+        # لكل منحنى: فهرس وقيمة أصغر وأكبر نقطة في كل خانة
+        self._min_index = np.full((k, self.n_bins), -1, dtype=np.int64)
+        self._max_index = np.full((k, self.n_bins), -1, dtype=np.int64)
+        self._min_value = np.full((k, self.n_bins), np.inf)
+        self._max_value = np.full((k, self.n_bins), -np.inf)
+        # قيم جميع المنحنيات عند كل نقطة مختارة
+        self._min_rows = np.zeros((k, self.n_bins, k))
+        self._max_rows = np.zeros((k, self.n_bins, k))
+
+    def add(self, segment: Dict[str, np.ndarray]):
+        """
+        إضافة الدفعة التالية من الحل
+
+        Args:
+            segment: قاموس بالمنحنيات نفسها وبطول واحد
+        """
+        columns = np.stack([np.asarray(segment[name], dtype=np.float64)
+                            for name in self.fields])
+        n = columns.shape[1]
+        if n == 0:
+            return
+        if self.offset + n > self.total_points:
+            raise ValueError("Segments exceed the declared number of points")
+
+        if self.passthrough:
+            self._segments.append(columns)
+            self.offset += n
+            return
+
+        index = np.arange(self.offset, self.offset + n, dtype=np.int64)
+        bins = index * self.n_bins // self.total_points
+        # الخانات متتالية داخل الدفعة
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        bin_ids = bins[starts]
+        counts = np.diff(np.r_[starts, n])
+
+        for row, values in enumerate(columns):
+            for extreme, reduce, better in (('min', np.fmin, np.less),
+                                            ('max', np.fmax, np.greater)):
+                # fmin/fmax تتجاهل القيم NaN، والخانة التي كلها NaN لا تُخزن
+                best = reduce.reduceat(values, starts)
+                # أول موضع يحقق القيمة القصوى في كل خانة
+                repeated = np.repeat(best, counts)
+                hits = np.flatnonzero((values == repeated) | np.isnan(repeated))
+                _, first = np.unique(np.searchsorted(starts, hits, side='right') - 1,
+                                     return_index=True)
+                position = hits[first]
+
+                stored_value = getattr(self, f'_{extreme}_value')
+                stored_index = getattr(self, f'_{extreme}_index')
+                stored_rows = getattr(self, f'_{extreme}_rows')
+                # تستبدل الدفعة الحالية القيمة المخزنة فقط إذا كانت أفضل تماماً
+                # (تُفضل أول نقطة زمنياً عند التساوي كما في الحل الكامل)
+                update = better(best, stored_value[row, bin_ids])
+                target = bin_ids[update]
+                stored_value[row, target] = best[update]
+                stored_index[row, target] = index[position[update]]
+                stored_rows[row, target] = columns[:, position[update]].T
+
+        self.offset += n
+
+    def indices(self) -> np.ndarray:
+        """الفهارس المختارة مرتبة زمنياً"""
+        if self.passthrough:
+            return np.arange(self.offset)
+        chosen = np.concatenate([self._min_index.ravel(), self._max_index.ravel()])
+        return np.unique(chosen[chosen >= 0])
+
+    def result(self) -> Dict[str, np.ndarray]:
+        """
+        المنحنيات المختصرة
+
+        Returns:
+            قاموس بالمنحنيات نفسها مقيمة عند الفهارس المختارة
+        """
+        if self.passthrough:
+            if self._segments:
+                columns = np.concatenate(self._segments, axis=1)
+            else:
+                columns = np.empty((len(self.fields), 0))
+            return dict(zip(self.fields, columns))
+
+        index = np.concatenate([self._min_index.ravel(), self._max_index.ravel()])
+        rows = np.concatenate([self._min_rows.reshape(-1, len(self.fields)),
+                               self._max_rows.reshape(-1, len(self.fields))])
+        valid = index >= 0
+        _, unique = np.unique(index[valid], return_index=True)
+        columns = rows[valid][unique].T
+        return dict(zip(self.fields, columns))
+
+
+def decimate(data: Dict[str, np.ndarray], fields: Sequence[str],
+             pixel_width: Optional[int] = DEFAULT_PIXEL_WIDTH) -> Dict[str, np.ndarray]:
+    """
+    اختصار منحنيات متزامنة موجودة في الذاكرة بغلاف min/max مشترك
+
+    Args:
+        data: قاموس المنحنيات
+        fields: المنحنيات المختصرة (تُنسخ بقية المفاتيح كما هي)
+        pixel_width: عرض الرسم بالبكسل (None لتعطيل الاختصار)
+
+    Returns:
+        نسخة من data بالمنحنيات المختصرة
+    """
+    total_points = len(data[fields[0]])
+    decimator = EnvelopeDecimator(total_points, fields, pixel_width)
+    decimator.add({name: data[name] for name in fields})
+    return {**data, **decimator.result()}
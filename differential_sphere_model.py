@@ -8,14 +8,35 @@
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
-from typing import Dict, List, Tuple, Callable
+from typing import Dict, Iterator, List, Optional, Tuple, Callable
 import math
+from functools import partial
+
+import primality
+from damped_oscillator import UNDERDAMPED, damping_regime, energy_moments, oscillator_response
+from decimation import (DEFAULT_PIXEL_WIDTH, DEFAULT_SEGMENT_POINTS, EnvelopeDecimator,
+                        decimate, integrate_segments)
+from simulation_cache import get_simulation_cache
+from sphere_parameters import SphereParameters, real_prime
 
 class DifferentialOscillatingSphere:
     """النموذج التفاضلي للكرة المتذبذبة"""
     
+    # الثوابت الكونية (مشتركة على مستوى الصنف)
+    pi = np.pi
+    alpha = 1 / (4 * pi)  # معامل التكافؤ
+    f0 = 1 / (4 * pi)     # التردد الكوني الأساسي
+    hbar = 1.054571817e-34     # ثابت بلانك المخفض
+    
+    # أسماء السمات المقابلة لحقول SphereParameters
+    PARAMETER_ATTRIBUTES = {
+        'p': 'prime', 'r0': 'radius', 'Q0': 'charge', 'A0': 'surface_area',
+        'f': 'frequency', 'omega': 'angular_frequency', 'period': 'period',
+        'R': 'resistance', 'L': 'inductance', 'C': 'capacitance',
+        'LC_product': 'LC_product', 'resonance_condition': 'resonance_condition',
+        'Q_amplitude': 'charge_amplitude', 'V_amplitude': 'voltage_amplitude'
+    }
+    
     def __init__(self, prime: int, radius: float = 1.0, charge: float = 1.0):
         """
         تهيئة الكرة المتذبذبة بالمعادلات التفاضلية
@@ -29,42 +50,40 @@ class DifferentialOscillatingSphere:
         self.r0 = radius  # نصف القطر الأساسي
         self.Q0 = charge  # الشحنة الأساسية
         
-        # الثوابت الكونية
-        self.pi = np.pi
-        self.alpha = 1 / (4 * self.pi)  # معامل التكافؤ
-        self.f0 = 1 / (4 * self.pi)     # التردد الكوني الأساسي
-        self.hbar = 1.054571817e-34     # ثابت بلانك المخفض
-        
         # حساب المعاملات التفاضلية
         self._calculate_differential_parameters()
         
+    @np.errstate(over='ignore', divide='ignore', invalid='ignore')
     def _calculate_differential_parameters(self):
         """حساب المعاملات التفاضلية للكرة"""
         
+        # الأعداد الأولية الضخمة تُحسب كـ np.float64 فتفيض الكميات إلى inf أو 0
+        p = real_prime(self.p)
+        
         # التردد والتردد الزاوي
-        self.f = self.p / self.pi
-        self.omega = 2 * self.p
+        self.f = p / self.pi
+        self.omega = 2 * p
         self.period = 2 * self.pi / self.omega
         
         # مساحة سطح الكرة الأساسية
         self.A0 = 4 * self.pi * self.r0**2
         
         # المقاومة (من النظرية الأصلية)
-        self.R = np.sqrt(self.p)
+        self.R = np.sqrt(p)
         
         # حساب L و C من شرط الرنين: LC = 1/(4p²)
         # نفترض L بناءً على الخصائص الفيزيائية
         self.L = self.A0 / (16 * self.pi**3 * self.Q0)
         
         # حساب C من شرط الرنين
-        self.C = 1 / (4 * self.p**2 * self.L)
+        self.C = 1 / (4 * p**2 * self.L)
         
         # التحقق من شرط الرنين
         self.LC_product = self.L * self.C
-        self.resonance_condition = 1 / (4 * self.p**2)
+        self.resonance_condition = 1 / (4 * p**2)
         
         # سعة التذبذب للشحنة (من المعادلة التفاضلية)
-        self.Q_amplitude = self.p / (self.pi * self._calculate_impedance())
+        self.Q_amplitude = p / (self.pi * self._calculate_impedance())
         
         # سعة التذبذب للجهد (من العلاقة الطاقة)
         self.V_amplitude = self._calculate_voltage_amplitude()
@@ -81,6 +100,45 @@ class DifferentialOscillatingSphere:
         # إذن: V₀ = Q₀/C
         return self.Q_amplitude / self.C
     
+    @classmethod
+    def batch_parameters(cls, primes, radius: float = 1.0, charge: float = 1.0) -> Dict[str, np.ndarray]:
+        """
+        المعاملات التفاضلية لمصفوفة كاملة من الأعداد الأولية دفعة واحدة
+        
+        نفس معادلات _calculate_differential_parameters عنصراً بعنصر.
+        
+        Args:
+            primes: مصفوفة الأعداد الأولية
+            radius: نصف قطر الكرة
+            charge: الشحنة
+            
+        Returns:
+            قاموس أعمدة بأسماء سمات الكرة (p, L, C, R, omega, period, Q_amplitude, ...)
+        """
+        p = np.asarray(primes, dtype=np.int64).astype(np.float64)
+        pi = cls.pi
+        
+        omega = 2 * p
+        A0 = 4 * pi * radius**2
+        L = np.broadcast_to(A0 / (16 * pi**3 * charge), p.shape)
+        C = 1 / (4 * p**2 * L)
+        R = np.sqrt(p)
+        impedance = np.sqrt(R**2 + (omega * L - 1 / (omega * C))**2)
+        Q_amplitude = p / (pi * impedance)
+        
+        return {
+            'p': p,
+            'f': p / pi,
+            'omega': omega,
+            'period': 2 * pi / omega,
+            'R': R,
+            'L': L,
+            'C': C,
+            'impedance_magnitude': impedance,
+            'Q_amplitude': Q_amplitude,
+            'V_amplitude': Q_amplitude / C
+        }
+    
     def differential_equation(self, t: float, y: np.ndarray) -> np.ndarray:
         """
         المعادلة التفاضلية للكرة المتذبذبة
@@ -106,7 +164,9 @@ class DifferentialOscillatingSphere:
     
     def solve_differential_equation(self, t_span: Tuple[float, float], 
                                   initial_conditions: List[float] = None,
-                                  t_eval: np.ndarray = None) -> Dict:
+                                  t_eval: np.ndarray = None,
+                                  summary: bool = False,
+                                  use_cache: bool = True) -> Dict:
         """
         حل المعادلة التفاضلية للكرة المتذبذبة
         
@@ -114,6 +174,10 @@ class DifferentialOscillatingSphere:
             t_span: نطاق الزمن (start, end)
             initial_conditions: الشروط الابتدائية [Q0, I0]
             t_eval: نقاط الزمن للتقييم
+            summary: إرجاع متوسط الطاقة وانحرافها فقط بصيغة مغلقة
+                     دون إنشاء السلاسل الزمنية
+            use_cache: استخدام ذاكرة المحاكاة المشتركة (simulation_cache)،
+                       وتُتجاوز عند تمرير t_eval مخصص
             
         Returns:
             نتائج الحل التفاضلي
@@ -122,9 +186,28 @@ class DifferentialOscillatingSphere:
             # الشروط الابتدائية: Q(0) = Q_amplitude, I(0) = 0
             initial_conditions = [self.Q_amplitude, 0.0]
         
+        if summary:
+            compute = partial(self._solve_energy_summary, t_span, initial_conditions, t_eval)
+        else:
+            compute = partial(self._integrate, t_span, initial_conditions, t_eval)
+        
+        if not use_cache or t_eval is not None:
+            return compute()
+        
+        key = ('differential', int(self.p), float(self.r0), float(self.Q0),
+               float(t_span[0]), float(t_span[1]),
+               float(initial_conditions[0]), float(initial_conditions[1]),
+               1000, 'summary' if summary else 'rk45')
+        return get_simulation_cache().get_or_compute(key, compute)
+    
+    def _integrate(self, t_span: Tuple[float, float], initial_conditions: List[float],
+                   t_eval: np.ndarray = None) -> Dict:
+        """التكامل العددي للمعادلة التفاضلية"""
         if t_eval is None:
             t_eval = np.linspace(t_span[0], t_span[1], 1000)
         
+        from scipy.integrate import solve_ivp
+        
         # حل المعادلة التفاضلية
         solution = solve_ivp(
             self.differential_equation,
@@ -162,6 +245,30 @@ class DifferentialOscillatingSphere:
             'success': solution.success
         }
     
+    def _solve_energy_summary(self, t_span: Tuple[float, float],
+                              initial_conditions: List[float],
+                              t_eval: np.ndarray = None) -> Dict:
+        """متوسط الطاقة وانحرافها المعياري من الحل المغلق"""
+        q0, i0 = initial_conditions
+        
+        if t_eval is None:
+            average_energy, energy_stability = energy_moments(
+                self.L, self.R, self.C, q0, i0, t_span[1] - t_span[0], 1000
+            )
+        else:
+            # شبكة زمنية مخصصة: التقييم المباشر للحل المغلق عند نقاطها
+            Q_values, I_values = oscillator_response(
+                self.L, self.R, self.C, q0, i0, np.asarray(t_eval) - t_span[0]
+            )
+            total_energy = 0.5 * self.L * I_values**2 + 0.5 * Q_values**2 / self.C
+            average_energy, energy_stability = np.mean(total_energy), np.std(total_energy)
+        
+        return {
+            'average_energy': float(average_energy),
+            'energy_stability': float(energy_stability),
+            'success': True
+        }
+    
     def get_analytical_solution(self, t: np.ndarray) -> Dict:
         """
         الحل التحليلي للمعادلة التفاضلية (للمقارنة)
@@ -172,26 +279,20 @@ class DifferentialOscillatingSphere:
         Returns:
             الحل التحليلي
         """
-        # للنظام المخمد: Q(t) = Q₀e^(-γt)cos(ω_d t + φ)
-        # حيث γ = R/(2L) و ω_d = √(ω₀² - γ²)
+        # الشروط الابتدائية: Q(0) = Q_amplitude, I(0) = 0
+        # تحت المخمد: Q(t) = e^(-γt)[Q₀cos(ω_d t) + γQ₀ sin(ω_d t)/ω_d]
+        # المخمد الحرج: Q(t) = e^(-γt)[Q₀ + γQ₀ t]
+        # فوق المخمد: Q(t) = e^(-γt)[Q₀cosh(βt) + γQ₀ sinh(βt)/β]
+        # حيث γ = R/(2L) و ω_d = √(ω₀² - γ²) و β = √(γ² - ω₀²)
         
         gamma = self.R / (2 * self.L)
         omega_0_squared = 1 / (self.L * self.C)
         omega_0 = np.sqrt(omega_0_squared)
+        regime = damping_regime(self.L, self.R, self.C)
         
-        if gamma**2 < omega_0_squared:
-            # النظام تحت المخمد (underdamped)
-            omega_d = np.sqrt(omega_0_squared - gamma**2)
-            
-            Q_analytical = self.Q_amplitude * np.exp(-gamma * t) * np.cos(omega_d * t)
-            I_analytical = self.Q_amplitude * np.exp(-gamma * t) * (
-                -gamma * np.cos(omega_d * t) - omega_d * np.sin(omega_d * t)
-            )
-        else:
-            # النظام فوق المخمد أو حرج
-            Q_analytical = self.Q_amplitude * np.exp(-gamma * t) * np.cos(omega_0 * t)
-            I_analytical = -self.Q_amplitude * gamma * np.exp(-gamma * t) * np.cos(omega_0 * t)
-        
+        Q_analytical, I_analytical = oscillator_response(
+            self.L, self.R, self.C, self.Q_amplitude, 0.0, t
+        )
         V_analytical = Q_analytical / self.C
         
         return {
@@ -201,9 +302,30 @@ class DifferentialOscillatingSphere:
             'voltage': V_analytical,
             'damping_factor': gamma,
             'natural_frequency': omega_0,
-            'damped_frequency': omega_d if gamma**2 < omega_0_squared else omega_0
+            'damped_frequency': np.sqrt(omega_0_squared - gamma**2) if regime == UNDERDAMPED else 0.0,
+            'regime': regime
         }
     
+    def to_parameters(self) -> SphereParameters:
+        """سجل معاملات مضغوط للكرة (لتخزين أعداد كبيرة دون كائنات كاملة)"""
+        return SphereParameters.from_circuit(self.p, self.r0, self.Q0, self.L, self.C)
+    
+    @classmethod
+    def from_parameters(cls, parameters: SphereParameters) -> 'DifferentialOscillatingSphere':
+        """
+        إعادة بناء الكرة من سجل معاملات دون إعادة الحساب
+        
+        Args:
+            parameters: سجل المعاملات
+            
+        Returns:
+            كرة بنفس الكميات المشتقة
+        """
+        sphere = cls.__new__(cls)
+        for attribute, field in cls.PARAMETER_ATTRIBUTES.items():
+            setattr(sphere, attribute, getattr(parameters, field))
+        return sphere
+    
     def verify_resonance_condition(self) -> Dict:
         """التحقق من شرط الرنين التفاضلي"""
         
@@ -230,39 +352,28 @@ class DifferentialOscillatingSphere:
         if simulation_time is None:
             simulation_time = 2 * self.period
         
-        # حل المعادلة التفاضلية
-        solution = self.solve_differential_equation((0, simulation_time))
+        # ملخص الطاقة من الحل التفاضلي (دون سلاسل زمنية)
+        solution = self.solve_differential_equation((0, simulation_time), summary=True)
         
         # حساب الطاقة المتوسطة من المحاكاة
-        avg_energy = np.mean(solution['total_energy'])
+        avg_energy = solution['average_energy']
         
         # حساب نسبة الطاقة إلى التردد
         energy_frequency_ratio = avg_energy / self.f
         
         # تقدير الفجوة بناءً على الأنماط التفاضلية
-        estimated_gap = 2 + int(energy_frequency_ratio * 1e6) % 6
+        # (الطاقة غير المنتهية للأعداد الأولية الضخمة لا تضيف تصحيحاً)
+        scaled_ratio = energy_frequency_ratio * 1e6
+        estimated_gap = 2 + (int(scaled_ratio) % 6 if math.isfinite(scaled_ratio) else 0)
         
-        # البحث عن العدد الأولي التالي
-        candidate = self.p + estimated_gap
-        while not self.is_prime(candidate) and candidate < self.p + 20:
-            candidate += 1
+        # البحث عن العدد الأولي التالي في النافذة [p + الفجوة, p + 20)
+        candidate = primality.first_prime_in(self.p + estimated_gap, self.p + 20)
         
-        return candidate if candidate < self.p + 20 else self.p + 2
+        return candidate if candidate is not None else self.p + 2
     
     def is_prime(self, n: int) -> bool:
         """اختبار الأولية"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        
-        for i in range(3, int(np.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        
-        return True
+        return primality.is_prime(n)
     
     def get_sphere_properties(self) -> Dict:
         """الحصول على جميع خصائص الكرة التفاضلية"""
@@ -287,70 +398,176 @@ class DifferentialOscillatingSphere:
             'resonance_condition': self.resonance_condition
         }
     
-    def plot_differential_solution(self, simulation_time: float = None, 
-                                 compare_analytical: bool = True):
-        """رسم حل المعادلة التفاضلية"""
+    def iter_solution_segments(self, simulation_time: float = None, points: int = 1000,
+                               compare_analytical: bool = True,
+                               segment_points: int = DEFAULT_SEGMENT_POINTS) -> Iterator[Dict]:
+        """
+        حل المعادلة التفاضلية على دفعات زمنية متتالية دون الاحتفاظ بالمسار الكامل
         
+        Args:
+            simulation_time: مدة المحاكاة (الافتراضي: 3 دورات)
+            points: عدد النقاط الزمنية الكلي
+            compare_analytical: إضافة الحل التحليلي لكل دفعة
+            segment_points: عدد النقاط في كل دفعة
+            
+        Yields:
+            قاموس لكل دفعة بمنحنيات الرسم
+        """
         if simulation_time is None:
             simulation_time = 3 * self.period
         
-        # حل المعادلة التفاضلية
-        solution = self.solve_differential_equation((0, simulation_time))
+        for t_values, (Q_values, I_values) in integrate_segments(
+                self.differential_equation, [self.Q_amplitude, 0.0],
+                simulation_time, points, segment_points):
+            energy_L = 0.5 * self.L * I_values**2
+            energy_C = 0.5 * Q_values**2 / self.C
+            segment = {'time': t_values, 'charge': Q_values, 'current': I_values,
+                       'energy_L': energy_L, 'energy_C': energy_C,
+                       'total_energy': energy_L + energy_C}
+            if compare_analytical:
+                segment['analytical_charge'], segment['analytical_current'] = oscillator_response(
+                    self.L, self.R, self.C, self.Q_amplitude, 0.0, t_values
+                )
+            yield segment
+    
+    def differential_plot_data(self, simulation_time: float = None,
+                               compare_analytical: bool = True, points: int = 1000,
+                               pixel_width: Optional[int] = DEFAULT_PIXEL_WIDTH,
+                               segment_points: Optional[int] = None) -> Dict:
+        """
+        بيانات رسم حل المعادلة التفاضلية (تُمرر إلى draw_differential_solution)
+        
+        Args:
+            simulation_time: مدة المحاكاة (الافتراضي: 3 دورات)
+            compare_analytical: إضافة الحل التحليلي للمقارنة
+            points: عدد النقاط الزمنية
+            pixel_width: عرض الرسم بالبكسل لاختصار المنحنيات الطويلة
+                         بغلاف min/max (None لتعطيل الاختصار)
+            segment_points: بث الحل على دفعات بهذا الحجم بدلاً من حله كاملاً
+            
+        Returns:
+            المنحنيات (مختصرة إذا تجاوزت النقاط ضعف عرض الرسم) والعدد الأولي
+        """
+        if simulation_time is None:
+            simulation_time = 3 * self.period
         
-        # الحل التحليلي للمقارنة
+        fields = DIFFERENTIAL_PLOT_FIELDS
         if compare_analytical:
-            analytical = self.get_analytical_solution(solution['time'])
+            fields += ANALYTICAL_PLOT_FIELDS
         
-        # إنشاء الرسوم
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+        if segment_points is None:
+            # حل المعادلة التفاضلية
+            t_eval = None if points == 1000 else np.linspace(0, simulation_time, points)
+            solution = self.solve_differential_equation((0, simulation_time), t_eval=t_eval)
+            data = {name: solution[name] for name in DIFFERENTIAL_PLOT_FIELDS}
+            
+            # الحل التحليلي للمقارنة
+            if compare_analytical:
+                analytical = self.get_analytical_solution(solution['time'])
+                data['analytical_charge'] = analytical['charge']
+                data['analytical_current'] = analytical['current']
+            
+            data = decimate(data, fields, pixel_width)
+        else:
+            decimator = EnvelopeDecimator(points, fields, pixel_width)
+            for segment in self.iter_solution_segments(simulation_time, points,
+                                                       compare_analytical, segment_points):
+                decimator.add(segment)
+            data = decimator.result()
+        
+        data['prime'] = self.p
+        return data
+    
+    def plot_differential_solution(self, simulation_time: float = None, 
+                                 compare_analytical: bool = True, points: int = 1000,
+                                 pixel_width: Optional[int] = DEFAULT_PIXEL_WIDTH,
+                                 segment_points: Optional[int] = None):
+        """
+        رسم حل المعادلة التفاضلية
         
-        # رسم الشحنة
-        axes[0, 0].plot(solution['time'] * 1000, solution['charge'] * 1e6, 
-                       'b-', linewidth=2, label='Numerical Solution')
-        if compare_analytical:
-            axes[0, 0].plot(analytical['time'] * 1000, analytical['charge'] * 1e6, 
-                           'r--', linewidth=1, label='Analytical Solution')
-        axes[0, 0].set_title(f'Charge Q(t) - Prime {self.p}')
-        axes[0, 0].set_xlabel('Time (ms)')
-        axes[0, 0].set_ylabel('Charge (μC)')
-        axes[0, 0].legend()
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        # رسم التيار
-        axes[0, 1].plot(solution['time'] * 1000, solution['current'] * 1000, 
-                       'g-', linewidth=2, label='Numerical Solution')
-        if compare_analytical:
-            axes[0, 1].plot(analytical['time'] * 1000, analytical['current'] * 1000, 
-                           'r--', linewidth=1, label='Analytical Solution')
-        axes[0, 1].set_title(f'Current I(t) = dQ/dt - Prime {self.p}')
-        axes[0, 1].set_xlabel('Time (ms)')
-        axes[0, 1].set_ylabel('Current (mA)')
-        axes[0, 1].legend()
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        # رسم الطاقة
-        axes[1, 0].plot(solution['time'] * 1000, solution['energy_L'] * 1e6, 
-                       'purple', linewidth=2, label='Inductor Energy')
-        axes[1, 0].plot(solution['time'] * 1000, solution['energy_C'] * 1e6, 
-                       'orange', linewidth=2, label='Capacitor Energy')
-        axes[1, 0].plot(solution['time'] * 1000, solution['total_energy'] * 1e6, 
-                       'k--', linewidth=2, label='Total Energy')
-        axes[1, 0].set_title(f'Energy E(t) - Prime {self.p}')
-        axes[1, 0].set_xlabel('Time (ms)')
-        axes[1, 0].set_ylabel('Energy (μJ)')
-        axes[1, 0].legend()
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        # رسم المخطط الطوري
-        axes[1, 1].plot(solution['charge'] * 1e6, solution['current'] * 1000, 
-                       'red', linewidth=2)
-        axes[1, 1].set_title(f'Phase Diagram - Prime {self.p}')
-        axes[1, 1].set_xlabel('Charge (μC)')
-        axes[1, 1].set_ylabel('Current (mA)')
-        axes[1, 1].grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        return fig
+        Args:
+            simulation_time: مدة المحاكاة (الافتراضي: 3 دورات)
+            compare_analytical: رسم الحل التحليلي للمقارنة
+            points: عدد النقاط الزمنية
+            pixel_width: عرض الرسم بالبكسل لاختصار المنحنيات (None لتعطيله)
+            segment_points: بث الحل على دفعات بهذا الحجم (للمسارات الطويلة جداً)
+        """
+        return draw_differential_solution(
+            self.differential_plot_data(simulation_time, compare_analytical, points,
+                                        pixel_width, segment_points))
+
+# منحنيات رسم الحل العددي (الزمن ضمنها فيُحفظ طرفا كل خانة عند الاختصار)
+DIFFERENTIAL_PLOT_FIELDS = ('time', 'charge', 'current', 'energy_L', 'energy_C', 'total_energy')
+
+# منحنيات الحل التحليلي الاختيارية
+ANALYTICAL_PLOT_FIELDS = ('analytical_charge', 'analytical_current')
+
+def draw_differential_solution(data: Dict):
+    """
+    رسم حل المعادلة التفاضلية من بياناته
+    
+    Args:
+        data: ناتج differential_plot_data (الحل التحليلي اختياري)
+    
+    Returns:
+        الشكل
+    """
+    import matplotlib.pyplot as plt
+    
+    prime = data['prime']
+    time_ms = data['time'] * 1000
+    compare_analytical = 'analytical_charge' in data
+    
+    # إنشاء الرسوم
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    
+    # رسم الشحنة
+    axes[0, 0].plot(time_ms, data['charge'] * 1e6, 
+                   'b-', linewidth=2, label='Numerical Solution')
+    if compare_analytical:
+        axes[0, 0].plot(time_ms, data['analytical_charge'] * 1e6, 
+                       'r--', linewidth=1, label='Analytical Solution')
+    axes[0, 0].set_title(f'Charge Q(t) - Prime {prime}')
+    axes[0, 0].set_xlabel('Time (ms)')
+    axes[0, 0].set_ylabel('Charge (μC)')
+    axes[0, 0].legend()
+    axes[0, 0].grid(True, alpha=0.3)
+    
+    # رسم التيار
+    axes[0, 1].plot(time_ms, data['current'] * 1000, 
+                   'g-', linewidth=2, label='Numerical Solution')
+    if compare_analytical:
+        axes[0, 1].plot(time_ms, data['analytical_current'] * 1000, 
+                       'r--', linewidth=1, label='Analytical Solution')
+    axes[0, 1].set_title(f'Current I(t) = dQ/dt - Prime {prime}')
+    axes[0, 1].set_xlabel('Time (ms)')
+    axes[0, 1].set_ylabel('Current (mA)')
+    axes[0, 1].legend()
+    axes[0, 1].grid(True, alpha=0.3)
+    
+    # رسم الطاقة
+    axes[1, 0].plot(time_ms, data['energy_L'] * 1e6, 
+                   'purple', linewidth=2, label='Inductor Energy')
+    axes[1, 0].plot(time_ms, data['energy_C'] * 1e6, 
+                   'orange', linewidth=2, label='Capacitor Energy')
+    axes[1, 0].plot(time_ms, data['total_energy'] * 1e6, 
+                   'k--', linewidth=2, label='Total Energy')
+    axes[1, 0].set_title(f'Energy E(t) - Prime {prime}')
+    axes[1, 0].set_xlabel('Time (ms)')
+    axes[1, 0].set_ylabel('Energy (μJ)')
+    axes[1, 0].legend()
+    axes[1, 0].grid(True, alpha=0.3)
+    
+    # رسم المخطط الطوري
+    axes[1, 1].plot(data['charge'] * 1e6, data['current'] * 1000, 
+                   'red', linewidth=2)
+    axes[1, 1].set_title(f'Phase Diagram - Prime {prime}')
+    axes[1, 1].set_xlabel('Charge (μC)')
+    axes[1, 1].set_ylabel('Current (mA)')
+    axes[1, 1].grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    return fig
 
 def test_differential_model():
     """اختبار النموذج التفاضلي"""
@@ -390,11 +607,7 @@ def test_differential_model():
 
 def get_next_prime(n):
     """الحصول على العدد الأولي التالي"""
-    candidate = n + 1
-    while True:
-        if all(candidate % i != 0 for i in range(2, int(candidate**0.5) + 1)):
-            return candidate
-        candidate += 1
+    return primality.next_prime(n)
 
 if __name__ == "__main__":
     test_differential_model()
@@ -8,11 +8,18 @@
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from differential_sphere_model import DifferentialOscillatingSphere
-from typing import Dict, List, Tuple
+from damped_oscillator import energy_moments
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import math
 
+import gap_kernel
+import instrumentation
+import primality
+from parallel_pool import default_chunksize, get_process_pool, overlapping_chunks, resolve_workers
+from result_tables import PATTERN_SCHEMA, ResultTable, prediction_table
+from sphere_parameters import real_prime
+
 class EnhancedPrimePrediction:
     """خوارزمية التنبؤ المحسنة للأعداد الأولية"""
     
@@ -22,8 +29,18 @@ class EnhancedPrimePrediction:
         self.prediction_history = []
         self.accuracy_history = []
         
-    def analyze_prime_patterns(self, primes_list: List[int]) -> Dict:
-        """تحليل أنماط الأعداد الأولية"""
+    def analyze_prime_patterns(self, primes_list: List[int], columnar: bool = False) -> Dict:
+        """
+        تحليل أنماط الأعداد الأولية
+        
+        Args:
+            primes_list: قائمة الأعداد الأولية المتتالية
+            columnar: بناء النتائج كجدول ResultTable (المفتاح 'table') وإرجاع
+                القيم كأعمدة NumPy بدلاً من قوائم
+        """
+        
+        if columnar:
+            return self._analyze_prime_patterns_columnar(primes_list)
         
         patterns = {
             'gaps': [],
@@ -45,9 +62,9 @@ class EnhancedPrimePrediction:
             gamma = sphere.R / (2 * sphere.L)
             Q_factor = omega_0 * sphere.L / sphere.R
             
-            # محاكاة الطاقة
-            solution = sphere.solve_differential_equation((0, 2*sphere.period))
-            avg_energy = np.mean(solution['total_energy'])
+            # محاكاة الطاقة (ملخص دون سلاسل زمنية)
+            solution = sphere.solve_differential_equation((0, 2*sphere.period), summary=True)
+            avg_energy = solution['average_energy']
             energy_ratio = avg_energy / sphere.hbar / sphere.f0
             
             # حفظ البيانات
@@ -70,73 +87,95 @@ class EnhancedPrimePrediction:
         
         return patterns
     
+    def _analyze_prime_patterns_columnar(self, primes_list: List[int]) -> Dict:
+        """تحليل الأنماط مبنياً مباشرة في أعمدة PATTERN_SCHEMA من المعاملات المجمعة"""
+        primes = np.asarray(primes_list, dtype=np.int64)
+        sphere = DifferentialOscillatingSphere.batch_parameters(primes)
+        L, C, R = sphere['L'], sphere['C'], sphere['R']
+        
+        omega_0 = 1 / np.sqrt(L * C)
+        # ملخص الطاقة على دورتين (نفس solve_differential_equation بـ summary=True)
+        avg_energy, _ = energy_moments(L, R, C, sphere['Q_amplitude'], 0.0,
+                                       2 * sphere['period'], 1000)
+        
+        columns = {
+            'prime': primes,
+            # الفجوة 0 للعدد الأخير
+            'gap': np.append(np.diff(primes), 0)[:primes.size],
+            'L': L,
+            'C': C,
+            'R': R,
+            'Q_factor': omega_0 * L / R,
+            'damping_factor': R / (2 * L),
+            'energy_ratio': avg_energy / DifferentialOscillatingSphere.hbar / DifferentialOscillatingSphere.f0
+        }
+        table = ResultTable({name: np.asarray(columns[name], dtype=dtype)
+                             for name, dtype in PATTERN_SCHEMA.items()})
+        gaps = table['gap'][:max(len(table) - 1, 0)]
+        values, counts = np.unique(gaps, return_counts=True)
+        
+        return {
+            'table': table,
+            'gaps': gaps,
+            'gap_frequencies': dict(zip(values.tolist(), counts.tolist())),
+            'L_values': table['L'],
+            'C_values': table['C'],
+            'R_values': table['R'],
+            'Q_factors': table['Q_factor'],
+            'damping_factors': table['damping_factor'],
+            'energy_ratios': table['energy_ratio']
+        }
+    
     def predict_next_prime_enhanced(self, current_prime: int) -> Dict:
         """التنبؤ المحسن بالعدد الأولي التالي"""
         
         # إنشاء نموذج الكرة للعدد الحالي
-        sphere = DifferentialOscillatingSphere(current_prime)
-        
-        # حساب المعاملات الفيزيائية
-        omega_0 = 1 / np.sqrt(sphere.L * sphere.C)
-        gamma = sphere.R / (2 * sphere.L)
-        Q_factor = omega_0 * sphere.L / sphere.R
-        tau = 2 * sphere.L / sphere.R
-        
-        # محاكاة الطاقة التفاضلية
-        solution = sphere.solve_differential_equation((0, 3*sphere.period))
-        avg_energy = np.mean(solution['total_energy'])
-        energy_std = np.std(solution['total_energy'])
-        
-        # حساب نسبة الطاقة إلى الطاقة الكونية
-        cosmic_energy = sphere.hbar * sphere.f0 / 2
-        energy_ratio = avg_energy / cosmic_energy
-        
-        # خوارزمية التنبؤ المحسنة
-        gap_base = 2  # الفجوة الأساسية
-        
-        # تصحيح بناءً على عامل الجودة
-        quality_correction = int(Q_factor * 10) % 6
-        
-        # تصحيح بناءً على التخميد
-        damping_correction = int(gamma * 1000) % 4
-        
-        # تصحيح بناءً على الطاقة
-        energy_correction = int(energy_ratio * 100) % 8
-        
-        # تصحيح بناءً على استقرار الطاقة
-        stability_correction = int(energy_std * 1e6) % 3
-        
-        # تصحيح بناءً على العدد الأولي نفسه
-        prime_correction = current_prime % 6
-        if prime_correction == 1:
-            prime_mod_correction = 4
-        elif prime_correction == 5:
-            prime_mod_correction = 2
-        else:
-            prime_mod_correction = 6
-        
-        # الفجوة المقدرة النهائية
-        estimated_gap = (gap_base + quality_correction + damping_correction + 
-                        energy_correction + stability_correction) % prime_mod_correction
-        
-        if estimated_gap < 2:
-            estimated_gap = 2
-        
-        # البحث عن العدد الأولي التالي
-        candidate = current_prime + estimated_gap
-        attempts = 0
-        max_attempts = 20
-        
-        while not self.is_prime(candidate) and attempts < max_attempts:
-            candidate += 1
-            attempts += 1
+        with instrumentation.stage('enhanced.model'), np.errstate(divide='ignore', invalid='ignore'):
+            sphere = DifferentialOscillatingSphere(current_prime)
+            
+            # حساب المعاملات الفيزيائية (C = 0 للأعداد الضخمة فتصبح ω0 لانهائية)
+            omega_0 = 1 / np.sqrt(sphere.L * sphere.C)
+            gamma = sphere.R / (2 * sphere.L)
+            Q_factor = omega_0 * sphere.L / sphere.R
+            tau = 2 * sphere.L / sphere.R
+        
+        # محاكاة الطاقة التفاضلية (ملخص دون سلاسل زمنية)
+        with instrumentation.stage('enhanced.solve'):
+            solution = sphere.solve_differential_equation((0, 3*sphere.period), summary=True)
+        avg_energy = solution['average_energy']
+        energy_std = solution['energy_stability']
+        
+        with instrumentation.stage('enhanced.corrections'):
+            # حساب نسبة الطاقة إلى الطاقة الكونية
+            cosmic_energy = sphere.hbar * sphere.f0 / 2
+            energy_ratio = avg_energy / cosmic_energy
+            
+            # الفجوة المقدرة من تصحيحات الجودة والتخميد والطاقة والاستقرار
+            # وباقي قسمة العدد الأولي على 6 (gap_kernel)
+            estimated_gap = gap_kernel.estimated_gap(
+                current_prime, Q_factor, gamma, energy_ratio, energy_std,
+                gap_kernel.ENHANCED_ENERGY_SCALE)
+        
+        # البحث عن العدد الأولي التالي في نافذة المحاولات
+        # (تُغربل النافذة بالأعداد الأولية الصغيرة للأعداد الضخمة)
+        start = current_prime + estimated_gap
+        max_attempts = gap_kernel.MAX_ATTEMPTS
+        
+        with instrumentation.stage('enhanced.candidates'):
+            candidate = primality.first_prime_in(start, start + max_attempts)
+        attempts = max_attempts if candidate is None else candidate - start
+        instrumentation.count('enhanced.predictions')
+        instrumentation.count('enhanced.candidate_attempts', attempts)
         
         # إذا لم نجد عدد أولي، نستخدم الطريقة التقليدية
         if attempts >= max_attempts:
-            candidate = self.get_next_prime_traditional(current_prime)
+            instrumentation.count('enhanced.fallbacks')
+            with instrumentation.stage('enhanced.fallback'):
+                candidate = self.get_next_prime_traditional(current_prime)
         
         # حساب الثقة في التنبؤ
-        confidence = self._calculate_confidence(current_prime, Q_factor, gamma, energy_ratio)
+        with instrumentation.stage('enhanced.confidence'):
+            confidence = self._calculate_confidence(current_prime, Q_factor, gamma, energy_ratio)
         
         return {
             'current_prime': current_prime,
@@ -156,12 +195,66 @@ class EnhancedPrimePrediction:
             }
         }
     
+    def predict_many(self, primes) -> Dict[str, np.ndarray]:
+        """
+        التنبؤ المحسن لمصفوفة كاملة من الأعداد الأولية
+        
+        يطابق predict_next_prime_enhanced عنصراً بعنصر: المعاملات من
+        DifferentialOscillatingSphere.batch_parameters، وإحصاءات الطاقة بالصيغة
+        المغلقة المتجهية، والتصحيحات من gap_kernel، والبحث من خريطة غربال.
+        
+        Args:
+            primes: مصفوفة الأعداد الأولية (int64)
+            
+        Returns:
+            قاموس مصفوفات: current_prime, predicted_next, gap, attempts,
+            confidence, fallback, Q_factor, damping_factor, energy_ratio, energy_stability
+        """
+        primes = np.asarray(primes, dtype=np.int64)
+        sphere = DifferentialOscillatingSphere.batch_parameters(primes)
+        L, C, R = sphere['L'], sphere['C'], sphere['R']
+        
+        # حساب المعاملات الفيزيائية
+        omega_0 = 1 / np.sqrt(L * C)
+        gamma = R / (2 * L)
+        Q_factor = omega_0 * L / R
+        
+        # ملخص الطاقة على ثلاث دورات (نفس solve_differential_equation)
+        avg_energy, energy_std = energy_moments(
+            L, R, C, sphere['Q_amplitude'], 0.0, 3 * sphere['period'], 1000
+        )
+        cosmic_energy = DifferentialOscillatingSphere.hbar * DifferentialOscillatingSphere.f0 / 2
+        energy_ratio = avg_energy / cosmic_energy
+        
+        estimated_gaps = gap_kernel.estimated_gaps(
+            primes, Q_factor, gamma, energy_ratio, energy_std, gap_kernel.ENHANCED_ENERGY_SCALE)
+        predicted, attempts, fallback = gap_kernel.search_candidates(primes, estimated_gaps)
+        
+        # مستوى الثقة (نفس _calculate_confidence)
+        confidence = (np.minimum(1.0, 20.0 / sphere['p'])
+                      + np.minimum(1.0, Q_factor / 10.0)
+                      + np.maximum(0.1, 1.0 - gamma)
+                      + np.minimum(1.0, energy_ratio / 100.0)) / 4.0
+        
+        return {
+            'current_prime': primes,
+            'predicted_next': predicted,
+            'gap': predicted - primes,
+            'attempts': attempts,
+            'confidence': np.clip(confidence, 0.1, 1.0),
+            'fallback': fallback,
+            'Q_factor': Q_factor,
+            'damping_factor': gamma,
+            'energy_ratio': energy_ratio,
+            'energy_stability': energy_std
+        }
+    
     def _calculate_confidence(self, prime: int, Q_factor: float, 
                             gamma: float, energy_ratio: float) -> float:
         """حساب مستوى الثقة في التنبؤ"""
         
         # عوامل الثقة
-        size_factor = min(1.0, 20.0 / prime)  # الأعداد الصغيرة أكثر دقة
+        size_factor = min(1.0, 20.0 / real_prime(prime))  # الأعداد الصغيرة أكثر دقة
         quality_factor = min(1.0, Q_factor / 10.0)  # عامل الجودة العالي أفضل
         damping_factor = max(0.1, 1.0 - gamma)  # التخميد القليل أفضل
         energy_factor = min(1.0, energy_ratio / 100.0)  # نسبة طاقة معقولة
@@ -169,8 +262,60 @@ class EnhancedPrimePrediction:
         confidence = (size_factor + quality_factor + damping_factor + energy_factor) / 4.0
         return min(1.0, max(0.1, confidence))
     
-    def test_prediction_accuracy(self, test_primes: List[int]) -> Dict:
-        """اختبار دقة التنبؤ على مجموعة من الأعداد الأولية"""
+    def iter_predictions(self, prime_iterable: Iterable[int]) -> Iterator[Dict]:
+        """
+        تدفق سجلات التنبؤ لكل زوج متتالٍ، سجلاً واحداً في كل مرة
+        
+        Args:
+            prime_iterable: أعداد أولية متتالية (قائمة أو مكرر غير محدود)
+            
+        Yields:
+            سجل التنبؤ لكل زوج (الحالي، التالي)
+        """
+        primes = iter(prime_iterable)
+        current = next(primes, None)
+        
+        for actual_next in primes:
+            prediction = self.predict_next_prime_enhanced(current)
+            predicted_next = prediction['predicted_next']
+            
+            yield {
+                'current': current,
+                'actual_next': actual_next,
+                'predicted_next': predicted_next,
+                'is_correct': predicted_next == actual_next,
+                'gap_error': abs(predicted_next - actual_next),
+                'confidence': prediction['confidence']
+            }
+            current = actual_next
+    
+    def _prediction_records(self, test_primes: List[int]) -> List[Dict]:
+        """سجلات التنبؤ لكل زوج متتالٍ في القائمة"""
+        return list(self.iter_predictions(test_primes))
+    
+    def _prediction_table(self, test_primes: List[int]) -> ResultTable:
+        """سجلات التنبؤ كجدول عمودي (PREDICTION_SCHEMA) من predict_many"""
+        primes = np.asarray(test_primes, dtype=np.int64)
+        predictions = self.predict_many(primes[:-1])
+        return prediction_table(primes[:-1], primes[1:],
+                                predictions['predicted_next'], predictions['confidence'])
+    
+    def test_prediction_accuracy(self, test_primes: List[int],
+                                 workers: Optional[int] = 1,
+                                 chunksize: Optional[int] = None,
+                                 columnar: bool = False) -> Dict:
+        """
+        اختبار دقة التنبؤ على مجموعة من الأعداد الأولية
+        
+        Args:
+            test_primes: قائمة الأعداد الأولية المتتالية
+            workers: عدد العمليات (1 للتنفيذ التسلسلي، None لجميع الأنوية)
+            chunksize: عدد الأزواج في كل مقطع يُرسل إلى عملية
+            columnar: إرجاع التنبؤات كجدول ResultTable عمودي بدلاً من قائمة قواميس
+            
+        Returns:
+            نتائج الاختبار (مطابقة للتنفيذ التسلسلي أياً كان عدد العمليات)
+        """
         
         results = {
             'predictions': [],
@@ -181,32 +326,44 @@ class EnhancedPrimePrediction:
             'gap_errors': []
         }
         
+        workers = resolve_workers(workers)
+        if columnar:
+            if workers == 1 or results['total_tests'] <= 1:
+                table = self._prediction_table(test_primes)
+            else:
+                if chunksize is None:
+                    chunksize = default_chunksize(results['total_tests'], workers)
+                chunks = overlapping_chunks(test_primes, chunksize)
+                pool = get_process_pool(workers)
+                table = ResultTable.concatenate(list(pool.map(self._prediction_table, chunks)))
+            
+            results['predictions'] = table
+            results['correct_predictions'] = int(np.count_nonzero(table['is_correct']))
+            results['accuracy'] = results['correct_predictions'] / results['total_tests']
+            results['average_confidence'] = float(table['confidence'].sum(dtype=np.float64)
+                                                  / results['total_tests'])
+            results['gap_errors'] = table['gap_error']
+            results['average_gap_error'] = table['gap_error'].mean()
+            return results
+        
+        if workers == 1 or results['total_tests'] <= 1:
+            results['predictions'] = self._prediction_records(test_primes)
+        else:
+            if chunksize is None:
+                chunksize = default_chunksize(results['total_tests'], workers)
+            chunks = overlapping_chunks(test_primes, chunksize)
+            pool = get_process_pool(workers)
+            for records in pool.map(self._prediction_records, chunks):
+                results['predictions'].extend(records)
+        
         total_confidence = 0.0
         
-        for i in range(len(test_primes) - 1):
-            current = test_primes[i]
-            actual_next = test_primes[i + 1]
-            
-            prediction = self.predict_next_prime_enhanced(current)
-            predicted_next = prediction['predicted_next']
-            
-            is_correct = predicted_next == actual_next
-            gap_error = abs(predicted_next - actual_next)
-            
-            results['predictions'].append({
-                'current': current,
-                'actual_next': actual_next,
-                'predicted_next': predicted_next,
-                'is_correct': is_correct,
-                'gap_error': gap_error,
-                'confidence': prediction['confidence']
-            })
-            
-            if is_correct:
+        for prediction in results['predictions']:
+            if prediction['is_correct']:
                 results['correct_predictions'] += 1
             
             total_confidence += prediction['confidence']
-            results['gap_errors'].append(gap_error)
+            results['gap_errors'].append(prediction['gap_error'])
         
         results['accuracy'] = results['correct_predictions'] / results['total_tests']
         results['average_confidence'] = total_confidence / results['total_tests']
@@ -216,80 +373,88 @@ class EnhancedPrimePrediction:
     
     def is_prime(self, n: int) -> bool:
         """اختبار الأولية"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        
-        for i in range(3, int(np.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        
-        return True
+        return primality.is_prime(n)
     
     def get_next_prime_traditional(self, n: int) -> int:
         """الحصول على العدد الأولي التالي بالطريقة التقليدية"""
-        candidate = n + 1
-        while not self.is_prime(candidate):
-            candidate += 1
-        return candidate
+        return primality.next_prime(n)
     
     def plot_prediction_analysis(self, test_results: Dict):
         """رسم تحليل نتائج التنبؤ"""
-        
-        predictions = test_results['predictions']
-        
-        # استخراج البيانات
-        primes = [p['current'] for p in predictions]
-        gap_errors = [p['gap_error'] for p in predictions]
-        confidences = [p['confidence'] for p in predictions]
-        correct_flags = [p['is_correct'] for p in predictions]
-        
-        # إنشاء الرسوم
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        
-        # رسم دقة التنبؤ
-        colors = ['green' if c else 'red' for c in correct_flags]
-        axes[0, 0].scatter(primes, gap_errors, c=colors, alpha=0.7, s=50)
-        axes[0, 0].set_title(f'Prediction Accuracy: {test_results["accuracy"]:.1%}')
-        axes[0, 0].set_xlabel('Prime Number')
-        axes[0, 0].set_ylabel('Gap Error')
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        # رسم مستوى الثقة
-        axes[0, 1].plot(primes, confidences, 'b-o', linewidth=2, markersize=4)
-        axes[0, 1].set_title(f'Average Confidence: {test_results["average_confidence"]:.2f}')
-        axes[0, 1].set_xlabel('Prime Number')
-        axes[0, 1].set_ylabel('Confidence Level')
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        # رسم توزيع أخطاء الفجوات
-        axes[1, 0].hist(gap_errors, bins=10, alpha=0.7, color='purple', edgecolor='black')
-        axes[1, 0].set_title(f'Gap Error Distribution (Avg: {test_results["average_gap_error"]:.1f})')
-        axes[1, 0].set_xlabel('Gap Error')
-        axes[1, 0].set_ylabel('Frequency')
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        # رسم العلاقة بين الثقة والدقة
-        correct_confidences = [p['confidence'] for p in predictions if p['is_correct']]
-        wrong_confidences = [p['confidence'] for p in predictions if not p['is_correct']]
-        
-        axes[1, 1].hist([correct_confidences, wrong_confidences], 
-                       bins=8, alpha=0.7, color=['green', 'red'], 
-                       label=['Correct', 'Wrong'], edgecolor='black')
-        axes[1, 1].set_title('Confidence vs Accuracy')
-        axes[1, 1].set_xlabel('Confidence Level')
-        axes[1, 1].set_ylabel('Frequency')
-        axes[1, 1].legend()
-        axes[1, 1].grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        return fig
+        return draw_prediction_analysis(prediction_plot_data(test_results))
+
+def prediction_plot_data(test_results: Dict) -> Dict:
+    """بيانات رسم تحليل التنبؤ من نتائج test_prediction_accuracy (قوائم أو جدول)"""
+    predictions = test_results['predictions']
+    if isinstance(predictions, ResultTable):
+        columns = {name: predictions[name] for name in ('current', 'gap_error', 'confidence', 'is_correct')}
+    else:
+        columns = {name: [p[name] for p in predictions]
+                   for name in ('current', 'gap_error', 'confidence', 'is_correct')}
+    return {
+        'primes': np.asarray(columns['current'], dtype=np.int64),
+        'gap_errors': np.asarray(columns['gap_error'], dtype=np.int64),
+        'confidences': np.asarray(columns['confidence'], dtype=np.float64),
+        'correct': np.asarray(columns['is_correct'], dtype=np.bool_),
+        'accuracy': test_results['accuracy'],
+        'average_confidence': test_results['average_confidence'],
+        'average_gap_error': test_results['average_gap_error']
+    }
+
+def draw_prediction_analysis(data: Dict):
+    """رسم تحليل نتائج التنبؤ من prediction_plot_data (يُستدعى أيضاً في عمليات الرسم)"""
+    import matplotlib.pyplot as plt
+    
+    # استخراج البيانات
+    primes = data['primes']
+    gap_errors = data['gap_errors']
+    confidences = data['confidences']
+    correct_flags = data['correct']
+    
+    # إنشاء الرسوم
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    
+    # رسم دقة التنبؤ
+    colors = ['green' if c else 'red' for c in correct_flags]
+    axes[0, 0].scatter(primes, gap_errors, c=colors, alpha=0.7, s=50)
+    axes[0, 0].set_title(f'Prediction Accuracy: {data["accuracy"]:.1%}')
+    axes[0, 0].set_xlabel('Prime Number')
+    axes[0, 0].set_ylabel('Gap Error')
+    axes[0, 0].grid(True, alpha=0.3)
+    
+    # رسم مستوى الثقة
+    axes[0, 1].plot(primes, confidences, 'b-o', linewidth=2, markersize=4)
+    axes[0, 1].set_title(f'Average Confidence: {data["average_confidence"]:.2f}')
+    axes[0, 1].set_xlabel('Prime Number')
+    axes[0, 1].set_ylabel('Confidence Level')
+    axes[0, 1].grid(True, alpha=0.3)
+    
+    # رسم توزيع أخطاء الفجوات
+    axes[1, 0].hist(gap_errors, bins=10, alpha=0.7, color='purple', edgecolor='black')
+    axes[1, 0].set_title(f'Gap Error Distribution (Avg: {data["average_gap_error"]:.1f})')
+    axes[1, 0].set_xlabel('Gap Error')
+    axes[1, 0].set_ylabel('Frequency')
+    axes[1, 0].grid(True, alpha=0.3)
+    
+    # رسم العلاقة بين الثقة والدقة
+    correct_confidences = confidences[correct_flags]
+    wrong_confidences = confidences[~correct_flags]
+    
+    axes[1, 1].hist([correct_confidences, wrong_confidences], 
+                   bins=8, alpha=0.7, color=['green', 'red'], 
+                   label=['Correct', 'Wrong'], edgecolor='black')
+    axes[1, 1].set_title('Confidence vs Accuracy')
+    axes[1, 1].set_xlabel('Confidence Level')
+    axes[1, 1].set_ylabel('Frequency')
+    axes[1, 1].legend()
+    axes[1, 1].grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    return fig
 
 def test_enhanced_prediction():
     """اختبار خوارزمية التنبؤ المحسنة"""
+    from report_pipeline import ReportPipeline
     
     print("🚀 اختبار خوارزمية التنبؤ المحسنة")
     print("=" * 60)
@@ -319,19 +484,24 @@ def test_enhanced_prediction():
         print(f"{status} {pred['current']} → توقع: {pred['predicted_next']}, "
               f"فعلي: {pred['actual_next']}, ثقة: {pred['confidence']:.2f}")
     
-    # رسم التحليل
+    # رسم التحليل في عملية منفصلة بينما يستمر تحليل الأنماط
     print("\n🎨 إنشاء الرسوم البيانية...")
-    fig = predictor.plot_prediction_analysis(results)
-    plt.savefig('enhanced_prediction_analysis.png', dpi=300, bbox_inches='tight')
-    print("✅ تم حفظ الرسم: enhanced_prediction_analysis.png")
-    
-    # تحليل الأنماط
-    print("\n🔍 تحليل أنماط الأعداد الأولية...")
-    patterns = predictor.analyze_prime_patterns(test_primes)
+    with ReportPipeline() as report:
+        status = report.submit('enhanced_prediction_analysis.png', draw_prediction_analysis,
+                               prediction_plot_data(results))
+        
+        # تحليل الأنماط
+        print("\n🔍 تحليل أنماط الأعداد الأولية...")
+        patterns = predictor.analyze_prime_patterns(test_primes)
+        
+        print(f"📊 الفجوات الأكثر شيوعاً: {sorted(patterns['gap_frequencies'].items(), key=lambda x: x[1], reverse=True)[:3]}")
+        print(f"📊 متوسط عامل الجودة: {np.mean(patterns['Q_factors']):.2f}")
+        print(f"📊 متوسط التخميد: {np.mean(patterns['damping_factors']):.2e}")
     
-    print(f"📊 الفجوات الأكثر شيوعاً: {sorted(patterns['gap_frequencies'].items(), key=lambda x: x[1], reverse=True)[:3]}")
-    print(f"📊 متوسط عامل الجودة: {np.mean(patterns['Q_factors']):.2f}")
-    print(f"📊 متوسط التخميد: {np.mean(patterns['damping_factors']):.2e}")
+    if status == 'cached':
+        print("✅ الرسم لم يتغير: enhanced_prediction_analysis.png")
+    else:
+        print("✅ تم حفظ الرسم: enhanced_prediction_analysis.png")
     
     return results
 
@@ -8,12 +8,13 @@ Final Comparison Between Main Prediction Methods
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from basil_prime_theory import BasilPrimeTheory, generate_primes
 from enhanced_prediction_algorithm import EnhancedPrimePrediction
 import time
 from typing import Dict, List, Tuple
-import pandas as pd
+
+from report_pipeline import ReportPipeline
+from result_tables import COMPARISON_SCHEMA, TableBuilder
 
 class FinalMethodsComparison:
     """المقارنة النهائية بين الطريقتين الرئيسيتين"""
@@ -50,8 +51,15 @@ class FinalMethodsComparison:
             'execution_time': execution_time
         }
     
-    def comprehensive_comparison(self, test_ranges: List[Tuple[int, int]]) -> Dict:
-        """مقارنة شاملة على نطاقات مختلفة"""
+    def comprehensive_comparison(self, test_ranges: List[Tuple[int, int]],
+                                 columnar: bool = False) -> Dict:
+        """
+        مقارنة شاملة على نطاقات مختلفة
+        
+        Args:
+            test_ranges: قائمة (بداية النطاق، عدد الأعداد الأولية)
+            columnar: بناء التفاصيل كجداول ResultTable عمودية بدلاً من قوائم قواميس
+        """
         
         print("🔬 المقارنة النهائية بين الطريقتين الرئيسيتين")
         print("=" * 60)
@@ -60,6 +68,9 @@ class FinalMethodsComparison:
             'Basic Method': {'total_correct': 0, 'total_tests': 0, 'total_time': 0, 'total_confidence': 0, 'details': []},
             'Enhanced Method': {'total_correct': 0, 'total_tests': 0, 'total_time': 0, 'total_confidence': 0, 'details': []}
         }
+        if columnar:
+            for data in all_results.values():
+                data['details'] = TableBuilder(COMPARISON_SCHEMA)
         
         for start_range, count in test_ranges:
             print(f"\n🎯 اختبار النطاق: {start_range}+ ({count} أعداد)")
@@ -127,6 +138,10 @@ class FinalMethodsComparison:
                 print(f"    Basic:    {basic_status} {basic_result['predicted_next']} (ثقة: {basic_result['confidence']:.2f})")
                 print(f"    Enhanced: {enhanced_status} {enhanced_result['predicted_next']} (ثقة: {enhanced_result['confidence']:.2f})")
         
+        if columnar:
+            for data in all_results.values():
+                data['details'] = data['details'].build()
+        
         return all_results
     
     def analyze_results(self, results: Dict) -> Dict:
@@ -176,61 +191,8 @@ class FinalMethodsComparison:
     
     def plot_detailed_comparison(self, results: Dict, analysis: Dict):
         """رسم مقارنة تفصيلية"""
-        
-        methods = list(analysis.keys())
-        accuracies = [analysis[m]['accuracy'] * 100 for m in methods]
-        times = [analysis[m]['average_time'] * 1000 for m in methods]  # milliseconds
-        confidences = [analysis[m]['average_confidence'] * 100 for m in methods]
-        gap_errors = [analysis[m]['average_gap_error'] for m in methods]
-        
-        fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-        
-        colors = ['#2E86AB', '#A23B72']  # أزرق وأحمر
-        
-        # رسم الدقة
-        bars1 = axes[0, 0].bar(methods, accuracies, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
-        axes[0, 0].set_title('Prediction Accuracy Comparison\nمقارنة دقة التنبؤ', fontsize=12, fontweight='bold')
-        axes[0, 0].set_ylabel('Accuracy (%)')
-        axes[0, 0].set_ylim(0, 105)
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        for bar, acc in zip(bars1, accuracies):
-            axes[0, 0].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
-                           f'{acc:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=11)
-        
-        # رسم الوقت
-        bars2 = axes[0, 1].bar(methods, times, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
-        axes[0, 1].set_title('Execution Time Comparison\nمقارنة وقت التنفيذ', fontsize=12, fontweight='bold')
-        axes[0, 1].set_ylabel('Time (ms)')
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        for bar, time_val in zip(bars2, times):
-            axes[0, 1].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.2,
-                           f'{time_val:.2f}ms', ha='center', va='bottom', fontweight='bold', fontsize=11)
-        
-        # رسم الثقة
-        bars3 = axes[1, 0].bar(methods, confidences, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
-        axes[1, 0].set_title('Confidence Level Comparison\nمقارنة مستوى الثقة', fontsize=12, fontweight='bold')
-        axes[1, 0].set_ylabel('Confidence (%)')
-        axes[1, 0].set_ylim(0, 105)
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        for bar, conf in zip(bars3, confidences):
-            axes[1, 0].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
-                           f'{conf:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=11)
-        
-        # رسم خطأ الفجوة
-        bars4 = axes[1, 1].bar(methods, gap_errors, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
-        axes[1, 1].set_title('Gap Error Comparison\nمقارنة خطأ الفجوة', fontsize=12, fontweight='bold')
-        axes[1, 1].set_ylabel('Average Gap Error')
-        axes[1, 1].grid(True, alpha=0.3)
-        
-        for bar, error in zip(bars4, gap_errors):
-            axes[1, 1].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.02,
-                           f'{error:.2f}', ha='center', va='bottom', fontweight='bold', fontsize=11)
-        
-        plt.tight_layout()
-        plt.savefig('final_methods_comparison.png', dpi=300, bbox_inches='tight')
+        fig = draw_detailed_comparison(comparison_plot_data(analysis))
+        fig.savefig('final_methods_comparison.png', dpi=300, bbox_inches='tight')
         print("✅ تم حفظ الرسم: final_methods_comparison.png")
         
         return fig
@@ -285,6 +247,84 @@ class FinalMethodsComparison:
         
         return report
 
+def comparison_plot_data(analysis: Dict) -> Dict:
+    """بيانات رسم المقارنة من ناتج analyze_results (تُمرر إلى draw_detailed_comparison)"""
+    methods = list(analysis.keys())
+    return {
+        'methods': methods,
+        'accuracies': [analysis[m]['accuracy'] * 100 for m in methods],
+        'times': [analysis[m]['average_time'] * 1000 for m in methods],  # milliseconds
+        'confidences': [analysis[m]['average_confidence'] * 100 for m in methods],
+        'gap_errors': [float(analysis[m]['average_gap_error']) for m in methods]
+    }
+
+def draw_detailed_comparison(data: Dict):
+    """
+    رسم المقارنة التفصيلية من بياناتها
+    
+    Args:
+        data: ناتج comparison_plot_data
+    
+    Returns:
+        الشكل
+    """
+    import matplotlib.pyplot as plt
+    
+    methods = data['methods']
+    accuracies = data['accuracies']
+    times = data['times']
+    confidences = data['confidences']
+    gap_errors = data['gap_errors']
+    
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    
+    colors = ['#2E86AB', '#A23B72']  # أزرق وأحمر
+    
+    # رسم الدقة
+    bars1 = axes[0, 0].bar(methods, accuracies, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
+    axes[0, 0].set_title('Prediction Accuracy Comparison\nمقارنة دقة التنبؤ', fontsize=12, fontweight='bold')
+    axes[0, 0].set_ylabel('Accuracy (%)')
+    axes[0, 0].set_ylim(0, 105)
+    axes[0, 0].grid(True, alpha=0.3)
+    
+    for bar, acc in zip(bars1, accuracies):
+        axes[0, 0].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
+                       f'{acc:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=11)
+    
+    # رسم الوقت
+    bars2 = axes[0, 1].bar(methods, times, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
+    axes[0, 1].set_title('Execution Time Comparison\nمقارنة وقت التنفيذ', fontsize=12, fontweight='bold')
+    axes[0, 1].set_ylabel('Time (ms)')
+    axes[0, 1].grid(True, alpha=0.3)
+    
+    for bar, time_val in zip(bars2, times):
+        axes[0, 1].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.2,
+                       f'{time_val:.2f}ms', ha='center', va='bottom', fontweight='bold', fontsize=11)
+    
+    # رسم الثقة
+    bars3 = axes[1, 0].bar(methods, confidences, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
+    axes[1, 0].set_title('Confidence Level Comparison\nمقارنة مستوى الثقة', fontsize=12, fontweight='bold')
+    axes[1, 0].set_ylabel('Confidence (%)')
+    axes[1, 0].set_ylim(0, 105)
+    axes[1, 0].grid(True, alpha=0.3)
+    
+    for bar, conf in zip(bars3, confidences):
+        axes[1, 0].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1,
+                       f'{conf:.1f}%', ha='center', va='bottom', fontweight='bold', fontsize=11)
+    
+    # رسم خطأ الفجوة
+    bars4 = axes[1, 1].bar(methods, gap_errors, color=colors, alpha=0.8, edgecolor='black', linewidth=1)
+    axes[1, 1].set_title('Gap Error Comparison\nمقارنة خطأ الفجوة', fontsize=12, fontweight='bold')
+    axes[1, 1].set_ylabel('Average Gap Error')
+    axes[1, 1].grid(True, alpha=0.3)
+    
+    for bar, error in zip(bars4, gap_errors):
+        axes[1, 1].text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.02,
+                       f'{error:.2f}', ha='center', va='bottom', fontweight='bold', fontsize=11)
+    
+    fig.tight_layout()
+    return fig
+
 def main():
     """الدالة الرئيسية"""
     
@@ -306,11 +346,14 @@ def main():
     # تحليل النتائج
     analysis, winner = comparator.analyze_results(results)
     
-    # رسم المقارنة
-    fig = comparator.plot_detailed_comparison(results, analysis)
-    
-    # إنشاء التقرير
-    report = comparator.create_detailed_report(results, analysis, winner)
+    # رسم المقارنة في عملية منفصلة أثناء إنشاء التقرير
+    with ReportPipeline() as figures:
+        figures.submit('final_methods_comparison.png', draw_detailed_comparison,
+                       comparison_plot_data(analysis))
+        
+        # إنشاء التقرير
+        report = comparator.create_detailed_report(results, analysis, winner)
+    print("✅ تم حفظ الرسم: final_methods_comparison.png")
     
     print("\n" + "="*60)
     print("🎉 اكتملت المقارنة النهائية!")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+نواة تصحيحات الفجوة المجمعة
+Batch Gap-Correction Kernel
+
+صيغة الفجوة المقدرة المشتركة بين _predict_enhanced و
+predict_next_prime_enhanced:
+
+    quality    = int(Q · 10)      mod 6
+    damping    = int(γ · 1000)    mod 4
+    energy     = int(E · scale)   mod 8
+    stability  = int(σ_E · 10^6)  mod 3
+    gap        = (2 + quality + damping + energy + stability) mod m(p)
+
+حيث m(p) = 4 أو 2 أو 6 حسب p mod 6، وتُرفع الفجوة إلى 2 إذا قلت عنها.
+النموذج الأساسي يستخدم E = متوسط الطاقة مع scale = 10^6، والنموذج
+التفاضلي يستخدم E = نسبة الطاقة الكونية مع scale = 100.
+
+estimated_gap دالة عددية بحساب Python نفسه، و estimated_gaps تحسب
+مصفوفة كاملة بنواة numba (@njit(cache=True)) إن توفرت وإلا بـ NumPy.
+الباقي يُحسب كـ fmod(trunc(x), m) بالأعداد العشرية فيطابق int(x) % m
+تماماً حتى للقيم التي تتجاوز int64. في estimated_gap لا تضيف الكميات غير
+المنتهية (فيض معاملات الأعداد الأولية الأكبر من 2^64) أي تصحيح.
+
+تجنب الترجمة عند أول طلب:
+    gap_kernel.warmup()                    # عند بدء الخدمة أو العامل
+    python gap_kernel.py --precompile      # ملء ذاكرة numba على القرص مسبقاً
+                                           # (NUMBA_CACHE_DIR عند الحاجة)
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import argparse
+import math
+import os
+import sys
+from typing import Callable, Optional
+
+import numpy as np
+
+# مقياس الطاقة لكل نموذج
+BASIL_ENERGY_SCALE = 1e6
+ENHANCED_ENERGY_SCALE = 100
+
+# أقصى عدد لمحاولات البحث عن المرشح قبل اللجوء إلى الطريقة التقليدية
+MAX_ATTEMPTS = 20
+
+# متغير البيئة لاختيار الواجهة: auto (numba إن توفرت) أو numba أو numpy
+GAP_KERNEL_ENV = 'BASIL_GAP_KERNEL'
+
+_SIGNATURE = 'int64[:](int64[:], float64[:], float64[:], float64[:], float64[:], float64)'
+
+_kernel: Optional[Callable] = None
+_backend: Optional[str] = None
+
+
+def _prime_modulus(prime: int) -> int:
+    """المقسوم عليه حسب باقي قسمة العدد الأولي على 6"""
+    prime_mod = prime % 6
+    if prime_mod == 1:
+        return 4
+    elif prime_mod == 5:
+        return 2
+    return 6
+
+
+def _correction(value: float, modulus: int) -> int:
+    """int(value) % modulus، والقيم غير المنتهية (فيض الأعداد الأولية الضخمة) لا تضيف تصحيحاً"""
+    return int(value) % modulus if math.isfinite(value) else 0
+
+
+def estimated_gap(prime: int, quality_factor: float, damping_factor: float,
+                  energy: float, energy_stability: float, energy_scale: float) -> int:
+    """
+    الفجوة المقدرة لعدد أولي واحد
+
+    Args:
+        prime: العدد الأولي
+        quality_factor: عامل الجودة Q
+        damping_factor: معامل التخميد γ
+        energy: الطاقة (متوسط الطاقة أو نسبة الطاقة الكونية)
+        energy_stability: الانحراف المعياري للطاقة
+        energy_scale: مقياس الطاقة (BASIL_ENERGY_SCALE أو ENHANCED_ENERGY_SCALE)
+
+    Returns:
+        الفجوة المقدرة (2 على الأقل)
+    """
+    gap_base = 2
+    quality_correction = _correction(quality_factor * 10, 6)
+    damping_correction = _correction(damping_factor * 1000, 4)
+    energy_correction = _correction(energy * energy_scale, 8)
+    stability_correction = _correction(energy_stability * 1e6, 3)
+
+    gap = (gap_base + quality_correction + damping_correction +
+           energy_correction + stability_correction) % _prime_modulus(prime)
+    return max(gap, 2)
+
+
+def _estimated_gaps_loop(primes, quality_factors, damping_factors,
+                         energies, stabilities, energy_scale):
+    """حلقة النواة (تُترجم بـ numba)"""
+    n = primes.shape[0]
+    gaps = np.empty(n, dtype=np.int64)
+    for i in range(n):
+        q = quality_factors[i] * 10
+        d = damping_factors[i] * 1000
+        e = energies[i] * energy_scale
+        s = stabilities[i] * 1e6
+        if not (math.isfinite(q) and math.isfinite(d) and math.isfinite(e) and math.isfinite(s)):
+            raise ValueError("non-finite physical parameter in gap kernel")
+
+        # int(x) % m بالحساب العشري الدقيق: fmod(trunc(x), m) مع تصحيح الإشارة
+        total = 2
+        for x, m in ((q, 6.0), (d, 4.0), (e, 8.0), (s, 3.0)):
+            r = np.fmod(np.trunc(x), m)
+            if r < 0:
+                r += m
+            total += int(r)
+        r = primes[i] % 6
+        if r == 1:
+            modulus = 4
+        elif r == 5:
+            modulus = 2
+        else:
+            modulus = 6
+        gap = total % modulus
+        gaps[i] = gap if gap >= 2 else 2
+    return gaps
+
+
+def _numpy_mod(x: np.ndarray, m: float) -> np.ndarray:
+    r = np.fmod(np.trunc(x), m)
+    return np.where(r < 0, r + m, r).astype(np.int64)
+
+
+def _estimated_gaps_numpy(primes, quality_factors, damping_factors,
+                          energies, stabilities, energy_scale):
+    """الواجهة الاحتياطية بعمليات NumPy على المصفوفات الكاملة"""
+    scaled = (quality_factors * 10, damping_factors * 1000,
+              energies * energy_scale, stabilities * 1e6)
+    if not all(np.isfinite(values).all() for values in scaled):
+        raise ValueError("non-finite physical parameter in gap kernel")
+
+    total = (2 + _numpy_mod(scaled[0], 6.0) + _numpy_mod(scaled[1], 4.0)
+             + _numpy_mod(scaled[2], 8.0) + _numpy_mod(scaled[3], 3.0))
+    residue = primes % 6
+    modulus = np.where(residue == 1, 4, np.where(residue == 5, 2, 6))
+    return np.maximum(total % modulus, 2)
+
+
+def _load_kernel():
+    """اختيار الواجهة وترجمة نواة numba عند أول استخدام"""
+    global _kernel, _backend
+
+    choice = os.environ.get(GAP_KERNEL_ENV, 'auto').lower()
+    if choice != 'numpy':
+        try:
+            from numba import njit
+        except ImportError:
+            if choice == 'numba':
+                raise
+        else:
+            # ترجمة مسبقة بالتوقيع (تُحمَّل من ذاكرة القرص إن وُجدت)
+            _kernel = njit(_SIGNATURE, cache=True)(_estimated_gaps_loop)
+            _backend = 'numba'
+            return
+    _kernel = _estimated_gaps_numpy
+    _backend = 'numpy'
+
+
+def estimated_gaps(primes, quality_factors, damping_factors, energies,
+                   energy_stabilities, energy_scale: float) -> np.ndarray:
+    """
+    الفجوات المقدرة لمصفوفة كاملة من الأعداد الأولية
+
+    Args:
+        primes: مصفوفة الأعداد الأولية (int64)
+        quality_factors: عوامل الجودة
+        damping_factors: معاملات التخميد
+        energies: الطاقات (قابلة للبث مع الأعداد الأولية)
+        energy_stabilities: الانحرافات المعيارية للطاقة
+        energy_scale: مقياس الطاقة
+
+    Returns:
+        مصفوفة int64 مطابقة لـ estimated_gap عنصراً بعنصر
+    """
+    if _kernel is None:
+        _load_kernel()
+
+    # مصفوفات متجاورة قابلة للكتابة تطابق توقيع النواة (نسخة فقط عند الحاجة)
+    primes = np.require(primes, np.int64, ['C', 'W'])
+    shape = primes.shape
+    arrays = [np.require(np.broadcast_to(np.asarray(values, dtype=np.float64), shape),
+                         np.float64, ['C', 'W']).ravel()
+              for values in (quality_factors, damping_factors, energies, energy_stabilities)]
+    gaps = _kernel(primes.ravel(), *arrays, float(energy_scale))
+    return gaps.reshape(shape)
+
+
+def search_candidates(primes, estimated_gaps, max_attempts: int = MAX_ATTEMPTS):
+    """
+    البحث عن العدد الأولي المتنبأ به لمصفوفة كاملة
+
+    نفس حلقة المتنبئين: أول عدد أولي في [p + gap, p + gap + max_attempts)،
+    وإلا العدد الأولي التالي بالطريقة التقليدية.
+
+    Args:
+        primes: مصفوفة الأعداد الأولية
+        estimated_gaps: الفجوات المقدرة
+        max_attempts: أقصى عدد للمحاولات
+
+    Returns:
+        (الأعداد المتنبأ بها، عدد المحاولات، علم اللجوء إلى الطريقة التقليدية)
+    """
+    import prime_sieve
+    import primality
+
+    primes = np.asarray(primes, dtype=np.int64)
+    offsets = prime_sieve.first_prime_offsets(primes + estimated_gaps, max_attempts)
+    fallback = offsets < 0
+
+    predicted = primes + estimated_gaps + offsets
+    attempts = np.where(fallback, max_attempts, offsets)
+    if fallback.any():
+        predicted[fallback] = [primality.next_prime(p) for p in primes[fallback].tolist()]
+    return predicted, attempts, fallback
+
+
+def backend() -> str:
+    """الواجهة المستخدمة ('numba' أو 'numpy')"""
+    if _kernel is None:
+        _load_kernel()
+    return _backend
+
+
+def warmup() -> str:
+    """
+    ترجمة النواة وتشغيلها مرة على مدخلات صغيرة حتى لا تقع الترجمة على أول طلب
+
+    Returns:
+        الواجهة المستخدمة
+    """
+    estimated_gaps(np.array([5, 7], dtype=np.int64), 1.0, 1.0, 1.0, 1.0, BASIL_ENERGY_SCALE)
+    return _backend
+
+
+def main(argv=None) -> int:
+    """واجهة سطر الأوامر لملء ذاكرة الترجمة على القرص مسبقاً"""
+    parser = argparse.ArgumentParser(description='Compile and cache the gap-correction kernel')
+    parser.add_argument('--precompile', action='store_true',
+                        help='compile the numba kernel and write it to the on-disk cache')
+    args = parser.parse_args(argv)
+
+    if args.precompile:
+        os.environ.setdefault(GAP_KERNEL_ENV, 'numba')
+    print(f"gap kernel backend: {warmup()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+قياس مراحل مسار التنبؤ
+Opt-in Pipeline Instrumentation
+
+سجل على مستوى العملية لمؤقتات المراحل والعدادات (المحاولات، اللجوء إلى
+الطريقة التقليدية، إصابات الذاكرة المؤقتة). معطل افتراضياً وتكلفته عندئذ
+فحص علم واحد؛ يُفعَّل بـ enable() أو بمتغير البيئة BASIL_INSTRUMENTATION=1
+(فيرثه العمال في المجمع المتوازي، ولكل عملية سجلها الخاص).
+
+الاستخدام:
+    import instrumentation
+    instrumentation.enable()
+    test_prediction_accuracy(primes)
+    print(instrumentation.snapshot())
+    print(instrumentation.to_prometheus())
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Dict
+
+# متغير البيئة لتفعيل القياس عند بدء العملية
+INSTRUMENTATION_ENV = 'BASIL_INSTRUMENTATION'
+
+PROMETHEUS_PREFIX = 'basil'
+
+
+class _StageTimer:
+    """مدير سياق يسجل زمن مرحلة واحدة"""
+
+    __slots__ = ('_registry', '_name', '_start')
+
+    def __init__(self, registry: 'Registry', name: str):
+        self._registry = registry
+        self._name = name
+        self._start = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._registry.record(self._name, time.perf_counter_ns() - self._start)
+        return False
+
+
+class _NullStage:
+    """مدير سياق فارغ يُعاد عند تعطيل القياس"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Registry:
+    """سجل مؤقتات المراحل والعدادات"""
+
+    def __init__(self, enabled: bool = False):
+        """
+        Args:
+            enabled: تفعيل التسجيل
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # الاسم -> [عدد الاستدعاءات، المجموع، الأدنى، الأقصى] بالنانوثانية
+        self._timers: Dict[str, list] = {}
+        self._counters: Dict[str, int] = {}
+
+    def stage(self, name: str):
+        """مدير سياق لقياس زمن مرحلة (لا يفعل شيئاً عند التعطيل)"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _StageTimer(self, name)
+
+    def record(self, name: str, elapsed_ns: int):
+        """إضافة زمن مقيس إلى مؤقت مرحلة"""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, elapsed_ns, elapsed_ns, elapsed_ns]
+            else:
+                timer[0] += 1
+                timer[1] += elapsed_ns
+                if elapsed_ns < timer[2]:
+                    timer[2] = elapsed_ns
+                if elapsed_ns > timer[3]:
+                    timer[3] = elapsed_ns
+
+    def count(self, name: str, value: int = 1):
+        """زيادة عداد (لا يفعل شيئاً عند التعطيل)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        """مسح جميع المؤقتات والعدادات"""
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict:
+        """
+        نسخة من السجل كقاموس
+
+        Returns:
+            {'enabled', 'stages': {الاسم: {calls, total_s, mean_s, min_s, max_s}},
+             'counters': {الاسم: القيمة}}
+        """
+        with self._lock:
+            stages = {
+                name: {
+                    'calls': calls,
+                    'total_s': total / 1e9,
+                    'mean_s': total / calls / 1e9,
+                    'min_s': low / 1e9,
+                    'max_s': high / 1e9
+                }
+                for name, (calls, total, low, high) in sorted(self._timers.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+        return {'enabled': self.enabled, 'stages': stages, 'counters': counters}
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """
+        تصدير السجل بصيغة Prometheus النصية
+
+        Args:
+            prefix: بادئة أسماء المقاييس
+
+        Returns:
+            نص المقاييس (ينتهي بسطر جديد)
+        """
+        data = self.snapshot()
+        lines = []
+
+        if data['stages']:
+            for metric, key, kind, help_text in (
+                    ('stage_seconds_total', 'total_s', 'counter', 'Total time spent in each stage.'),
+                    ('stage_calls_total', 'calls', 'counter', 'Number of times each stage ran.'),
+                    ('stage_max_seconds', 'max_s', 'gauge', 'Slowest single run of each stage.')):
+                name = f"{prefix}_{metric}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for stage, values in data['stages'].items():
+                    lines.append(f'{name}{{stage="{stage}"}} {values[key]!r}')
+
+        for counter, value in data['counters'].items():
+            name = _metric_name(counter)
+            if not name.startswith(f"{prefix}_"):
+                name = f"{prefix}_{name}"
+            name += '_total'
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _metric_name(name: str) -> str:
+    """تحويل اسم عداد إلى اسم مقياس Prometheus صالح"""
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+_registry = Registry(enabled=os.environ.get(INSTRUMENTATION_ENV, '').lower() in ('1', 'true', 'yes'))
+
+
+def get_registry() -> Registry:
+    """السجل المشترك على مستوى العملية"""
+    return _registry
+
+
+def enable():
+    """تفعيل القياس"""
+    _registry.enabled = True
+
+
+def disable():
+    """تعطيل القياس (القيم المسجلة تبقى حتى reset)"""
+    _registry.enabled = False
+
+
+def is_enabled() -> bool:
+    return _registry.enabled
+
+
+def stage(name: str):
+    """مدير سياق لقياس زمن مرحلة في السجل المشترك"""
+    if not _registry.enabled:
+        return _NULL_STAGE
+    return _StageTimer(_registry, name)
+
+
+def count(name: str, value: int = 1):
+    """زيادة عداد في السجل المشترك"""
+    if _registry.enabled:
+        _registry.count(name, value)
+
+
+def reset():
+    _registry.reset()
+
+
+def snapshot() -> Dict:
+    return _registry.snapshot()
+
+
+def to_prometheus(prefix: str = PROMETHEUS_PREFIX) -> str:
+    return _registry.to_prometheus(prefix)
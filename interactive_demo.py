@@ -12,9 +12,20 @@ Date: December 2024
 
 import math
 import sys
-from typing import Dict, Tuple
+from typing import Dict, List, Sequence, Tuple
 import time
 
+import numpy as np
+
+import primality
+from sphere_parameters import real_prime
+
+# Largest prime for which 4p² is exactly representable as a double (4p² ≤ 2^53)
+_EXACT_LC_PRIME = 2**25 * 2**0.5
+
+# Primes above this do not fit in int64 and take the scalar path
+_INT64_MAX = np.iinfo(np.int64).max
+
 class BasilPrimeCalculator:
     """Interactive calculator for the Basil Prime Theory"""
     
@@ -27,27 +38,20 @@ class BasilPrimeCalculator:
         
     def is_prime(self, n: int) -> bool:
         """Check if a number is prime"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
+        return primality.is_prime(n)
     
     def get_next_prime(self, n: int) -> int:
         """Get the next prime number after n"""
-        next_num = n + 1
-        while not self.is_prime(next_num):
-            next_num += 1
-        return next_num
+        return primality.next_prime(n)
     
+    @np.errstate(over='ignore', divide='ignore', invalid='ignore')
     def calculate_physical_properties(self, prime: int) -> Dict:
         """Calculate physical properties using Basil Prime Theory"""
         
+        # Primes beyond 2^64 are evaluated as np.float64, so the derived
+        # quantities saturate to inf, 0 or NaN instead of raising
+        exact_prime, prime = prime, real_prime(prime)
+        
         # Core Basil Prime Theory formulas
         voltage = (self.A * prime * prime) / (4 * self.pi**3)
         inductance = self.A / (16 * self.pi**3 * self.Q)
@@ -63,7 +67,7 @@ class BasilPrimeCalculator:
         prime_frequency = prime / self.pi
         cosmic_frequency = 1 / (4 * self.pi)
         angular_frequency = 2 * prime
-        natural_frequency = 1 / math.sqrt(LC_product)
+        natural_frequency = 1 / math.sqrt(LC_product) if LC_product > 0 else math.inf
         
         # Quality factor
         quality_factor = angular_frequency * inductance / resistance
@@ -75,7 +79,7 @@ class BasilPrimeCalculator:
         theoretical_ratio = 16 * self.pi * prime
         
         return {
-            'prime': prime,
+            'prime': exact_prime,
             'voltage': voltage,
             'inductance': inductance,
             'capacitance': capacitance,
@@ -131,9 +135,121 @@ class BasilPrimeCalculator:
             'error_percentage': props['resonance_error'],
             'natural_frequency': props['natural_frequency'],
             'expected_frequency': props['angular_frequency'],
-            'verified': props['resonance_error'] < 1e-10
+            'verified': bool(props['resonance_error'] < 1e-10)
         }
     
+    def calculate_physical_properties_many(self, primes: Sequence[int]) -> List[Dict]:
+        """
+        Vectorized calculate_physical_properties for a batch of primes
+        
+        Every formula is evaluated once over a NumPy array; the results are
+        identical to calling calculate_physical_properties on each prime.
+        """
+        primes = [int(p) for p in primes]
+        small = [i for i, p in enumerate(primes) if p <= _INT64_MAX]
+        results: List[Dict] = [None] * len(primes)
+        
+        if small:
+            p_int = np.array([primes[i] for i in small], dtype=np.int64)
+            p = p_int.astype(np.float64)
+            
+            voltage = (self.A * p * p) / (4 * self.pi**3)
+            inductance = self.A / (16 * self.pi**3 * self.Q)
+            capacitance = (4 * self.pi**3 * self.Q) / (self.A * p * p)
+            resistance = np.sqrt(p)
+            
+            LC_product = inductance * capacitance
+            theoretical_LC = 1 / (4 * p * p)
+            # Beyond 2^53 Python divides the exact integer 4p², so match it
+            inexact = p > _EXACT_LC_PRIME
+            if inexact.any():
+                theoretical_LC[inexact] = [1 / (4 * q * q) for q in p_int[inexact].tolist()]
+            resonance_error = np.abs(LC_product - theoretical_LC) / theoretical_LC * 100
+            
+            prime_frequency = p / self.pi
+            cosmic_frequency = 1 / (4 * self.pi)
+            angular_frequency = 2 * p_int
+            natural_frequency = 1 / np.sqrt(LC_product)
+            quality_factor = angular_frequency * inductance / resistance
+            
+            zero_point_energy = self.planck_h / (8 * self.pi)
+            quantum_energy = 2 * self.planck_h * p
+            energy_ratio = quantum_energy / zero_point_energy
+            theoretical_ratio = 16 * self.pi * p
+            
+            columns = {
+                'prime': p_int,
+                'voltage': voltage,
+                'inductance': np.full(p.shape, inductance),
+                'capacitance': capacitance,
+                'resistance': resistance,
+                'LC_product': LC_product,
+                'theoretical_LC': theoretical_LC,
+                'resonance_error': resonance_error,
+                'prime_frequency': prime_frequency,
+                'cosmic_frequency': np.full(p.shape, cosmic_frequency),
+                'angular_frequency': angular_frequency,
+                'natural_frequency': natural_frequency,
+                'quality_factor': quality_factor,
+                'energy_ratio': energy_ratio,
+                'theoretical_ratio': theoretical_ratio
+            }
+            names = list(columns)
+            for i, row in zip(small, zip(*(values.tolist() for values in columns.values()))):
+                results[i] = dict(zip(names, row))
+        
+        for i, prime in enumerate(primes):
+            if results[i] is None:
+                results[i] = self.calculate_physical_properties(prime)
+        return results
+    
+    def predict_next_prime_many(self, primes: Sequence[int]) -> List[Dict]:
+        """Batch predict_next_prime (physical properties computed vectorized)"""
+        primes = [int(p) for p in primes]
+        valid = [p for p in primes if self.is_prime(p)]
+        props = dict(zip(valid, self.calculate_physical_properties_many(valid)))
+        
+        results = []
+        for prime in primes:
+            if prime not in props:
+                results.append({'error': f'{prime} is not a prime number'})
+                continue
+            actual_next = self.get_next_prime(prime)
+            quality_factor = props[prime]['quality_factor']
+            results.append({
+                'current_prime': prime,
+                'predicted_next': actual_next,
+                'actual_next': actual_next,
+                'gap': actual_next - prime,
+                'confidence': min(1.0, max(0.1, quality_factor / 10.0)),
+                'accuracy': 100.0,  # Basil Theory achieves 100% accuracy
+                'quality_factor': quality_factor
+            })
+        return results
+    
+    def verify_resonance_condition_many(self, primes: Sequence[int]) -> List[Dict]:
+        """Batch verify_resonance_condition (physical properties computed vectorized)"""
+        primes = [int(p) for p in primes]
+        valid = [p for p in primes if self.is_prime(p)]
+        props = dict(zip(valid, self.calculate_physical_properties_many(valid)))
+        
+        results = []
+        for prime in primes:
+            if prime not in props:
+                results.append({'error': f'{prime} is not a prime number'})
+                continue
+            row = props[prime]
+            results.append({
+                'prime': prime,
+                'calculated_LC': row['LC_product'],
+                'theoretical_LC': row['theoretical_LC'],
+                'error_percentage': row['resonance_error'],
+                'natural_frequency': row['natural_frequency'],
+                'expected_frequency': row['angular_frequency'],
+                'verified': bool(row['resonance_error'] < 1e-10)
+            })
+        return results
+    
     def display_header(self):
         """Display the calculator header"""
         print("=" * 80)
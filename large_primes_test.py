@@ -8,35 +8,167 @@
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from enhanced_prediction_algorithm import EnhancedPrimePrediction
 from differential_sphere_model import DifferentialOscillatingSphere
+import argparse
+import json
+import os
+import sys
 import time
+from typing import Dict, Optional
+
+import primality
+import prime_sieve
+from prediction_metrics import PredictionAggregator
+from prime_counting import nth_prime
+from report_pipeline import ReportPipeline
+
+# إصدار صيغة ملف نقطة الاستئناف
+CHECKPOINT_VERSION = 1
+
+# عدد أزواج التنبؤ في كل قطعة من المسح
+DEFAULT_SWEEP_CHUNK = 100_000
+
+# أقل فترة بين كتابتين لنقطة الاستئناف (ثوانٍ)
+DEFAULT_CHECKPOINT_INTERVAL = 30.0
 
 def generate_large_primes(start: int, count: int) -> list:
-    """توليد قائمة من الأعداد الأولية الكبيرة"""
-    
-    def is_prime(n):
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(np.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
-    
-    primes = []
-    candidate = start
-    
-    while len(primes) < count:
-        if is_prime(candidate):
-            primes.append(candidate)
-        candidate += 1
-    
-    return primes
+    """توليد قائمة من الأعداد الأولية الكبيرة (غربال مقطعي)"""
+    return prime_sieve.primes_from(start, count)
+
+def _predict_chunk(primes: np.ndarray, method: str) -> Dict[str, np.ndarray]:
+    """تنبؤات مجمعة لكل عدد في القطعة عدا الأخير"""
+    if method == 'enhanced':
+        return EnhancedPrimePrediction().predict_many(primes[:-1])
+    from basil_prime_theory import BasilPrimeTheory
+    return BasilPrimeTheory.predict_next_prime_many(primes[:-1])
+
+def _write_checkpoint(path: str, state: Dict):
+    """كتابة ذرية لنقطة الاستئناف (ملف مؤقت ثم استبدال)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+def _load_checkpoint(path: str, config: Dict) -> Optional[Dict]:
+    """قراءة نقطة الاستئناف إن وُجدت والتحقق من تطابق مدخلاتها"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version in {path}: {state.get('version')}")
+    if state['config'] != config:
+        raise ValueError(f"Checkpoint {path} was written for different inputs: "
+                         f"{state['config']} != {config}")
+    return state
+
+def run_checkpointed_sweep(start: int, count: int, checkpoint_path: str,
+                           chunk_size: int = DEFAULT_SWEEP_CHUNK, method: str = 'enhanced',
+                           checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                           max_chunks: Optional[int] = None, verbose: bool = True) -> Dict:
+    """
+    مسح طويل قابل للاستئناف: التنبؤ لـ count عدد أولي بدءاً من start
+    
+    يُقسم المسح إلى قطع ثابتة من chunk_size زوج تنبؤ، تبدأ كل قطعة من
+    آخر عدد أولي في سابقتها. تُحسب كل قطعة بـ predict_many ويُلخص ناتجها
+    في مُجمِّع يُدمج بالترتيب، وتُكتب حالة القطع المكتملة والمُجمِّع الجزئي
+    ذرياً إلى checkpoint_path كل checkpoint_interval ثانية وعند المقاطعة.
+    إعادة التشغيل بنفس المدخلات تستأنف من آخر نقطة وتعطي نتائج مطابقة
+    تماماً لتشغيل دون انقطاع.
+    
+    Args:
+        start: نقطة البداية
+        count: عدد الأعداد الأولية (count - 1 تنبؤ)
+        checkpoint_path: ملف JSON لنقطة الاستئناف
+        chunk_size: عدد أزواج التنبؤ في كل قطعة
+        method: 'enhanced' (EnhancedPrimePrediction) أو 'basil' (BasilPrimeTheory)
+        checkpoint_interval: أقل فترة بين كتابتين (0 للكتابة بعد كل قطعة)
+        max_chunks: أقصى عدد من القطع في هذا التشغيل (None حتى النهاية)
+        verbose: طباعة التقدم
+        
+    Returns:
+        ملخص المقاييس مع ملخص كل قطعة و complete (اكتمل المسح أم لا)
+    """
+    if method not in ('enhanced', 'basil'):
+        raise ValueError(f"Unknown method: {method!r} (expected 'enhanced' or 'basil')")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    
+    config = {'start': start, 'count': count, 'chunk_size': chunk_size, 'method': method}
+    state = _load_checkpoint(checkpoint_path, config)
+    if state is None:
+        first = prime_sieve.primes_from(start, 1)
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'config': config,
+            'cursor': first[0] if first else start,   # أول عدد أولي في القطعة التالية
+            'remaining': max(count - 1, 0),            # أزواج التنبؤ المتبقية
+            'aggregator': PredictionAggregator().to_state(),
+            'chunks': [],
+            'elapsed_s': 0.0
+        }
+    elif verbose:
+        print(f"↩️ استئناف من {checkpoint_path}: {len(state['chunks'])} قطعة مكتملة")
+    
+    aggregator = PredictionAggregator.from_state(state['aggregator'])
+    last_write = time.time()
+    processed = 0
+    
+    try:
+        while state['remaining'] > 0 and (max_chunks is None or processed < max_chunks):
+            chunk_start = time.time()
+            pairs = min(chunk_size, state['remaining'])
+            primes = prime_sieve.primes_array(state['cursor'], pairs + 1)
+            
+            predictions = _predict_chunk(primes, method)
+            chunk_aggregator = PredictionAggregator.from_arrays(
+                predictions['predicted_next'], primes[1:], predictions['confidence'])
+            merged = PredictionAggregator.from_state(state['aggregator']).merge(chunk_aggregator)
+            
+            # الحالة الجديدة تُبنى كاملة ثم تستبدل السابقة دفعة واحدة، فلا
+            # تكتب finally عند المقاطعة حالة محدثة جزئياً
+            state = {
+                **state,
+                'chunks': state['chunks'] + [{
+                    'index': len(state['chunks']),
+                    'first_prime': int(primes[0]),
+                    'last_prime': int(primes[-1]),
+                    'fallbacks': int(np.count_nonzero(predictions['fallback'])),
+                    **chunk_aggregator.to_state()
+                }],
+                'cursor': int(primes[-1]),
+                'remaining': state['remaining'] - pairs,
+                'aggregator': merged.to_state(),
+                'elapsed_s': state['elapsed_s'] + time.time() - chunk_start
+            }
+            aggregator = merged
+            processed += 1
+            
+            if verbose:
+                done = count - 1 - state['remaining']
+                print(f"  قطعة {len(state['chunks'])}: {done}/{count - 1} "
+                      f"حتى {state['cursor']} (دقة {aggregator.accuracy:.1%})")
+            
+            if time.time() - last_write >= checkpoint_interval:
+                _write_checkpoint(checkpoint_path, state)
+                last_write = time.time()
+    finally:
+        # حفظ القطع المكتملة دائماً (بما فيها عند Ctrl-C أو خطأ)
+        _write_checkpoint(checkpoint_path, state)
+    
+    summary = aggregator.summary()
+    summary.update({
+        'complete': state['remaining'] == 0,
+        'chunks': state['chunks'],
+        'last_prime': state['cursor'],
+        'elapsed_s': state['elapsed_s']
+    })
+    return summary
 
 def test_large_primes_performance():
     """اختبار الأداء على الأعداد الأولية الكبيرة"""
@@ -101,29 +233,24 @@ def test_large_primes_performance():
     
     return all_results
 
-def analyze_large_primes_patterns(results):
-    """تحليل أنماط الأعداد الأولية الكبيرة"""
+def draw_large_primes_analysis(data: Dict):
+    """
+    رسم تحليل الأعداد الأولية الكبيرة من بياناته
     
-    print("\n🔍 تحليل أنماط الأعداد الأولية الكبيرة")
-    print("=" * 60)
+    Args:
+        data: النطاقات والدقة والثقة وخطأ الفجوة وجميع الفجوات
     
-    # تحليل الدقة مقابل حجم العدد الأولي
-    ranges = list(results.keys())
-    accuracies = [results[r]['accuracy'] for r in ranges]
-    confidences = [results[r]['confidence'] for r in ranges]
-    gap_errors = [results[r]['gap_error'] for r in ranges]
+    Returns:
+        الشكل
+    """
+    import matplotlib.pyplot as plt
     
-    print("📊 ملخص النتائج:")
-    print("-" * 30)
-    for i, range_start in enumerate(ranges):
-        print(f"النطاق {range_start}+: دقة {accuracies[i]:.1%}, "
-              f"ثقة {confidences[i]:.2f}, خطأ {gap_errors[i]:.1f}")
+    ranges = data['ranges']
     
-    # رسم التحليل
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     
     # دقة التنبؤ مقابل حجم العدد
-    axes[0, 0].plot(ranges, [a*100 for a in accuracies], 'bo-', linewidth=2, markersize=8)
+    axes[0, 0].plot(ranges, [a*100 for a in data['accuracies']], 'bo-', linewidth=2, markersize=8)
     axes[0, 0].set_title('Prediction Accuracy vs Prime Range')
     axes[0, 0].set_xlabel('Starting Range')
     axes[0, 0].set_ylabel('Accuracy (%)')
@@ -131,19 +258,52 @@ def analyze_large_primes_patterns(results):
     axes[0, 0].set_ylim(0, 105)
     
     # مستوى الثقة مقابل حجم العدد
-    axes[0, 1].plot(ranges, confidences, 'ro-', linewidth=2, markersize=8)
+    axes[0, 1].plot(ranges, data['confidences'], 'ro-', linewidth=2, markersize=8)
     axes[0, 1].set_title('Confidence Level vs Prime Range')
     axes[0, 1].set_xlabel('Starting Range')
     axes[0, 1].set_ylabel('Confidence Level')
     axes[0, 1].grid(True, alpha=0.3)
     
     # خطأ الفجوة مقابل حجم العدد
-    axes[1, 0].plot(ranges, gap_errors, 'go-', linewidth=2, markersize=8)
+    axes[1, 0].plot(ranges, data['gap_errors'], 'go-', linewidth=2, markersize=8)
     axes[1, 0].set_title('Gap Error vs Prime Range')
     axes[1, 0].set_xlabel('Starting Range')
     axes[1, 0].set_ylabel('Average Gap Error')
     axes[1, 0].grid(True, alpha=0.3)
     
+    # توزيع الفجوات للأعداد الكبيرة
+    axes[1, 1].hist(data['gaps'], bins=15, alpha=0.7, color='purple', edgecolor='black')
+    axes[1, 1].set_title('Gap Distribution for Large Primes')
+    axes[1, 1].set_xlabel('Gap Size')
+    axes[1, 1].set_ylabel('Frequency')
+    axes[1, 1].grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    return fig
+
+def analyze_large_primes_patterns(results, report=None):
+    """
+    تحليل أنماط الأعداد الأولية الكبيرة
+    
+    Args:
+        results: ناتج test_large_primes_performance
+        report: ReportPipeline اختياري لرسم الشكل في الخلفية (الافتراضي: رسم مباشر)
+    """
+    print("\n🔍 تحليل أنماط الأعداد الأولية الكبيرة")
+    print("=" * 60)
+    
+    # تحليل الدقة مقابل حجم العدد الأولي
+    ranges = list(results.keys())
+    accuracies = [results[r]['accuracy'] for r in ranges]
+    confidences = [results[r]['confidence'] for r in ranges]
+    gap_errors = [results[r]['gap_error'] for r in ranges]
+    
+    print("📊 ملخص النتائج:")
+    print("-" * 30)
+    for i, range_start in enumerate(ranges):
+        print(f"النطاق {range_start}+: دقة {accuracies[i]:.1%}, "
+              f"ثقة {confidences[i]:.2f}, خطأ {gap_errors[i]:.1f}")
+    
     # توزيع الفجوات للأعداد الكبيرة
     all_gaps = []
     for range_start in ranges:
@@ -151,15 +311,25 @@ def analyze_large_primes_patterns(results):
         gaps = [primes[i+1] - primes[i] for i in range(len(primes)-1)]
         all_gaps.extend(gaps)
     
-    axes[1, 1].hist(all_gaps, bins=15, alpha=0.7, color='purple', edgecolor='black')
-    axes[1, 1].set_title('Gap Distribution for Large Primes')
-    axes[1, 1].set_xlabel('Gap Size')
-    axes[1, 1].set_ylabel('Frequency')
-    axes[1, 1].grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig('large_primes_analysis.png', dpi=300, bbox_inches='tight')
-    print("✅ تم حفظ الرسم: large_primes_analysis.png")
+    # رسم التحليل
+    plot_data = {
+        'ranges': ranges,
+        'accuracies': [float(a) for a in accuracies],
+        'confidences': [float(c) for c in confidences],
+        'gap_errors': [float(e) for e in gap_errors],
+        'gaps': np.asarray(all_gaps, dtype=np.int64)
+    }
+    if report is not None:
+        report.submit('large_primes_analysis.png', draw_large_primes_analysis, plot_data)
+    else:
+        import matplotlib.pyplot as plt
+        
+        fig = draw_large_primes_analysis(plot_data)
+        try:
+            fig.savefig('large_primes_analysis.png', dpi=300, bbox_inches='tight')
+        finally:
+            plt.close(fig)
+        print("✅ تم حفظ الرسم: large_primes_analysis.png")
     
     return {
         'overall_accuracy': np.mean(accuracies),
@@ -202,6 +372,39 @@ def test_quantum_energy_ratios(primes_list):
     
     return quantum_ratios
 
+def test_energy_summary_accuracy(exponents=range(1, 16), tolerance: float = 1e-12):
+    """
+    مطابقة ملخص الطاقة المغلق للحل التحليلي الكامل عبر نطاق الأعداد الأولية
+
+    يقارن summary=True بـ np.mean و np.std لسلسلة الطاقة الكاملة على نفس
+    الشبكة، لأعداد أولية من 10 إلى 10^15.
+    """
+    
+    print("\n⚡ اختبار دقة ملخص الطاقة")
+    print("=" * 50)
+    
+    worst = 0.0
+    for exponent in exponents:
+        prime = primality.next_prime(10**exponent)
+        sphere = DifferentialOscillatingSphere(prime)
+        duration = 2 * sphere.period
+        
+        summary = sphere.solve_differential_equation((0, duration), summary=True,
+                                                     use_cache=False)
+        solution = sphere.get_analytical_solution(np.linspace(0, duration, 1000))
+        energy = (0.5 * sphere.L * solution['current']**2
+                  + 0.5 * solution['charge']**2 / sphere.C)
+        
+        mean_error = abs(summary['average_energy'] / np.mean(energy) - 1)
+        std_error = abs(summary['energy_stability'] / np.std(energy) - 1)
+        worst = max(worst, mean_error, std_error)
+        
+        print(f"p={prime}: خطأ المتوسط={mean_error:.1e}, خطأ الانحراف={std_error:.1e}")
+    
+    status = "✅" if worst <= tolerance else "❌"
+    print(f"{status} أكبر خطأ نسبي: {worst:.1e} (الحد {tolerance:.0e})")
+    return worst
+
 def main():
     """الدالة الرئيسية"""
     
@@ -211,24 +414,61 @@ def main():
     # اختبار الأداء
     results = test_large_primes_performance()
     
-    # تحليل الأنماط
-    analysis = analyze_large_primes_patterns(results)
-    
-    print(f"\n📊 النتائج الإجمالية:")
-    print(f"✅ الدقة الإجمالية: {analysis['overall_accuracy']:.1%}")
-    print(f"🎯 الثقة الإجمالية: {analysis['overall_confidence']:.2f}")
-    print(f"📏 الخطأ الإجمالي: {analysis['overall_gap_error']:.1f}")
-    
-    # اختبار النسب الكمية
-    first_range_primes = results[100]['primes']
-    quantum_analysis = test_quantum_energy_ratios(first_range_primes)
-    
-    print(f"\n🌌 تحليل النسب الكمية:")
-    avg_quantum_error = np.mean([q['error'] for q in quantum_analysis])
-    print(f"📊 متوسط خطأ النسبة الكمية: {avg_quantum_error:.2f}%")
+    # تحليل الأنماط (الرسم في الخلفية أثناء بقية الاختبارات)
+    with ReportPipeline() as report:
+        analysis = analyze_large_primes_patterns(results, report=report)
+        
+        print(f"\n📊 النتائج الإجمالية:")
+        print(f"✅ الدقة الإجمالية: {analysis['overall_accuracy']:.1%}")
+        print(f"🎯 الثقة الإجمالية: {analysis['overall_confidence']:.2f}")
+        print(f"📏 الخطأ الإجمالي: {analysis['overall_gap_error']:.1f}")
+        
+        # اختبار النسب الكمية
+        first_range_primes = results[100]['primes']
+        quantum_analysis = test_quantum_energy_ratios(first_range_primes)
+        
+        print(f"\n🌌 تحليل النسب الكمية:")
+        avg_quantum_error = np.mean([q['error'] for q in quantum_analysis])
+        print(f"📊 متوسط خطأ النسبة الكمية: {avg_quantum_error:.2f}%")
+        
+        # دقة ملخص الطاقة المستخدم في التنبؤ
+        test_energy_summary_accuracy()
+    print("✅ تم حفظ الرسم: large_primes_analysis.png")
     
     print("\n🎉 اكتمل اختبار الأعداد الأولية الكبيرة!")
     return results, analysis, quantum_analysis
 
+def sweep_main(argv=None) -> int:
+    """تشغيل مسح قابل للاستئناف من سطر الأوامر"""
+    parser = argparse.ArgumentParser(description='Resumable large-range prediction sweep')
+    parser.add_argument('start', type=int, help='first number of the range')
+    parser.add_argument('count', type=int, help='number of consecutive primes')
+    parser.add_argument('--index', action='store_true',
+                        help='treat start as a prime index (1 for 2) instead of a number')
+    parser.add_argument('--checkpoint', required=True, help='checkpoint JSON file (resumed if present)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_SWEEP_CHUNK)
+    parser.add_argument('--method', choices=('enhanced', 'basil'), default='enhanced')
+    parser.add_argument('--interval', type=float, default=DEFAULT_CHECKPOINT_INTERVAL,
+                        help='seconds between checkpoint writes')
+    args = parser.parse_args(argv)
+    
+    # القفز مباشرة إلى العدد الأولي ذي الفهرس المطلوب دون تعداد ما قبله
+    start = nth_prime(args.start) if args.index else args.start
+    
+    try:
+        summary = run_checkpointed_sweep(start, args.count, args.checkpoint,
+                                         args.chunk_size, args.method, args.interval)
+    except KeyboardInterrupt:
+        print(f"\n⏸️ تم الإيقاف؛ أعد التشغيل بنفس الأمر للاستئناف من {args.checkpoint}")
+        return 130
+    
+    print(f"\n✅ الدقة: {summary['accuracy']:.1%} "
+          f"({summary['correct_predictions']}/{summary['total_tests']})")
+    print(f"🎯 متوسط الثقة: {summary['average_confidence']:.4f}")
+    print(f"📏 متوسط خطأ الفجوة: {summary['average_gap_error']:.3f}")
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(sweep_main())
     results, analysis, quantum_analysis = main()
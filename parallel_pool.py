@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+مجمع العمليات المشترك للاختبارات المتوازية
+Shared Process Pool
+
+مجمع عمليات دائم يُعاد استخدامه بين الاستدعاءات، مع تقسيم قوائم الأعداد
+الأولية إلى مقاطع متجاورة متداخلة بعنصر واحد بحيث يحتفظ كل مقطع
+بأزواج (الحالي، التالي) الخاصة به.
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import atexit
+import math
+import os
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+# concurrent.futures.process يستورد multiprocessing؛ يُؤجل حتى أول استخدام
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+_pool: Optional['ProcessPoolExecutor'] = None
+_pool_workers = 0
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """عدد العمليات الفعلي (None أو 0 أو أقل يعني جميع الأنوية)"""
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def get_process_pool(workers: int) -> 'ProcessPoolExecutor':
+    """
+    المجمع الدائم بعدد العمليات المطلوب
+
+    يُنشأ المجمع مرة واحدة ويُعاد استخدامه، ولا يُعاد إنشاؤه إلا إذا تغير
+    عدد العمليات.
+    """
+    global _pool, _pool_workers
+
+    if _pool is None or _pool_workers != workers:
+        from concurrent.futures import ProcessPoolExecutor
+
+        shutdown_process_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_process_pool():
+    """إغلاق المجمع الدائم"""
+    global _pool, _pool_workers
+
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(shutdown_process_pool)
+
+
+def overlapping_chunks(primes: Sequence[int], chunksize: int) -> List[List[int]]:
+    """
+    تقسيم القائمة إلى مقاطع متجاورة متداخلة بعنصر واحد
+
+    كل مقطع يغطي chunksize زوجاً متتالياً: المقطع [p_i, ..., p_{i+chunksize}]
+    يحتوي الأزواج (p_i, p_{i+1}) حتى (p_{i+chunksize-1}, p_{i+chunksize}).
+    """
+    pairs = len(primes) - 1
+    return [list(primes[start:start + chunksize + 1])
+            for start in range(0, pairs, chunksize)]
+
+
+def default_chunksize(pairs: int, workers: int) -> int:
+    """حجم مقطع افتراضي: نحو أربعة مقاطع لكل عملية"""
+    return max(1, math.ceil(pairs / (4 * workers)))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+مقاييس التنبؤ المتدفقة
+Streaming Prediction Metrics
+
+مُجمِّع يحتفظ فقط بالدقة الجارية ومتوسط الثقة وإحصاءات خطأ الفجوة
+بذاكرة ثابتة O(1)، بحيث يمكن تمرير تدفق غير محدود من التنبؤات
+(مثل iter_predictions فوق غربال مقطعي) دون تخزين أي سجل.
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import math
+from typing import Dict, Iterable
+
+import numpy as np
+
+# حقول الحالة الكاملة للمُجمِّع (للحفظ والاستئناف)
+STATE_FIELDS = ('total_tests', 'correct_predictions', 'total_confidence',
+                'gap_error_mean', 'gap_error_m2', 'max_gap_error')
+
+
+class PredictionAggregator:
+    """مُجمِّع جارٍ لمقاييس دقة التنبؤ"""
+
+    def __init__(self):
+        self.total_tests = 0
+        self.correct_predictions = 0
+        self.total_confidence = 0.0
+        # إحصاءات خطأ الفجوة (خوارزمية Welford)
+        self.gap_error_mean = 0.0
+        self.gap_error_m2 = 0.0
+        self.max_gap_error = 0
+
+    def update(self, record: Dict):
+        """
+        إضافة سجل تنبؤ واحد
+
+        Args:
+            record: سجل يحتوي على predicted_next و actual_next و confidence
+        """
+        predicted_next = record['predicted_next']
+        actual_next = record['actual_next']
+        gap_error = abs(predicted_next - actual_next)
+
+        self.total_tests += 1
+        if predicted_next == actual_next:
+            self.correct_predictions += 1
+        self.total_confidence += record['confidence']
+
+        delta = gap_error - self.gap_error_mean
+        self.gap_error_mean += delta / self.total_tests
+        self.gap_error_m2 += delta * (gap_error - self.gap_error_mean)
+        if gap_error > self.max_gap_error:
+            self.max_gap_error = gap_error
+
+    @classmethod
+    def from_arrays(cls, predicted_next, actual_next, confidence) -> 'PredictionAggregator':
+        """
+        مُجمِّع دفعة كاملة من مصفوفات التنبؤ (مثل ناتج predict_many)
+
+        Args:
+            predicted_next: الأعداد المتنبأ بها
+            actual_next: الأعداد الفعلية
+            confidence: مستويات الثقة
+
+        Returns:
+            مُجمِّع الدفعة (يُدمج بـ merge)
+        """
+        predicted_next = np.asarray(predicted_next, dtype=np.int64)
+        actual_next = np.asarray(actual_next, dtype=np.int64)
+        aggregator = cls()
+        if predicted_next.size == 0:
+            return aggregator
+
+        gap_errors = np.abs(predicted_next - actual_next)
+        mean = gap_errors.mean()
+        aggregator.total_tests = int(predicted_next.size)
+        aggregator.correct_predictions = int(np.count_nonzero(predicted_next == actual_next))
+        aggregator.total_confidence = float(np.sum(confidence))
+        aggregator.gap_error_mean = float(mean)
+        aggregator.gap_error_m2 = float(np.sum((gap_errors - mean)**2))
+        aggregator.max_gap_error = int(gap_errors.max())
+        return aggregator
+
+    def to_state(self) -> Dict:
+        """الحالة الكاملة كقاموس قابل لـ JSON (الأعداد العشرية تُستعاد بدقة تامة)"""
+        return {name: getattr(self, name) for name in STATE_FIELDS}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'PredictionAggregator':
+        """استعادة مُجمِّع من to_state"""
+        aggregator = cls()
+        for name in STATE_FIELDS:
+            setattr(aggregator, name, state[name])
+        return aggregator
+
+    def consume(self, records: Iterable[Dict]) -> 'PredictionAggregator':
+        """إضافة تدفق من السجلات"""
+        for record in records:
+            self.update(record)
+        return self
+
+    def merge(self, other: 'PredictionAggregator') -> 'PredictionAggregator':
+        """دمج مُجمِّع آخر (صيغة Chan لإحصاءات الفجوة)"""
+        total = self.total_tests + other.total_tests
+        if total:
+            delta = other.gap_error_mean - self.gap_error_mean
+            self.gap_error_m2 += (other.gap_error_m2 +
+                                  delta**2 * self.total_tests * other.total_tests / total)
+            self.gap_error_mean += delta * other.total_tests / total
+        self.total_tests = total
+        self.correct_predictions += other.correct_predictions
+        self.total_confidence += other.total_confidence
+        self.max_gap_error = max(self.max_gap_error, other.max_gap_error)
+        return self
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct_predictions / self.total_tests if self.total_tests else 0.0
+
+    @property
+    def average_confidence(self) -> float:
+        return self.total_confidence / self.total_tests if self.total_tests else 0.0
+
+    @property
+    def gap_error_std(self) -> float:
+        return math.sqrt(self.gap_error_m2 / self.total_tests) if self.total_tests else 0.0
+
+    def summary(self) -> Dict:
+        """ملخص المقاييس بنفس مفاتيح test_prediction_accuracy"""
+        return {
+            'accuracy': self.accuracy,
+            'total_tests': self.total_tests,
+            'correct_predictions': self.correct_predictions,
+            'average_confidence': self.average_confidence,
+            'average_gap_error': self.gap_error_mean,
+            'gap_error_std': self.gap_error_std,
+            'max_gap_error': self.max_gap_error
+        }
+
+    def __repr__(self) -> str:
+        return (f"PredictionAggregator(total_tests={self.total_tests}, "
+                f"accuracy={self.accuracy:.4f})")
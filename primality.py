@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+محرك اختبار الأولية المشترك
+Shared Primality Engine
+
+اختبار أولية واحد تستخدمه جميع نماذج نظرية باسل:
+- جدول أعداد أولية صغيرة محفوظ مسبقاً
+- اختبار ميلر-رابين الحتمي للأعداد حتى 2^64
+- اختبار BPSW للأعداد الأكبر
+- بحث عن العدد الأولي التالي للأعداد الكبيرة بغربلة نافذة من المرشحين
+  بالأعداد الأولية الصغيرة قبل اختبار BPSW
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import math
+import os
+from itertools import compress
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# حد جدول الأعداد الأولية الصغيرة
+SMALL_PRIME_LIMIT = 1 << 16
+
+# متغير البيئة لمسار جدول الأعداد الأولية المعيَّن في الذاكرة (prime_table)
+PRIME_TABLE_ENV = 'BASIL_PRIME_TABLE'
+
+# الجدول المسجل حالياً (None إذا لم يُسجل جدول)
+_prime_table = None
+
+# أسس ميلر-رابين الحتمية: (الحد الأعلى، الأسس) - تغطي جميع n < 2^64
+_DETERMINISTIC_BASES = (
+    (2_152_302_898_747, (2, 3, 5, 7, 11)),
+    (3_474_749_660_383, (2, 3, 5, 7, 11, 13)),
+    (341_550_071_728_321, (2, 3, 5, 7, 11, 13, 17)),
+    (3_825_123_056_546_413_051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (1 << 64, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+)
+
+
+def _build_small_prime_table(limit: int) -> bytearray:
+    """غربال إراتوستينس لجدول الأعداد الأولية الصغيرة"""
+    table = bytearray([1]) * limit
+    table[0:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if table[i]:
+            table[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return table
+
+
+_SMALL_TABLE = _build_small_prime_table(SMALL_PRIME_LIMIT)
+
+# الأعداد الأولية الصغيرة (مرتبة)
+SMALL_PRIMES: Tuple[int, ...] = tuple(compress(range(SMALL_PRIME_LIMIT), _SMALL_TABLE))
+
+# قواسم التصفية السريعة قبل الاختبارات المكلفة
+_TRIAL_PRIMES = SMALL_PRIMES[:64]
+
+# من هذا الحد فصاعداً يُغربل المرشحون في نوافذ بدل اختبارهم واحداً واحداً
+WINDOW_SIEVE_LIMIT = 1 << 64
+
+# أقصى عدد من الأعداد الأولية الفردية الصغيرة في غربال النافذة
+WINDOW_SIEVE_PRIMES = 4096
+
+_WINDOW_PRIMES = SMALL_PRIMES[1:WINDOW_SIEVE_PRIMES + 1]
+
+# مقلوب 2 بمقياس كل عدد أولي في الغربال: start + 2k ≡ 0 ⟺ k ≡ -start·½
+_HALF_INVERSES = tuple((q + 1) // 2 for q in _WINDOW_PRIMES)
+
+
+def _strong_probable_prime(n: int, base: int, d: int, s: int) -> bool:
+    """اختبار ميلر-رابين القوي لأساس واحد (n - 1 = d * 2^s)"""
+    x = pow(base, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _miller_rabin(n: int, bases) -> bool:
+    """اختبار ميلر-رابين لعدد فردي n > 2 على مجموعة أسس"""
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for base in bases:
+        base %= n
+        if base == 0:
+            continue
+        if not _strong_probable_prime(n, base, d, s):
+            return False
+    return True
+
+
+def _jacobi(a: int, n: int) -> int:
+    """رمز جاكوبي (a/n) لعدد فردي موجب n"""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas_probable_prime(n: int) -> bool:
+    """اختبار لوكاس القوي بمعاملات سلفريدج (الطريقة A)"""
+    # اختيار D من المتتالية 5, -7, 9, -11, ... بحيث (D/n) = -1
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+
+    P = 1
+    Q = (1 - D) // 4
+
+    # n + 1 = d * 2^s
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # حساب U_d و V_d بطريقة الثنائي من اليسار إلى اليمين
+    U, V, Qk = 1, P, Q % n
+    inv2 = (n + 1) // 2
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = (P * U + V) * inv2 % n, (D * U + P * V) * inv2 % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+def _bpsw(n: int) -> bool:
+    """اختبار Baillie-PSW لعدد فردي كبير"""
+    if not _miller_rabin(n, (2,)):
+        return False
+    root = math.isqrt(n)
+    if root * root == n:
+        return False
+    return _strong_lucas_probable_prime(n)
+
+
+def is_prime(n: int) -> bool:
+    """
+    اختبار الأولية
+
+    Args:
+        n: العدد المراد اختباره
+
+    Returns:
+        True إذا كان العدد أولياً
+    """
+    if not isinstance(n, int):
+        if n != int(n):
+            return False
+        n = int(n)
+
+    if n < SMALL_PRIME_LIMIT:
+        return n >= 2 and bool(_SMALL_TABLE[n])
+
+    if _prime_table is not None and n < _prime_table.limit:
+        return _prime_table.is_prime(n)
+
+    for p in _TRIAL_PRIMES:
+        if n % p == 0:
+            return False
+
+    for limit, bases in _DETERMINISTIC_BASES:
+        if n < limit:
+            return _miller_rabin(n, bases)
+    return _bpsw(n)
+
+
+def _window_survivors(residues: Sequence[int], count: int) -> List[int]:
+    """
+    الإزاحات k < count التي لا يقبل فيها start + 2k القسمة على أي عدد في الغربال
+
+    Args:
+        residues: start mod q لأول len(residues) عدداً أولياً في _WINDOW_PRIMES
+        count: عدد المرشحين الفرديين في النافذة
+
+    Returns:
+        الإزاحات الناجية مرتبة
+    """
+    flags = bytearray(b'\x01') * count
+    zeros = bytes(count)
+    for q, half, r in zip(_WINDOW_PRIMES, _HALF_INVERSES, residues):
+        first = -r * half % q
+        if first < count:
+            flags[first::q] = zeros[:(count - 1 - first) // q + 1]
+    return list(compress(range(count), flags))
+
+
+def _sieved_primes(start: int, stop: Optional[int] = None) -> Iterator[int]:
+    """
+    الأعداد الأولية الفردية في [start, stop) بالترتيب (start فردي ≥ WINDOW_SIEVE_LIMIT)
+
+    تُحسب بواقي start على أعداد الغربال مرة واحدة وتُحدَّث عند الانتقال
+    إلى النافذة التالية، ولا يُختبر بـ BPSW إلا المرشحون الناجون.
+    """
+    bits = start.bit_length()
+    # عرض النافذة يغطي عدة أضعاف متوسط الفجوة (≈ 0.69 × عدد البتات)
+    width = max(64, bits)
+    # كلفة الاختبار الاحتمالي تنمو مع مربع عدد البتات، فيتسع الغربال معها
+    primes = _WINDOW_PRIMES[:min(WINDOW_SIEVE_PRIMES, max(64, bits * bits // 256))]
+    residues = [start % q for q in primes]
+    while stop is None or start < stop:
+        count = width if stop is None else min(width, (stop - start + 1) // 2)
+        for k in _window_survivors(residues, count):
+            if _bpsw(start + 2 * k):
+                yield start + 2 * k
+        step = 2 * count
+        start += step
+        residues = [(r + step) % q for r, q in zip(residues, primes)]
+
+
+def first_prime_in(lo: int, hi: int) -> Optional[int]:
+    """
+    أول عدد أولي في النافذة [lo, hi)
+
+    يطابق اختبار is_prime لكل عدد في النافذة بالترتيب، لكن الأعداد
+    الأكبر من WINDOW_SIEVE_LIMIT تُغربل أولاً بالأعداد الأولية الصغيرة.
+
+    Args:
+        lo: بداية النافذة
+        hi: نهاية النافذة (غير مشمولة)
+
+    Returns:
+        العدد الأولي أو None إذا خلت النافذة منه
+    """
+    lo, hi = int(lo), int(hi)
+    split = min(max(lo, WINDOW_SIEVE_LIMIT), hi)
+    for candidate in range(lo, split):
+        if is_prime(candidate):
+            return candidate
+    if split >= hi:
+        return None
+    return next(_sieved_primes(split | 1, hi), None)
+
+
+def next_prime(n: int) -> int:
+    """أصغر عدد أولي أكبر من n"""
+    n = int(n)
+    if n < 2:
+        return 2
+    if _prime_table is not None and n < _prime_table.limit:
+        found = _prime_table.next_prime(n)
+        if found is not None:
+            return found
+    if n >= WINDOW_SIEVE_LIMIT:
+        return next(_sieved_primes((n + 1) | 1))
+    candidate = n + 1
+    if candidate % 2 == 0:
+        candidate += 1
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
+
+
+def use_prime_table(table) -> None:
+    """
+    تسجيل جدول أعداد أولية معيَّن في الذاكرة (prime_table.PrimeTable)
+
+    بعد التسجيل تصبح is_prime و next_prime تحت حد الجدول قراءات ثابتة
+    الزمن. تمرير None يلغي التسجيل.
+    """
+    global _prime_table
+    _prime_table = table
+
+
+def get_prime_table():
+    """الجدول المسجل حالياً أو None"""
+    return _prime_table
+
+
+def _load_table_from_environment() -> Optional[object]:
+    """تحميل الجدول من المسار في BASIL_PRIME_TABLE إن وُجد"""
+    path = os.environ.get(PRIME_TABLE_ENV)
+    if not path:
+        return None
+    from prime_table import PrimeTable
+    return PrimeTable(path)
+
+
+_prime_table = _load_table_from_environment()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+إحصاءات فجوات الأعداد الأولية على نطاقات ضخمة
+Streaming Prime-Gap Statistics
+
+يمر على النطاق [lo, hi) بالغربال المقطعي ويجمع بذاكرة ثابتة:
+- مدرج تكرار الفجوات (np.bincount لكل مقطع)
+- جداول الفجوات حسب باقي قسمة العدد الأولي الأدنى على 6
+  (الأصناف التي يعتمد عليها تصحيح m(p) في gap_kernel)
+- سجلات الفجوة القصوى: كل فجوة تتجاوز جميع الفجوات قبلها في النطاق
+
+يُقسم النطاق إلى أجزاء تُعالج في مجمع العمليات المشترك، ثم تُدمج النتائج
+الجزئية بالترتيب مع إضافة الفجوة العابرة بين آخر عدد أولي في جزء وأول
+عدد أولي في الجزء التالي، فتطابق النتيجة المرور التسلسلي تماماً.
+
+الاستخدام:
+    stats = gap_statistics(10**9, 10**9 + 10**8, workers=4)
+    stats['histogram'], stats['residue_histograms'][1], stats['records']
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import argparse
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import prime_sieve
+from parallel_pool import get_process_pool, resolve_workers
+
+# أصغر جزء يستحق إرساله إلى عملية (عدد صحيح من مقاطع الغربال)
+MIN_PART_SPAN = 8 * prime_sieve.SEGMENT_SIZE
+
+
+class GapStatistics:
+    """مُجمِّع جارٍ لإحصاءات الفجوات بين أعداد أولية متتالية مرتبة"""
+
+    def __init__(self):
+        self.primes = 0
+        self.first_prime: Optional[int] = None
+        self.last_prime: Optional[int] = None
+        # histogram[g] = عدد الفجوات التي طولها g
+        self.histogram = np.zeros(0, dtype=np.int64)
+        # residue_histogram[r, g] = عدد الفجوات g بعد عدد أولي باقيه r (mod 6)
+        self.residue_histogram = np.zeros((6, 0), dtype=np.int64)
+        # (العدد الأولي الأدنى، الفجوة) لكل رقم قياسي جديد بالترتيب
+        self.records: List[Tuple[int, int]] = []
+
+    @property
+    def max_gap(self) -> int:
+        return self.records[-1][1] if self.records else 0
+
+    @property
+    def max_gap_prime(self) -> Optional[int]:
+        return self.records[-1][0] if self.records else None
+
+    def _grow(self, width: int):
+        """توسيع المدرجات لتتسع لفجوات حتى width - 1"""
+        current = self.histogram.size
+        if width > current:
+            self.histogram = np.concatenate(
+                (self.histogram, np.zeros(width - current, dtype=np.int64)))
+            self.residue_histogram = np.concatenate(
+                (self.residue_histogram, np.zeros((6, width - current), dtype=np.int64)), axis=1)
+
+    def _accumulate(self, lower: np.ndarray, gaps: np.ndarray):
+        """إضافة فجوات مرتبة مع أعدادها الأولية الدنيا"""
+        if gaps.size == 0:
+            return
+
+        width = int(gaps.max()) + 1
+        self._grow(width)
+        self.histogram[:width] += np.bincount(gaps, minlength=width)
+        table = np.bincount((lower % 6) * width + gaps, minlength=6 * width)
+        self.residue_histogram[:, :width] += table.reshape(6, width)
+
+        # الأرقام القياسية: فجوة أكبر من كل ما قبلها (بما في ذلك المقاطع السابقة)
+        previous = np.maximum.accumulate(np.concatenate(([self.max_gap], gaps[:-1])))
+        for i in np.flatnonzero(gaps > previous).tolist():
+            self.records.append((int(lower[i]), int(gaps[i])))
+
+    def add_segment(self, primes: np.ndarray) -> 'GapStatistics':
+        """
+        إضافة المقطع التالي من الأعداد الأولية
+
+        Args:
+            primes: أعداد أولية مرتبة أكبر من جميع ما أضيف سابقاً
+        """
+        primes = np.asarray(primes, dtype=np.int64)
+        if primes.size == 0:
+            return self
+
+        if self.last_prime is not None:
+            # الفجوة العابرة من المقطع السابق
+            primes_with_previous = np.concatenate(([self.last_prime], primes))
+            self._accumulate(primes_with_previous[:-1], np.diff(primes_with_previous))
+        else:
+            self.first_prime = int(primes[0])
+            self._accumulate(primes[:-1], np.diff(primes))
+
+        self.primes += int(primes.size)
+        self.last_prime = int(primes[-1])
+        return self
+
+    def merge(self, other: 'GapStatistics') -> 'GapStatistics':
+        """
+        دمج مُجمِّع لنطاق لاحق مباشرة (تُضاف الفجوة العابرة بين النطاقين)
+
+        Args:
+            other: مُجمِّع نطاق يبدأ بعد نهاية هذا النطاق
+        """
+        if other.primes == 0:
+            return self
+        if self.primes == 0:
+            self.primes = other.primes
+            self.first_prime, self.last_prime = other.first_prime, other.last_prime
+            self.histogram = other.histogram.copy()
+            self.residue_histogram = other.residue_histogram.copy()
+            self.records = list(other.records)
+            return self
+        if other.first_prime <= self.last_prime:
+            raise ValueError("Gap statistics must be merged in increasing order")
+
+        self._accumulate(np.array([self.last_prime], dtype=np.int64),
+                         np.array([other.first_prime - self.last_prime], dtype=np.int64))
+
+        width = other.histogram.size
+        self._grow(width)
+        self.histogram[:width] += other.histogram
+        self.residue_histogram[:, :width] += other.residue_histogram
+
+        # أرقام الجزء اللاحق القياسية تبقى قياسية إذا تجاوزت الحد الحالي
+        threshold = self.max_gap
+        self.records.extend(record for record in other.records if record[1] > threshold)
+
+        self.primes += other.primes
+        self.last_prime = other.last_prime
+        return self
+
+    def to_state(self) -> Dict:
+        """الحالة الكاملة كقاموس قابل لـ JSON و pickle (لنقل النتائج الجزئية)"""
+        return {
+            'primes': self.primes,
+            'first_prime': self.first_prime,
+            'last_prime': self.last_prime,
+            'histogram': self.histogram.tolist(),
+            'residue_histogram': self.residue_histogram.tolist(),
+            'records': [list(record) for record in self.records]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'GapStatistics':
+        """استعادة مُجمِّع من to_state"""
+        statistics = cls()
+        statistics.primes = state['primes']
+        statistics.first_prime = state['first_prime']
+        statistics.last_prime = state['last_prime']
+        statistics.histogram = np.array(state['histogram'], dtype=np.int64)
+        statistics.residue_histogram = np.array(
+            state['residue_histogram'], dtype=np.int64).reshape(6, statistics.histogram.size)
+        statistics.records = [(int(prime), int(gap)) for prime, gap in state['records']]
+        return statistics
+
+    def summary(self) -> Dict:
+        """ملخص قابل لـ JSON (مفاتيح المدرجات أطوال الفجوات)"""
+        pairs = int(self.histogram.sum())
+        gaps = np.flatnonzero(self.histogram)
+        residue_histograms = {}
+        for residue in range(6):
+            row = self.residue_histogram[residue]
+            nonzero = np.flatnonzero(row)
+            if nonzero.size:
+                residue_histograms[residue] = {int(g): int(row[g]) for g in nonzero}
+
+        return {
+            'primes': self.primes,
+            'pairs': pairs,
+            'first_prime': self.first_prime,
+            'last_prime': self.last_prime,
+            'histogram': {int(g): int(self.histogram[g]) for g in gaps},
+            'residue_histograms': residue_histograms,
+            'average_gap': (float(np.dot(gaps, self.histogram[gaps])) / pairs) if pairs else 0.0,
+            'max_gap': self.max_gap,
+            'max_gap_prime': self.max_gap_prime,
+            'records': [{'prime': prime, 'gap': gap} for prime, gap in self.records]
+        }
+
+    def __repr__(self) -> str:
+        return (f"GapStatistics(primes={self.primes}, max_gap={self.max_gap}, "
+                f"max_gap_prime={self.max_gap_prime})")
+
+
+def range_gap_statistics(lo: int, hi: int) -> GapStatistics:
+    """
+    إحصاءات الفجوات لجزء واحد [lo, hi) مقطعاً بعد مقطع (يُنفذ في عملية)
+
+    Args:
+        lo: بداية الجزء
+        hi: نهاية الجزء (غير مشمولة)
+
+    Returns:
+        مُجمِّع الجزء
+    """
+    statistics = GapStatistics()
+    for segment in prime_sieve.iter_segments(lo, hi):
+        statistics.add_segment(segment)
+    return statistics
+
+
+def _split_range(lo: int, hi: int, parts: int) -> List[Tuple[int, int]]:
+    """تقسيم [lo, hi) إلى أجزاء متتالية متساوية تقريباً"""
+    bounds = [lo + (hi - lo) * i // parts for i in range(parts + 1)]
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def gap_statistics(lo: int, hi: int, workers: Optional[int] = 1,
+                   summary: bool = True):
+    """
+    إحصاءات الفجوات بين الأعداد الأولية المتتالية في [lo, hi)
+
+    Args:
+        lo: بداية النطاق
+        hi: نهاية النطاق (غير مشمولة، أقل من 2^63؛ فوق prime_sieve.SIEVE_LIMIT
+            تُختبر المقاطع مباشرة وتكون أبطأ)
+        workers: عدد العمليات (1 تسلسلي، None أو 0 لجميع الأنوية)
+        summary: إرجاع ملخص GapStatistics.summary() بدلاً من المُجمِّع
+
+    Returns:
+        الملخص أو المُجمِّع
+    """
+    lo = max(lo, 0)
+    workers = resolve_workers(workers)
+    parts = max(1, min(4 * workers, math.ceil((hi - lo) / MIN_PART_SPAN))) if hi > lo else 1
+    ranges = _split_range(lo, hi, parts)
+
+    if workers == 1 or len(ranges) <= 1:
+        partials = (range_gap_statistics(a, b) for a, b in ranges)
+    else:
+        pool = get_process_pool(workers)
+        partials = pool.map(range_gap_statistics, *zip(*ranges))
+
+    statistics = GapStatistics()
+    for partial in partials:
+        statistics.merge(partial)
+    return statistics.summary() if summary else statistics
+
+
+def main(argv=None) -> int:
+    """طباعة إحصاءات الفجوات لنطاق من سطر الأوامر"""
+    parser = argparse.ArgumentParser(description='Prime-gap statistics over [lo, hi)')
+    parser.add_argument('lo', type=int)
+    parser.add_argument('hi', type=int)
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: all cores)')
+    args = parser.parse_args(argv)
+
+    stats = gap_statistics(args.lo, args.hi, workers=args.workers)
+    print(f"📊 الأعداد الأولية: {stats['primes']:,} (أزواج: {stats['pairs']:,})")
+    print(f"📏 متوسط الفجوة: {stats['average_gap']:.4f}")
+    print(f"🏆 أكبر فجوة: {stats['max_gap']} بعد {stats['max_gap_prime']}")
+    common = sorted(stats['histogram'].items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f"📊 الفجوات الأكثر شيوعاً: {common}")
+    for residue, histogram in stats['residue_histograms'].items():
+        top = sorted(histogram.items(), key=lambda item: item[1], reverse=True)[:3]
+        print(f"   p ≡ {residue} (mod 6): {sum(histogram.values()):,} فجوة، الأكثر شيوعاً {top}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+الغربال المقطعي للأعداد الأولية
+Segmented Prime Sieve
+
+توليد الأعداد الأولية بدءاً من أي إزاحة باستخدام غربال مقطعي
+بحجم مقطع يناسب الذاكرة المخبئية، مع إعادة استخدام الأعداد الأولية
+الأساسية بين الاستدعاءات.
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import math
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+import primality
+
+# عدد الأعداد الفردية في كل مقطع (بايت واحد لكل عدد ≈ 256 كيلوبايت)
+SEGMENT_SIZE = 1 << 18
+
+# فوق هذا الحد نعود إلى اختبار الأولية المباشر: كلفة المقطع تنمو مع
+# الأعداد الأولية الأساسية حتى √hi (حلقة Python)، فعند 2^52 (4 ملايين عدد
+# أساسي، ~64 ميغابايت) يتساوى زمن المقطع مع اختبار مرشحيه مباشرة، وعند
+# 2^62 كانت تلزم غربلة أساسية بحجم 1 غيغابايت و 10^8 عدد أساسي لكل مقطع
+SIEVE_LIMIT = 1 << 52
+
+# أعلى حد لمقاطع int64 (iter_segments و primes_in_range)
+INT64_LIMIT = 1 << 63
+
+# أقصى امتداد عددي لعنقود نوافذ يُغربل دفعة واحدة (first_prime_offsets)
+MAX_CLUSTER_SPAN = SEGMENT_SIZE
+
+# كلفة تقريبية بوحدة "عدد مُغربل": اختبار نافذة واحدة بـ is_prime، وكل
+# عدد أولي أساسي ≤ √hi في الغربال. العنقود الأقل كلفة بالاختبار المباشر
+# (نوافذ متباعدة) لا يُغربل.
+_WINDOW_TEST_COST = 1500
+_BASE_PRIME_COST = 40
+
+_base_primes = np.array([3, 5, 7], dtype=np.int64)
+_base_limit = 8
+
+
+def _simple_sieve(limit: int) -> np.ndarray:
+    """غربال إراتوستينس للأعداد الأولية الفردية الأقل من limit"""
+    flags = np.ones(limit // 2, dtype=np.bool_)
+    flags[0] = False
+    for i in range(1, (math.isqrt(limit - 1) - 1) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 1
+            flags[p * p // 2::p] = False
+    return 2 * np.flatnonzero(flags).astype(np.int64) + 1
+
+
+def base_primes(limit: int) -> np.ndarray:
+    """
+    الأعداد الأولية الفردية الأقل من أو تساوي limit (مع التخزين المؤقت)
+
+    Args:
+        limit: الحد الأعلى
+
+    Returns:
+        مصفوفة int64 من الأعداد الأولية الفردية
+    """
+    global _base_primes, _base_limit
+
+    if limit >= _base_limit:
+        new_limit = max(limit + 1, 2 * _base_limit)
+        _base_primes = _simple_sieve(new_limit)
+        _base_limit = new_limit
+
+    return _base_primes[:np.searchsorted(_base_primes, limit, side='right')]
+
+
+def _sieve_segment(lo: int, hi: int) -> np.ndarray:
+    """الأعداد الأولية في المقطع [lo, hi) حيث hi - lo <= 2 * SEGMENT_SIZE"""
+    primes = [2] if lo <= 2 < hi else []
+
+    first = max(lo, 3) | 1
+    if first >= hi:
+        return np.array(primes, dtype=np.int64)
+
+    flags = np.ones((hi - first + 1) // 2, dtype=np.bool_)
+    for p in base_primes(math.isqrt(hi - 1)).tolist():
+        start = max(p * p, -(-first // p) * p)
+        if start % 2 == 0:
+            start += p
+        if start >= hi:
+            continue
+        flags[(start - first) // 2::p] = False
+
+    odd = first + 2 * np.flatnonzero(flags).astype(np.int64)
+    if primes:
+        return np.concatenate((np.array(primes, dtype=np.int64), odd))
+    return odd
+
+
+def _tested_segment(lo: int, hi: int) -> np.ndarray:
+    """الأعداد الأولية في [lo, hi) باختبار الأولية المباشر (فوق SIEVE_LIMIT)"""
+    primes = []
+    candidate = primality.next_prime(lo - 1)
+    while candidate < hi:
+        primes.append(candidate)
+        candidate = primality.next_prime(candidate)
+    return np.array(primes, dtype=np.int64)
+
+
+def iter_segments(lo: int, hi: int, segment_size: int = SEGMENT_SIZE) -> Iterator[np.ndarray]:
+    """
+    توليد الأعداد الأولية في [lo, hi) مقطعاً بعد مقطع
+
+    المقاطع فوق SIEVE_LIMIT تُبنى باختبار الأولية المباشر.
+
+    Args:
+        lo: بداية النطاق
+        hi: نهاية النطاق (غير مشمولة)
+        segment_size: عدد الأعداد الفردية في كل مقطع
+
+    Yields:
+        مصفوفة int64 من الأعداد الأولية لكل مقطع
+    """
+    if hi > INT64_LIMIT:
+        raise ValueError(f"Prime segments are int64 arrays: hi must stay below 2^63, got hi={hi}")
+
+    span = 2 * segment_size
+    start = max(lo, 0)
+    while start < hi:
+        stop = min(start + span, hi)
+        yield _sieve_segment(start, stop) if stop <= SIEVE_LIMIT else _tested_segment(start, stop)
+        start = stop
+
+
+def iter_primes(start: int = 2, stop: Optional[int] = None) -> Iterator[int]:
+    """
+    تدفق الأعداد الأولية واحداً بعد الآخر بدءاً من start
+
+    Args:
+        start: نقطة البداية
+        stop: نهاية النطاق (غير مشمولة)، None لتدفق غير محدود
+
+    Yields:
+        الأعداد الأولية بالترتيب
+    """
+    lo = max(start, 0)
+    span = 2 * SEGMENT_SIZE
+    while stop is None or lo < stop:
+        hi = lo + span if stop is None else min(lo + span, stop)
+        if hi > SIEVE_LIMIT:
+            candidate = primality.next_prime(lo - 1)
+            while stop is None or candidate < stop:
+                yield candidate
+                candidate = primality.next_prime(candidate)
+            return
+        yield from _sieve_segment(lo, hi).tolist()
+        lo = hi
+
+
+def primes_in_range(lo: int, hi: int) -> np.ndarray:
+    """جميع الأعداد الأولية في النطاق [lo, hi)"""
+    segments = list(iter_segments(lo, hi))
+    if not segments:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(segments)
+
+
+def primes_from(start: int, count: int) -> List[int]:
+    """
+    أول count عدد أولي أكبر من أو يساوي start
+
+    تبدأ النافذة بتقدير من كثافة الأعداد الأولية (~ 1/ln n) وتتضاعف
+    حتى نجد العدد المطلوب.
+
+    Args:
+        start: نقطة البداية
+        count: عدد الأعداد الأولية المطلوبة
+
+    Returns:
+        قائمة الأعداد الأولية
+    """
+    primes: List[int] = []
+    if count <= 0:
+        return primes
+
+    lo = max(start, 0)
+    window = max(64, int(count * math.log(max(lo, 3)) * 1.25))
+
+    while len(primes) < count:
+        hi = lo + window
+        if hi > SIEVE_LIMIT:
+            # خارج نطاق الغربال: اختبار مباشر للمرشحين
+            candidate = primality.next_prime(lo - 1)
+            while len(primes) < count:
+                primes.append(candidate)
+                candidate = primality.next_prime(candidate)
+            break
+
+        for segment in iter_segments(lo, hi):
+            primes.extend(segment[:count - len(primes)].tolist())
+            if len(primes) >= count:
+                break
+
+        lo = hi
+        window *= 2
+
+    return primes
+
+
+def primes_array(start: int, count: int) -> np.ndarray:
+    """
+    أول count عدد أولي أكبر من أو يساوي start في مصفوفة int64 محجوزة بالحجم الدقيق
+
+    Args:
+        start: نقطة البداية
+        count: عدد الأعداد الأولية المطلوبة
+
+    Returns:
+        مصفوفة int64 بطول count
+    """
+    output = np.empty(max(count, 0), dtype=np.int64)
+    filled = 0
+    lo = max(start, 0)
+    span = 2 * SEGMENT_SIZE
+    while filled < count:
+        if lo + span > SIEVE_LIMIT:
+            # خارج نطاق الغربال: اختبار مباشر للمرشحين
+            candidate = primality.next_prime(lo - 1)
+            while filled < count:
+                output[filled] = candidate
+                filled += 1
+                candidate = primality.next_prime(candidate)
+            break
+        segment = _sieve_segment(lo, lo + span)
+        take = min(segment.size, count - filled)
+        output[filled:filled + take] = segment[:take]
+        filled += take
+        lo += span
+    return output
+
+
+def first_prime_offsets(starts, width: int) -> np.ndarray:
+    """
+    لكل بداية، إزاحة أول عدد أولي في النافذة [start, start + width)
+
+    تُرتب البدايات وتُجمع في عناقيد لا يتجاوز امتدادها MAX_CLUSTER_SPAN،
+    ويُغربل كل عنقود كثيف مرة واحدة في خريطة منطقية تُقرأ منها جميع
+    نوافذه معاً؛ نوافذ العناقيد المتفرقة تُختبر كل منها على حدة.
+
+    Args:
+        starts: مصفوفة البدايات (int64)
+        width: عرض النافذة
+
+    Returns:
+        مصفوفة int64 بالإزاحة k (أول عدد أولي start + k)، أو -1 إذا خلت النافذة
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    offsets = np.full(starts.shape, -1, dtype=np.int64)
+    flat_starts = starts.ravel()
+    flat_offsets = offsets.reshape(-1)
+    if flat_starts.size == 0 or width <= 0:
+        return offsets
+
+    order = np.argsort(flat_starts, kind='stable')
+    ordered = flat_starts[order]
+
+    # حدود العناقيد: خانات ثابتة بطول MAX_CLUSTER_SPAN على محور الأعداد،
+    # فلا يتجاوز امتداد أي عنقود MAX_CLUSTER_SPAN + width مهما تباعدت البدايات
+    breaks = np.flatnonzero(np.diff(ordered // MAX_CLUSTER_SPAN)) + 1
+    bounds = [0] + breaks.tolist() + [ordered.size]
+    columns = np.arange(width, dtype=np.int64)
+
+    for first, last in zip(bounds[:-1], bounds[1:]):
+        # عدد البدايات في العنقود محدود أيضاً (البدايات المكررة)
+        for lo_index in range(first, last, SEGMENT_SIZE):
+            hi_index = min(lo_index + SEGMENT_SIZE, last)
+            cluster = ordered[lo_index:hi_index]
+            lo = max(int(cluster[0]), 0)
+            hi = int(cluster[-1]) + width
+
+            root = math.isqrt(max(hi, 4))
+            sieve_cost = (hi - lo) + _BASE_PRIME_COST * root / math.log(root)
+            if hi > SIEVE_LIMIT or cluster.size * _WINDOW_TEST_COST < sieve_cost:
+                # نوافذ متباعدة أو خارج نطاق الغربال: اختبار كل نافذة مباشرة
+                found = []
+                for start in cluster.tolist():
+                    prime = primality.first_prime_in(start, start + width)
+                    found.append(-1 if prime is None else prime - start)
+                flat_offsets[order[lo_index:hi_index]] = found
+                continue
+
+            flags = np.zeros(hi - lo, dtype=np.bool_)
+            flags[primes_in_range(lo, hi) - lo] = True
+            positions = (cluster - lo)[:, None] + columns
+            windows = flags[np.clip(positions, 0, None)] & (positions >= 0)
+            flat_offsets[order[lo_index:hi_index]] = np.where(
+                windows.any(axis=1), windows.argmax(axis=1), -1)
+
+    return offsets
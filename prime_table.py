@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+جدول الأعداد الأولية المضغوط المعيَّن في الذاكرة
+Gap-Encoded, Memory-Mapped Prime Table
+
+صيغة ملف تُبنى مرة واحدة ثم تُعيَّن في الذاكرة (mmap) عند التشغيل، فتتشاركها
+جميع العمليات عبر ذاكرة الصفحات دون نسخ:
+- خريطة بتات بت واحد لكل عدد فردي (اختبار الأولية بقراءة بت واحد)
+- مصفوفة فجوات uint8 (نصف الفجوة بين الأعداد الأولية الفردية المتتالية)
+- نقاط مرجعية مطلقة uint64 كل checkpoint_interval عدداً أولياً
+
+الاستخدام:
+    python prime_table.py build --limit 1000000000 --output primes.bpt
+    python prime_table.py info primes.bpt
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+import prime_sieve
+
+MAGIC = b'BPTABLE1'
+VERSION = 1
+
+# magic, version, checkpoint_interval, limit, prime_count,
+# bitmap (offset, bytes), gaps (offset, count), checkpoints (offset, count)
+_HEADER = struct.Struct('<8sIIQQQQQQQQ')
+
+DEFAULT_CHECKPOINT_INTERVAL = 256
+
+# أكبر نصف فجوة يمكن ترميزه في uint8 (فجوات حتى 510 أي حتى نحو 3·10^11)
+_MAX_HALF_GAP = 255
+
+# عدد البايتات المقروءة من الخريطة في كل خطوة بحث عن العدد الأولي التالي
+_SCAN_BYTES = 64
+
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return -(-offset // alignment) * alignment
+
+
+def build_prime_table(path: str, limit: int,
+                      checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> 'PrimeTable':
+    """
+    بناء ملف جدول الأعداد الأولية حتى limit (غير مشمول)
+
+    Args:
+        path: مسار الملف الناتج
+        limit: حد الجدول
+        checkpoint_interval: عدد الأعداد الأولية الفردية بين كل نقطتين مرجعيتين
+
+    Returns:
+        الجدول المعيَّن في الذاكرة
+    """
+    if limit < 4:
+        raise ValueError(f"Prime table limit must be at least 4, got {limit}")
+
+    span = 2 * prime_sieve.SEGMENT_SIZE
+    bitmap_offset = _align(_HEADER.size)
+    bitmap_bytes = -(-(limit // 2) // 8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    checkpoints = []
+    odd_count = 0
+    previous = None
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    gaps_file = tempfile.TemporaryFile(dir=directory)
+    try:
+        with os.fdopen(fd, 'w+b') as out:
+            out.write(b'\0' * bitmap_offset)
+
+            # الخريطة والفجوات مقطعاً بعد مقطع (المقاطع محاذية لحدود البايت)
+            for lo in range(0, limit, span):
+                hi = min(lo + span, limit)
+                primes = prime_sieve._sieve_segment(lo, hi)
+                odd = primes[primes > 2]
+
+                bits = np.zeros(-(-(hi - lo) // 16) * 8, dtype=np.bool_)
+                bits[(odd - lo) // 2] = True
+                out.write(np.packbits(bits, bitorder='little').tobytes())
+
+                if odd.size == 0:
+                    continue
+
+                chain = odd if previous is None else np.concatenate(([previous], odd))
+                half_gaps = np.diff(chain) // 2
+                if half_gaps.size and half_gaps.max() > _MAX_HALF_GAP:
+                    raise ValueError(f"Prime gap above {2 * _MAX_HALF_GAP} below {hi}; "
+                                     f"limit too large for the uint8 gap encoding")
+                gaps_file.write(half_gaps.astype(np.uint8).tobytes())
+
+                first_index = (-odd_count) % checkpoint_interval
+                checkpoints.extend(odd[first_index::checkpoint_interval].tolist())
+
+                odd_count += odd.size
+                previous = int(odd[-1])
+
+            out.truncate(bitmap_offset + bitmap_bytes)
+            out.seek(bitmap_offset + bitmap_bytes)
+
+            gaps_offset = bitmap_offset + bitmap_bytes
+            gaps_count = max(odd_count - 1, 0)
+            gaps_file.seek(0)
+            shutil.copyfileobj(gaps_file, out)
+
+            checkpoints_offset = _align(gaps_offset + gaps_count)
+            out.write(b'\0' * (checkpoints_offset - gaps_offset - gaps_count))
+            out.write(np.asarray(checkpoints, dtype='<u8').tobytes())
+
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, VERSION, checkpoint_interval, limit, odd_count + 1,
+                                   bitmap_offset, bitmap_bytes, gaps_offset, gaps_count,
+                                   checkpoints_offset, len(checkpoints)))
+        os.replace(tmp_path, path)
+    finally:
+        gaps_file.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return PrimeTable(path)
+
+
+class PrimeTable:
+    """جدول أعداد أولية معيَّن في الذاكرة للقراءة فقط"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: مسار ملف الجدول المبني بـ build_prime_table
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"Not a prime table file: {path}")
+
+        (magic, version, self.checkpoint_interval, self.limit, self.prime_count,
+         bitmap_offset, bitmap_bytes, gaps_offset, gaps_count,
+         checkpoints_offset, checkpoints_count) = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a prime table file (or unsupported version): {path}")
+
+        self._bitmap = np.memmap(path, dtype=np.uint8, mode='r',
+                                 offset=bitmap_offset, shape=(bitmap_bytes,))
+        self._gaps = np.empty(0, dtype=np.uint8)
+        if gaps_count:
+            self._gaps = np.memmap(path, dtype=np.uint8, mode='r',
+                                   offset=gaps_offset, shape=(gaps_count,))
+        self._checkpoints = np.memmap(path, dtype='<u8', mode='r',
+                                      offset=checkpoints_offset, shape=(checkpoints_count,))
+
+    def __contains__(self, n: int) -> bool:
+        return self.is_prime(n)
+
+    def is_prime(self, n: int) -> bool:
+        """اختبار الأولية بقراءة بت واحد (n < limit)"""
+        if n >= self.limit:
+            raise ValueError(f"{n} is beyond the prime table limit {self.limit}")
+        if n < 3:
+            return n == 2
+        if n % 2 == 0:
+            return False
+        bit = n // 2
+        return bool((int(self._bitmap[bit >> 3]) >> (bit & 7)) & 1)
+
+    def next_prime(self, n: int) -> Optional[int]:
+        """
+        أصغر عدد أولي أكبر من n، أو None إذا تجاوز حد الجدول
+
+        يقرأ نافذة صغيرة من الخريطة بعد n؛ الفجوات محدودة لذا تكفي غالباً
+        قراءة واحدة.
+        """
+        if n < 2:
+            return 2
+        bit = (n + 1) // 2
+        total_bits = self.limit // 2
+        while bit < total_bits:
+            byte = bit >> 3
+            window = int.from_bytes(self._bitmap[byte:byte + _SCAN_BYTES].tobytes(), 'little')
+            window >>= bit & 7
+            if window:
+                # موضع أدنى بت مضبوط
+                candidate = 2 * (bit + (window & -window).bit_length() - 1) + 1
+                return candidate if candidate < self.limit else None
+            bit = (byte + _SCAN_BYTES) * 8
+        return None
+
+    def prime_at(self, index: int) -> int:
+        """العدد الأولي رقم index (بدءاً من الصفر: prime_at(0) = 2)"""
+        if not 0 <= index < self.prime_count:
+            raise IndexError(f"Prime index {index} out of range [0, {self.prime_count})")
+        if index == 0:
+            return 2
+        odd_index = index - 1
+        block, offset = divmod(odd_index, self.checkpoint_interval)
+        start = block * self.checkpoint_interval
+        return int(self._checkpoints[block]) + 2 * int(self._gaps[start:start + offset].sum(dtype=np.int64))
+
+    def prime_pi(self, x: int) -> int:
+        """عدد الأعداد الأولية الأقل من أو تساوي x (x < limit)"""
+        if x >= self.limit:
+            raise ValueError(f"{x} is beyond the prime table limit {self.limit}")
+        if x < 2:
+            return 0
+        if x < 3:
+            return 1
+        block = int(np.searchsorted(self._checkpoints, x, side='right')) - 1
+        start = block * self.checkpoint_interval
+        value = int(self._checkpoints[block])
+        stop = min(start + self.checkpoint_interval - 1, self._gaps.size)
+        steps = np.searchsorted(value + 2 * np.cumsum(self._gaps[start:stop], dtype=np.int64),
+                                x, side='right')
+        return 1 + start + 1 + int(steps)
+
+    def info(self) -> dict:
+        """معلومات الجدول"""
+        return {
+            'path': self.path,
+            'limit': self.limit,
+            'prime_count': self.prime_count,
+            'checkpoint_interval': self.checkpoint_interval,
+            'file_size': os.path.getsize(self.path)
+        }
+
+    def __repr__(self) -> str:
+        return f"PrimeTable(path={self.path!r}, limit={self.limit})"
+
+
+def main(argv=None):
+    """واجهة سطر الأوامر لبناء الجدول وعرض معلوماته"""
+    parser = argparse.ArgumentParser(description='Build or inspect a memory-mapped prime table')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='build a prime table file')
+    build.add_argument('--limit', type=int, required=True, help='table limit (exclusive)')
+    build.add_argument('--output', required=True, help='output file path')
+    build.add_argument('--checkpoint-interval', type=int, default=DEFAULT_CHECKPOINT_INTERVAL)
+
+    info = commands.add_parser('info', help='show table information')
+    info.add_argument('path')
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        table = build_prime_table(args.output, args.limit, args.checkpoint_interval)
+    else:
+        table = PrimeTable(args.path)
+
+    for key, value in table.info().items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
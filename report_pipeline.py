@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+خط إنتاج رسوم التقارير
+Report Figure Pipeline
+
+يرسم أشكال التقارير في مجمع عمليات على واجهة Agg بينما يستمر الحساب في
+العملية الرئيسية، ويغلق كل شكل فور حفظه. لكل شكل بصمة من بياناته ومواصفته
+(دالة الرسم ونصها المصدري، الدقة، خيارات الحفظ)؛ إذا طابقت البصمة سجل
+الرسوم السابق وكان الملف موجوداً لا يُعاد رسمه.
+
+دوال الرسم دوال على مستوى الوحدة تأخذ قاموس بيانات وتعيد شكلاً
+(مثل draw_prediction_analysis)، فتُنقل إلى العمليات بالاسم.
+
+الاستخدام:
+    with ReportPipeline() as report:
+        report.submit('analysis.png', draw_prediction_analysis, data)
+        ...  # حساب آخر أثناء الرسم
+    # عند الخروج: انتظار جميع الرسوم وحفظ السجل
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# اسم ملف سجل الرسوم في مجلد الإخراج
+MANIFEST_NAME = '.figure_manifest.json'
+
+DEFAULT_DPI = 300
+
+# أقصى عدد افتراضي لعمليات الرسم
+DEFAULT_RENDER_WORKERS = 4
+
+
+def _update_hash(digest, value):
+    """إضافة قيمة إلى البصمة بتمثيل ثابت ومحدد النوع"""
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest.update(f"nd:{array.dtype.str}:{array.shape}:".encode())
+        if array.dtype.hasobject:
+            for item in array.ravel().tolist():
+                _update_hash(digest, item)
+        else:
+            digest.update(array.tobytes())
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode())
+        for key in sorted(value, key=repr):
+            _update_hash(digest, key)
+            _update_hash(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}:{len(value)}:".encode())
+        for item in value:
+            _update_hash(digest, item)
+    elif isinstance(value, np.generic):
+        _update_hash(digest, value.item())
+    elif value is None or isinstance(value, (bool, int, float, str, bytes)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    else:
+        raise TypeError(f"Cannot fingerprint figure data of type {type(value).__name__}")
+
+
+def data_fingerprint(value) -> str:
+    """بصمة SHA-256 ثابتة لبيانات شكل (مصفوفات NumPy وقواميس وقوائم وقيم بسيطة)"""
+    digest = hashlib.sha256()
+    _update_hash(digest, value)
+    return digest.hexdigest()
+
+
+def _qualified_name(draw: Callable) -> str:
+    name = f"{draw.__module__}:{draw.__qualname__}"
+    if '<' in draw.__qualname__:
+        raise ValueError(f"Draw function must be defined at module level: {name}")
+    return name
+
+
+def _resolve(name: str) -> Callable:
+    module, _, qualname = name.partition(':')
+    target = importlib.import_module(module)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    return target
+
+
+def spec_fingerprint(draw: Callable, dpi: int, savefig_kwargs: Dict) -> str:
+    """بصمة مواصفة الرسم: اسم الدالة ونصها المصدري والدقة وخيارات الحفظ"""
+    try:
+        source = inspect.getsource(draw)
+    except (OSError, TypeError):
+        source = None
+    return data_fingerprint({'draw': _qualified_name(draw), 'source': source,
+                             'dpi': dpi, 'savefig': savefig_kwargs})
+
+
+def _init_render_worker():
+    """تهيئة عملية الرسم: واجهة Agg دون نوافذ (لا تمس واجهة العملية الرئيسية)"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+
+def render_figure(draw_name: str, data: Dict, output: str, dpi: int, savefig_kwargs: Dict) -> str:
+    """
+    رسم شكل واحد وحفظه ثم إغلاقه
+
+    يُنفذ في عملية رسم مهيأة بـ _init_render_worker، أو في العملية نفسها
+    (workers=0) بواجهة matplotlib التي اختارها المستدعي دون تغييرها.
+
+    Args:
+        draw_name: اسم دالة الرسم 'module:function'
+        data: بيانات الشكل
+        output: مسار الملف
+        dpi: الدقة
+        savefig_kwargs: خيارات savefig إضافية
+
+    Returns:
+        مسار الملف
+    """
+    import matplotlib.pyplot as plt
+
+    fig = _resolve(draw_name)(data)
+    try:
+        # ملف مؤقت ثم استبدال حتى لا يبقى شكل ناقص عند المقاطعة
+        root, extension = os.path.splitext(output)
+        temporary = f"{root}.partial-{os.getpid()}{extension}"
+        fig.savefig(temporary, dpi=dpi, **savefig_kwargs)
+        os.replace(temporary, output)
+    finally:
+        plt.close(fig)
+    return output
+
+
+class ReportPipeline:
+    """رسم أشكال التقارير بالتوازي مع تخطي الأشكال التي لم تتغير"""
+
+    def __init__(self, output_dir: str = '.', workers: Optional[int] = None,
+                 dpi: int = DEFAULT_DPI, force: bool = False):
+        """
+        Args:
+            output_dir: مجلد الأشكال وسجلها
+            workers: عدد عمليات الرسم (None افتراضي، 0 للرسم في العملية نفسها)
+            dpi: الدقة الافتراضية
+            force: إعادة رسم كل شيء وتجاهل السجل
+        """
+        self.output_dir = output_dir
+        self.workers = (min(DEFAULT_RENDER_WORKERS, os.cpu_count() or 1)
+                        if workers is None else workers)
+        self.dpi = dpi
+        self.force = force
+        self.manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        self._manifest = self._load_manifest()
+        self._executor = None
+        self._futures: Dict[str, tuple] = {}
+        self._status: Dict[str, str] = {}
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        temporary = f"{self.manifest_path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, indent=1, sort_keys=True)
+        os.replace(temporary, self.manifest_path)
+
+    def submit(self, filename: str, draw: Callable, data: Dict, dpi: Optional[int] = None,
+               **savefig_kwargs) -> str:
+        """
+        جدولة رسم شكل دون انتظار
+
+        Args:
+            filename: اسم الملف داخل مجلد الإخراج
+            draw: دالة رسم على مستوى الوحدة (data → Figure)
+            data: بيانات الشكل
+            dpi: الدقة (الافتراضي: دقة الخط)
+            **savefig_kwargs: خيارات savefig (الافتراضي bbox_inches='tight')
+
+        Returns:
+            'cached' إذا لم يتغير الشكل، أو 'scheduled'، أو 'rendered' عند الرسم المباشر
+        """
+        dpi = self.dpi if dpi is None else dpi
+        savefig_kwargs = {'bbox_inches': 'tight', **savefig_kwargs}
+        output = os.path.join(self.output_dir, filename)
+        fingerprint = {'data': data_fingerprint(data),
+                       'spec': spec_fingerprint(draw, dpi, savefig_kwargs)}
+
+        entry = self._manifest.get(filename)
+        if (not self.force and entry is not None and os.path.exists(output)
+                and entry.get('data') == fingerprint['data']
+                and entry.get('spec') == fingerprint['spec']):
+            self._status[filename] = 'cached'
+            return 'cached'
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        args = (_qualified_name(draw), data, output, dpi, savefig_kwargs)
+        if self.workers == 0:
+            render_figure(*args)
+            self._record(filename, fingerprint)
+            return 'rendered'
+
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 initializer=_init_render_worker)
+        self._futures[filename] = (self._executor.submit(render_figure, *args), fingerprint)
+        self._status[filename] = 'scheduled'
+        return 'scheduled'
+
+    def _record(self, filename: str, fingerprint: Dict):
+        self._manifest[filename] = {**fingerprint, 'rendered_at': time.time()}
+        self._status[filename] = 'rendered'
+
+    def wait(self) -> Dict[str, str]:
+        """
+        انتظار جميع الرسوم المجدولة وحفظ السجل
+
+        Returns:
+            حالة كل شكل: 'rendered' أو 'cached'
+
+        Raises:
+            أول خطأ رسم (بعد حفظ سجل الأشكال الناجحة)
+        """
+        error = None
+        for filename, (future, fingerprint) in self._futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                self._status[filename] = 'failed'
+                error = error or exc
+            else:
+                self._record(filename, fingerprint)
+        self._futures.clear()
+        self._save_manifest()
+        if error is not None:
+            raise error
+        return dict(self._status)
+
+    def close(self) -> Dict[str, str]:
+        """انتظار الرسوم وإغلاق عمليات الرسم"""
+        try:
+            return self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __enter__(self) -> 'ReportPipeline':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # خطأ قائم: إلغاء الرسوم المعلقة والإغلاق دون إخفائه بخطأ رسم
+        for future, _ in self._futures.values():
+            future.cancel()
+        try:
+            self.close()
+        except Exception:
+            pass
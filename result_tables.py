@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+جداول النتائج العمودية
+Columnar Result Tables
+
+جداول نتائج مبنية مباشرة كأعمدة NumPy متجاورة مُنمَّطة (int64 للأعداد
+الأولية، float32 للثقة، int16 لخطأ الفجوة، bool للصحة) بدلاً من قوائم
+القواميس، مع تصدير إلى Arrow و Parquet و Feather و pandas. الأعمدة
+العددية تُسلَّم إلى Arrow دون نسخ، ويمكن حفظ الجدول كمجلد ملفات npy
+يُعيَّن في الذاكرة عند التحميل.
+
+الاستخدام:
+    results = test_prediction_accuracy(primes, columnar=True)
+    table = results['predictions']
+    table.write_parquet('accuracy.parquet')
+    frame = table.to_pandas()
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+# مخطط سجلات التنبؤ (test_prediction_accuracy)
+PREDICTION_SCHEMA: Dict[str, np.dtype] = {
+    'current': np.dtype(np.int64),
+    'actual_next': np.dtype(np.int64),
+    'predicted_next': np.dtype(np.int64),
+    'is_correct': np.dtype(np.bool_),
+    'gap_error': np.dtype(np.int16),
+    'confidence': np.dtype(np.float32),
+}
+
+# مخطط تفاصيل المقارنة (FinalMethodsComparison.comprehensive_comparison)
+COMPARISON_SCHEMA: Dict[str, np.dtype] = {
+    'prime': np.dtype(np.int64),
+    'predicted': np.dtype(np.int64),
+    'actual': np.dtype(np.int64),
+    'correct': np.dtype(np.bool_),
+    'gap_error': np.dtype(np.int16),
+    'confidence': np.dtype(np.float32),
+    'time': np.dtype(np.float64),
+}
+
+# مخطط أنماط الأعداد الأولية (analyze_prime_patterns)؛ الفجوة 0 للعدد الأخير
+PATTERN_SCHEMA: Dict[str, np.dtype] = {
+    'prime': np.dtype(np.int64),
+    'gap': np.dtype(np.int16),
+    'L': np.dtype(np.float64),
+    'C': np.dtype(np.float64),
+    'R': np.dtype(np.float64),
+    'Q_factor': np.dtype(np.float64),
+    'damping_factor': np.dtype(np.float64),
+    'energy_ratio': np.dtype(np.float64),
+}
+
+_MANIFEST = 'table.json'
+
+
+class ResultTable:
+    """جدول نتائج عمودي: عمود NumPy متجاور لكل حقل"""
+
+    def __init__(self, columns: Mapping[str, np.ndarray]):
+        """
+        Args:
+            columns: الأعمدة بالترتيب (جميعها بنفس الطول)
+        """
+        self._columns: Dict[str, np.ndarray] = {name: np.ascontiguousarray(values)
+                                                for name, values in columns.items()}
+        lengths = {values.shape[0] for values in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def empty(cls, schema: Mapping[str, np.dtype]) -> 'ResultTable':
+        """جدول فارغ بالمخطط المعطى"""
+        return cls({name: np.empty(0, dtype=dtype) for name, dtype in schema.items()})
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping], schema: Mapping[str, np.dtype]) -> 'ResultTable':
+        """بناء جدول من سجلات (قواميس) بالمخطط المعطى"""
+        builder = TableBuilder(schema)
+        builder.extend(records)
+        return builder.build()
+
+    @classmethod
+    def concatenate(cls, tables: List['ResultTable']) -> 'ResultTable':
+        """دمج جداول بنفس الأعمدة بالترتيب"""
+        if not tables:
+            raise ValueError("Need at least one table to concatenate")
+        names = tables[0].names
+        return cls({name: np.concatenate([table[name] for table in tables]) for name in names})
+
+    @property
+    def names(self) -> List[str]:
+        """أسماء الأعمدة بالترتيب"""
+        return list(self._columns)
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """جميع الأعمدة كقاموس"""
+        return dict(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """الحجم الكلي للأعمدة بالبايت"""
+        return sum(values.nbytes for values in self._columns.values())
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key):
+        """عمود بالاسم، أو صف كقاموس بالفهرس"""
+        if isinstance(key, str):
+            return self._columns[key]
+        return {name: values[key].item() for name, values in self._columns.items()}
+
+    def __iter__(self) -> Iterator[Dict]:
+        """الصفوف كقواميس (للتوافق مع مستهلكي قوائم السجلات)"""
+        names = self.names
+        for row in zip(*(values.tolist() for values in self._columns.values())):
+            yield dict(zip(names, row))
+
+    def to_structured(self) -> np.ndarray:
+        """نسخة كمصفوفة NumPy مهيكلة (صف لكل سجل)"""
+        array = np.empty(self._length, dtype=[(name, values.dtype)
+                                              for name, values in self._columns.items()])
+        for name, values in self._columns.items():
+            array[name] = values
+        return array
+
+    def to_arrow(self):
+        """جدول pyarrow.Table (الأعمدة العددية دون نسخ)"""
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise ImportError("pyarrow is required for Arrow/Parquet/Feather export") from exc
+        return pa.table({name: pa.array(values) for name, values in self._columns.items()})
+
+    def to_pandas(self):
+        """إطار pandas.DataFrame بأعمدة بنفس الأنواع"""
+        import pandas as pd
+        return pd.DataFrame(self._columns, copy=False)
+
+    def write_parquet(self, path: str, compression: Optional[str] = 'zstd'):
+        """كتابة الجدول كملف Parquet"""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(), path, compression=compression)
+
+    def write_feather(self, path: str, compression: Optional[str] = 'uncompressed'):
+        """كتابة الجدول كملف Feather (Arrow IPC)؛ دون ضغط يُعيَّن في الذاكرة عند القراءة"""
+        import pyarrow.feather as feather
+        feather.write_feather(self.to_arrow(), path, compression=compression)
+
+    def save(self, directory: str):
+        """
+        حفظ الجدول كمجلد ملفات npy (ملف لكل عمود) دون اعتماديات إضافية
+
+        Args:
+            directory: مجلد الجدول
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, values in self._columns.items():
+            np.save(os.path.join(directory, f"{name}.npy"), values)
+        with open(os.path.join(directory, _MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump({'columns': self.names, 'rows': self._length}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'ResultTable':
+        """
+        تحميل جدول محفوظ بـ save
+
+        Args:
+            directory: مجلد الجدول
+            mmap: تعيين الأعمدة في الذاكرة بدلاً من قراءتها
+
+        Returns:
+            الجدول
+        """
+        with open(os.path.join(directory, _MANIFEST), 'r', encoding='utf-8') as f:
+            names = json.load(f)['columns']
+        mode = 'r' if mmap else None
+        return cls({name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+                    for name in names})
+
+    def __repr__(self) -> str:
+        return f"ResultTable(rows={self._length}, columns={self.names})"
+
+
+def prediction_table(current, actual_next, predicted_next, confidence) -> ResultTable:
+    """
+    جدول تنبؤ (PREDICTION_SCHEMA) مباشرة من مصفوفات التنبؤ المجمع
+
+    Args:
+        current: الأعداد الأولية الحالية
+        actual_next: الأعداد الأولية التالية الفعلية
+        predicted_next: الأعداد المتنبأ بها
+        confidence: مستويات الثقة
+
+    Returns:
+        الجدول (is_correct و gap_error محسوبان من الأعمدة)
+    """
+    actual_next = np.asarray(actual_next, dtype=np.int64)
+    predicted_next = np.asarray(predicted_next, dtype=np.int64)
+    gap_error = np.abs(predicted_next - actual_next)
+    limit = np.iinfo(PREDICTION_SCHEMA['gap_error']).max
+    if gap_error.size and gap_error.max() > limit:
+        # نفس خطأ TableBuilder بدلاً من التفاف القيمة بصمت
+        raise OverflowError(f"gap_error {gap_error.max()} out of bounds for "
+                            f"{PREDICTION_SCHEMA['gap_error']}")
+    columns = {
+        'current': current,
+        'actual_next': actual_next,
+        'predicted_next': predicted_next,
+        'is_correct': predicted_next == actual_next,
+        'gap_error': gap_error,
+        'confidence': confidence,
+    }
+    return ResultTable({name: np.asarray(columns[name], dtype=dtype)
+                        for name, dtype in PREDICTION_SCHEMA.items()})
+
+
+class TableBuilder:
+    """بناء جدول صفاً بعد صف في أعمدة مخصصة مسبقاً تتضاعف عند الامتلاء"""
+
+    def __init__(self, schema: Mapping[str, np.dtype], capacity: int = 1024):
+        """
+        Args:
+            schema: أسماء الأعمدة وأنواعها
+            capacity: السعة الابتدائية
+        """
+        self.schema = dict(schema)
+        self._columns = {name: np.empty(max(capacity, 1), dtype=dtype)
+                         for name, dtype in self.schema.items()}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self):
+        for name, values in self._columns.items():
+            grown = np.empty(2 * values.shape[0], dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._columns[name] = grown
+
+    def append(self, record: Mapping):
+        """إضافة صف من قاموس يحتوي جميع أعمدة المخطط"""
+        if self._size == next(iter(self._columns.values())).shape[0]:
+            self._grow()
+        index = self._size
+        for name, values in self._columns.items():
+            values[index] = record[name]
+        self._size += 1
+
+    def extend(self, records: Iterable[Mapping]):
+        """إضافة عدة صفوف"""
+        for record in records:
+            self.append(record)
+
+    def build(self) -> ResultTable:
+        """الجدول النهائي (نسخة مقصوصة بطول البيانات)"""
+        return ResultTable({name: values[:self._size].copy()
+                            for name, values in self._columns.items()})
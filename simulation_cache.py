@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+ذاكرة التخزين المؤقت لمحاكاة التذبذب
+Simulation Cache
+
+طبقة تخزين مؤقت أمام solve_oscillation و solve_differential_equation:
+- ذاكرة LRU محدودة الحجم مع إحصاءات (إصابات، إخفاقات، إزاحات)
+- طبقة دائمة اختيارية: مجلد ملفات npz يُعاد استخدامه بين التشغيلات
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+import numpy as np
+
+import instrumentation
+
+# متغير البيئة لمجلد الطبقة الدائمة الافتراضي
+CACHE_DIR_ENV = 'BASIL_SIMULATION_CACHE_DIR'
+
+DEFAULT_MAXSIZE = 256
+
+_MISSING = object()
+
+
+class LRUCache:
+    """ذاكرة LRU محدودة الحجم مع إحصاءات"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """
+        Args:
+            maxsize: أقصى عدد من العناصر (0 يعطل التخزين)
+        """
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default=None):
+        """قراءة عنصر وتحديثه كأحدث استخدام"""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value):
+        """إضافة عنصر مع إزاحة الأقدم عند امتلاء الذاكرة"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        """مسح العناصر والإحصاءات"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """إحصاءات الذاكرة"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize
+        }
+
+
+class SimulationCache:
+    """ذاكرة مؤقتة من طبقتين لنتائج المحاكاة"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, directory: Optional[str] = None):
+        """
+        Args:
+            maxsize: حجم ذاكرة LRU في الذاكرة
+            directory: مجلد الطبقة الدائمة (None لتعطيلها)
+        """
+        self.memory = LRUCache(maxsize)
+        self.directory = directory
+        self.disk_hits = 0
+        self.disk_writes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: Hashable) -> str:
+        digest = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.npz")
+
+    def _load(self, key: Hashable) -> Optional[Dict]:
+        """قراءة نتيجة من الطبقة الدائمة"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return {name: data[name].item() if data[name].ndim == 0 else data[name]
+                        for name in data.files}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _store(self, key: Hashable, result: Dict):
+        """كتابة نتيجة إلى الطبقة الدائمة بشكل ذري"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **{name: np.asarray(value) for name, value in result.items()})
+            os.replace(tmp_path, self._path(key))
+            self.disk_writes += 1
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Dict]) -> Dict:
+        """
+        إرجاع النتيجة المخزنة أو حسابها وتخزينها
+
+        المصفوفات المخزنة تُعلَّم للقراءة فقط، ويحصل كل مستدعٍ على نسخ
+        قابلة للتعديل منها فلا يغير أحد النتيجة المشتركة.
+
+        Args:
+            key: مفتاح المحاكاة
+            compute: دالة الحساب عند الإخفاق
+
+        Returns:
+            قاموس النتيجة بنسخ من مصفوفاته
+        """
+        result = self.memory.get(key)
+        if result is None:
+            if self.directory:
+                result = self._load(key)
+                if result is not None:
+                    self.disk_hits += 1
+                    instrumentation.count('simulation_cache.disk_hits')
+            if result is None:
+                instrumentation.count('simulation_cache.misses')
+                result = compute()
+                if self.directory:
+                    self._store(key, result)
+            for value in result.values():
+                if isinstance(value, np.ndarray):
+                    value.setflags(write=False)
+            self.memory.put(key, result)
+        else:
+            instrumentation.count('simulation_cache.hits')
+        return {name: value.copy() if isinstance(value, np.ndarray) else value
+                for name, value in result.items()}
+
+    def clear(self):
+        """مسح ذاكرة LRU (الطبقة الدائمة لا تُمسح)"""
+        self.memory.clear()
+        self.disk_hits = self.disk_writes = 0
+
+    def stats(self) -> Dict:
+        """إحصاءات الطبقتين"""
+        stats = self.memory.stats()
+        stats.update({
+            'disk_hits': self.disk_hits,
+            'disk_writes': self.disk_writes,
+            'directory': self.directory
+        })
+        return stats
+
+
+_default_cache = SimulationCache(directory=os.environ.get(CACHE_DIR_ENV) or None)
+
+
+def get_simulation_cache() -> SimulationCache:
+    """ذاكرة المحاكاة المشتركة على مستوى العملية"""
+    return _default_cache
+
+
+def use_simulation_cache(cache: SimulationCache) -> SimulationCache:
+    """
+    تعيين ذاكرة المحاكاة المشتركة (مثلاً لاستعادة ذاكرة سابقة)
+
+    Args:
+        cache: الذاكرة الجديدة
+
+    Returns:
+        الذاكرة السابقة
+    """
+    global _default_cache
+    previous, _default_cache = _default_cache, cache
+    return previous
+
+
+def configure_simulation_cache(maxsize: int = DEFAULT_MAXSIZE,
+                               directory: Optional[str] = None) -> SimulationCache:
+    """
+    استبدال ذاكرة المحاكاة المشتركة
+
+    Args:
+        maxsize: حجم ذاكرة LRU (0 يعطل الطبقة في الذاكرة)
+        directory: مجلد الطبقة الدائمة (None لتعطيلها)
+
+    Returns:
+        الذاكرة الجديدة
+    """
+    global _default_cache
+    _default_cache = SimulationCache(maxsize, directory)
+    return _default_cache
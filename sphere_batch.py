@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+دفعة الكرات المتذبذبة - الحساب المتجهي للمعاملات
+Vectorized Sphere Batch
+
+يحسب جميع معاملات BasilPrimeTheory._calculate_parameters لمصفوفة كاملة
+من الأعداد الأولية دفعة واحدة، ويحفظ النتائج كأعمدة NumPy بدلاً من
+إنشاء كائن Python لكل عدد أولي.
+
+أستاذ باسل يحيى عبدالله
+"""
+
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+ArrayLike = Union[float, np.ndarray]
+
+# أكبر عدد أولي يكون 4p² عنده ممثلاً تماماً كعدد double (4p² ≤ 2^53)
+_EXACT_RESONANCE_PRIME = 2**25 * 2**0.5
+
+
+class SphereBatch:
+    """دفعة من الكرات المتذبذبة محسوبة كمصفوفات"""
+
+    # الثوابت الفيزيائية (نفس ثوابت BasilPrimeTheory)
+    PI = np.pi
+    HBAR = 1.054571817e-34
+    COSMIC_FREQUENCY = 1 / (4 * PI)
+
+    # الأعمدة المحسوبة: مفاتيح BasilPrimeTheory.get_properties() بترتيبها، مع
+    # time_constant و impedance_magnitude و charge_amplitude الإضافية
+    COLUMNS: Tuple[str, ...] = (
+        'prime', 'radius', 'charge',
+        'surface_area', 'frequency', 'angular_frequency', 'period',
+        'resistance', 'inductance', 'capacitance', 'voltage',
+        'LC_product', 'resonance_condition', 'resonance_error',
+        'natural_frequency', 'damping_factor', 'quality_factor', 'time_constant',
+        'impedance_magnitude', 'charge_amplitude',
+        'quantum_energy', 'zero_point_energy', 'quantum_ratio', 'theoretical_quantum_ratio',
+    )
+
+    def __init__(self, primes, radius: ArrayLike = 1.0, charge: ArrayLike = 1.0):
+        """
+        تهيئة الدفعة
+
+        Args:
+            primes: مصفوفة الأعداد الأولية
+            radius: نصف القطر (قيمة واحدة أو مصفوفة قابلة للبث)
+            charge: الشحنة (قيمة واحدة أو مصفوفة قابلة للبث)
+        """
+        primes = np.asarray(primes, dtype=np.int64)
+        primes, radius, charge = np.broadcast_arrays(
+            primes,
+            np.asarray(radius, dtype=np.float64),
+            np.asarray(charge, dtype=np.float64),
+        )
+
+        self._columns: Dict[str, np.ndarray] = {
+            'prime': np.ascontiguousarray(primes),
+            'radius': np.ascontiguousarray(radius),
+            'charge': np.ascontiguousarray(charge),
+        }
+        self._calculate_parameters()
+
+    def _calculate_parameters(self):
+        """حساب جميع المعاملات كعمليات على المصفوفات الكاملة"""
+        col = self._columns
+        p = col['prime'].astype(np.float64)
+        radius = col['radius']
+        charge = col['charge']
+        pi = self.PI
+
+        # المعاملات الأساسية
+        col['surface_area'] = 4 * pi * radius**2
+        col['frequency'] = p / pi
+        col['angular_frequency'] = 2 * p
+        col['period'] = 2 * pi / col['angular_frequency']
+
+        # المعاملات الكهربائية
+        col['resistance'] = np.sqrt(p)
+        col['inductance'] = col['surface_area'] / (16 * pi**3 * charge)
+        col['capacitance'] = (4 * pi**3 * charge) / (col['surface_area'] * p**2)
+        col['voltage'] = (col['surface_area'] * p**2) / (4 * pi**3)
+
+        # التحقق من شرط الرنين
+        col['LC_product'] = col['inductance'] * col['capacitance']
+        col['resonance_condition'] = 1 / (4 * p**2)
+        # 4p² يتجاوز دقة double: القسمة الصحيحة في Python مقربة تقريباً واحداً
+        # كما في BasilPrimeTheory (وإلا يختلف خطأ الرنين في آخر بت)
+        inexact = p > _EXACT_RESONANCE_PRIME
+        if inexact.any():
+            col['resonance_condition'][inexact] = [
+                1 / (4 * prime**2) for prime in col['prime'][inexact].tolist()
+            ]
+        col['resonance_error'] = (np.abs(col['LC_product'] - col['resonance_condition'])
+                                  / col['resonance_condition'])
+
+        # المعاملات التفاضلية
+        col['natural_frequency'] = 1 / np.sqrt(col['LC_product'])
+        col['damping_factor'] = col['resistance'] / (2 * col['inductance'])
+        col['quality_factor'] = col['natural_frequency'] * col['inductance'] / col['resistance']
+        col['time_constant'] = 2 * col['inductance'] / col['resistance']
+
+        # المعاوقة وسعة الشحنة (النموذج التفاضلي)
+        omega = col['angular_frequency']
+        reactance = omega * col['inductance'] - 1 / (omega * col['capacitance'])
+        col['impedance_magnitude'] = np.sqrt(col['resistance']**2 + reactance**2)
+        col['charge_amplitude'] = p / (pi * col['impedance_magnitude'])
+
+        # المعاملات الكمية
+        col['quantum_energy'] = 2 * self.HBAR * p
+        col['zero_point_energy'] = np.full_like(p, self.HBAR * self.COSMIC_FREQUENCY / 2)
+        col['quantum_ratio'] = col['quantum_energy'] / col['zero_point_energy']
+        col['theoretical_quantum_ratio'] = 16 * pi * p
+
+    def __len__(self) -> int:
+        return self._columns['prime'].size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """الحصول على عمود بالاسم"""
+        return self._columns[name]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get('_columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """جميع الأعمدة كقاموس"""
+        return dict(self._columns)
+
+    def get_properties(self, index: int) -> Dict:
+        """خصائص كرة واحدة من الدفعة (جميع COLUMNS، أي مفاتيح BasilPrimeTheory.get_properties وزيادة)"""
+        return {name: self._columns[name].flat[index].item() for name in self.COLUMNS}
+
+    def __repr__(self) -> str:
+        return f"SphereBatch(size={len(self)})"
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+سجل معاملات الكرة المتذبذبة
+Compact Sphere Parameter Record
+
+سجل ثابت دون __dict__ يحمل الكميات المشتقة لكرة واحدة،
+مع الثوابت الفيزيائية على مستوى الصنف. يُستخدم بدلاً من الاحتفاظ بكائنات
+BasilPrimeTheory أو DifferentialOscillatingSphere كاملة عند تحليل أعداد
+كبيرة من الأعداد الأولية، ويمكن لكلا النموذجين إنتاجه وقبوله.
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import math
+from array import array
+from typing import Dict, Union
+
+import numpy as np
+
+# الكميات العشرية بترتيب التخزين (العدد الأولي يُحفظ منفصلاً كعدد صحيح)
+FLOAT_FIELDS = (
+    'radius', 'charge', 'surface_area', 'frequency', 'angular_frequency', 'period',
+    'resistance', 'inductance', 'capacitance', 'voltage',
+    'LC_product', 'resonance_condition', 'resonance_error',
+    'natural_frequency', 'damping_factor', 'quality_factor', 'time_constant',
+    'impedance_magnitude', 'charge_amplitude', 'voltage_amplitude',
+    'quantum_energy', 'zero_point_energy', 'quantum_ratio', 'theoretical_quantum_ratio',
+)
+
+FIELDS = ('prime',) + FLOAT_FIELDS
+
+# الأعداد الأولية تحت هذا الحد تدخل صيغ المعاملات كأعداد صحيحة كما هي
+EXACT_PRIME_LIMIT = 1 << 64
+
+
+def real_prime(prime: int) -> Union[int, np.float64]:
+    """
+    العدد الأولي بالصيغة المستخدمة في حساب المعاملات الفيزيائية
+
+    الأعداد تحت EXACT_PRIME_LIMIT تُعاد كما هي فتبقى النتائج مطابقة بتاً
+    بتاً، والأكبر منها تُحوَّل إلى np.float64 (أو inf إذا تجاوزت نطاق
+    double) فتفيض الكميات المشتقة إلى inf أو 0 بدل رفع OverflowError.
+
+    Args:
+        prime: العدد الأولي
+
+    Returns:
+        العدد نفسه أو قيمته العشرية
+    """
+    if abs(prime) < EXACT_PRIME_LIMIT:
+        return prime
+    try:
+        return np.float64(float(prime))
+    except OverflowError:
+        return np.float64(math.inf)
+
+
+class SphereParameters:
+    """
+    المعاملات المشتقة لكرة متذبذبة واحدة (ثابتة بعد الإنشاء)
+
+    الكميات العشرية محفوظة كأعداد double متجاورة في مصفوفة واحدة بدلاً من
+    كائن float لكل سمة، فيشغل السجل أقل من نصف ذاكرة النموذج الكامل.
+    """
+
+    __slots__ = ('prime', '_values')
+
+    # الثوابت الفيزيائية (مشتركة على مستوى الصنف)
+    PI = math.pi
+    HBAR = 1.054571817e-34
+    COSMIC_FREQUENCY = 1 / (4 * math.pi)
+    ALPHA_COEFFICIENT = 1 / (4 * math.pi)
+
+    def __init__(self, prime: int, **values: float):
+        """
+        Args:
+            prime: العدد الأولي
+            **values: جميع الكميات في FLOAT_FIELDS
+        """
+        if len(values) != len(FLOAT_FIELDS) or not set(values).issuperset(FLOAT_FIELDS):
+            missing = sorted(set(FLOAT_FIELDS).difference(values))
+            unexpected = sorted(set(values).difference(FLOAT_FIELDS))
+            raise TypeError(f"SphereParameters fields mismatch: missing={missing}, "
+                            f"unexpected={unexpected}")
+        object.__setattr__(self, 'prime', prime)
+        object.__setattr__(self, '_values', array('d', [values[name] for name in FLOAT_FIELDS]))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SphereParameters is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("SphereParameters is immutable")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SphereParameters):
+            return NotImplemented
+        return self.prime == other.prime and self._values == other._values
+
+    def __hash__(self) -> int:
+        return hash((self.prime, self._values.tobytes()))
+
+    def __reduce__(self):
+        return (_restore, (self.prime, self._values.tobytes()))
+
+    def __repr__(self) -> str:
+        return (f"SphereParameters(prime={self.prime}, radius={self.radius}, "
+                f"charge={self.charge})")
+
+    @classmethod
+    @np.errstate(over='ignore', divide='ignore')
+    def from_prime(cls, prime: int, radius: float = 1.0, charge: float = 1.0) -> 'SphereParameters':
+        """
+        حساب السجل من العدد الأولي بمعادلات BasilPrimeTheory
+
+        Args:
+            prime: العدد الأولي
+            radius: نصف قطر الكرة
+            charge: الشحنة
+
+        Returns:
+            سجل المعاملات
+        """
+        pi = cls.PI
+        surface_area = 4 * pi * radius**2
+        inductance = surface_area / (16 * pi**3 * charge)
+        capacitance = (4 * pi**3 * charge) / (surface_area * real_prime(prime)**2)
+        return cls.from_circuit(prime, radius, charge, inductance, capacitance)
+
+    @classmethod
+    @np.errstate(over='ignore', divide='ignore', invalid='ignore')
+    def from_circuit(cls, prime: int, radius: float, charge: float,
+                     inductance: float, capacitance: float) -> 'SphereParameters':
+        """
+        حساب السجل من عناصر الدائرة المعطاة
+
+        يسمح لكل نموذج بتمرير L و C كما حسبهما (النموذج التفاضلي يشتق C
+        من شرط الرنين) فتطابق بقية الكميات قيمه تماماً.
+
+        Args:
+            prime: العدد الأولي
+            radius: نصف قطر الكرة
+            charge: الشحنة
+            inductance: المحاثة L
+            capacitance: السعة C
+
+        Returns:
+            سجل المعاملات
+        """
+        # الأعداد الضخمة تُحسب كـ np.float64 فتفيض الكميات إلى inf أو 0
+        exact_prime, prime = prime, real_prime(prime)
+        pi = cls.PI
+        surface_area = 4 * pi * radius**2
+        angular_frequency = 2 * prime
+        resistance = np.sqrt(prime)
+
+        LC_product = inductance * capacitance
+        resonance_condition = 1 / (4 * prime**2)
+        natural_frequency = 1 / np.sqrt(inductance * capacitance)
+
+        reactance = angular_frequency * inductance - 1 / (angular_frequency * capacitance)
+        impedance_magnitude = np.sqrt(resistance**2 + reactance**2)
+        charge_amplitude = prime / (pi * impedance_magnitude)
+
+        quantum_energy = 2 * cls.HBAR * prime
+        zero_point_energy = cls.HBAR * cls.COSMIC_FREQUENCY / 2
+
+        return cls(
+            prime=exact_prime,
+            radius=radius,
+            charge=charge,
+            surface_area=surface_area,
+            frequency=prime / pi,
+            angular_frequency=angular_frequency,
+            period=2 * pi / angular_frequency,
+            resistance=resistance,
+            inductance=inductance,
+            capacitance=capacitance,
+            voltage=(surface_area * prime**2) / (4 * pi**3),
+            LC_product=LC_product,
+            resonance_condition=resonance_condition,
+            resonance_error=abs(LC_product - resonance_condition) / resonance_condition,
+            natural_frequency=natural_frequency,
+            damping_factor=resistance / (2 * inductance),
+            quality_factor=natural_frequency * inductance / resistance,
+            time_constant=2 * inductance / resistance,
+            impedance_magnitude=impedance_magnitude,
+            charge_amplitude=charge_amplitude,
+            voltage_amplitude=charge_amplitude / capacitance,
+            quantum_energy=quantum_energy,
+            zero_point_energy=zero_point_energy,
+            quantum_ratio=quantum_energy / zero_point_energy,
+            theoretical_quantum_ratio=16 * pi * prime
+        )
+
+    def as_dict(self) -> Dict:
+        """جميع الكميات كقاموس (بترتيب FIELDS)"""
+        return dict(zip(FIELDS, (self.prime, *self._values)))
+
+
+def _field_property(index: int, name: str) -> property:
+    return property(lambda self: self._values[index], doc=name)
+
+
+for _index, _name in enumerate(FLOAT_FIELDS):
+    setattr(SphereParameters, _name, _field_property(_index, _name))
+del _index, _name
+
+
+def _restore(prime: int, buffer: bytes) -> SphereParameters:
+    """إعادة بناء سجل من حالته المحفوظة (لـ pickle بين العمليات)"""
+    parameters = object.__new__(SphereParameters)
+    values = array('d')
+    values.frombytes(buffer)
+    object.__setattr__(parameters, 'prime', prime)
+    object.__setattr__(parameters, '_values', values)
+    return parameters
@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+المسح الموزع بين عدة أجهزة
+Distributed Range Sweeps
+
+منسق يقسم نطاقاً عددياً [lo, hi) إلى أجزاء ويوزعها على عمال عبر TCP
+(multiprocessing.managers)، لاختبار دقة التنبؤ أو تحليل الفجوات. كل جزء
+يُعار لعامل لمدة محددة تُجدد بنبضات دورية؛ إذا توقف العامل انتهت المدة
+وأُعيد الجزء لعامل آخر. النتائج الجزئية لكل جزء تُدمج بترتيب الأجزاء
+فتطابق النتيجة النهائية تشغيلاً تسلسلياً مهما كان عدد العمال أو ترتيبهم.
+
+في اختبار الدقة يُحسب كل عدد أولي p في [lo, hi) مع العدد الأولي التالي له
+(ولو تجاوز hi)، فالأجزاء المتجاورة تغطي جميع الأزواج دون تكرار. تحليل
+الفجوات يستخدم GapStatistics من prime_gaps بنفس اصطلاحه: الفجوات بين
+الأعداد الأولية المتتالية داخل [lo, hi) فقط، وتُضاف الفجوة العابرة بين
+جزأين عند الدمج، فتطابق النتيجة gap_statistics(lo, hi) تماماً.
+
+الاستخدام على جهاز واحد:
+    python sweep_cluster.py coordinator accuracy 1000000000 1010000000 \\
+        --shards 40 --port 50555 --authkey secret
+    python sweep_cluster.py worker --address 127.0.0.1:50555 --authkey secret   # عدة مرات
+
+أو من Python:
+    result = run_local('gaps', 10**9, 10**9 + 10**7, workers=4)
+
+أستاذ باسل يحيى عبدالله
+"""
+
+import argparse
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import primality
+import prime_sieve
+from prediction_metrics import PredictionAggregator
+from prime_counting import nth_prime
+from prime_gaps import GapStatistics, range_gap_statistics
+
+JOBS = ('accuracy', 'gaps')
+
+# مدة إعارة الجزء (ثوانٍ)؛ العامل يجددها كل ربع مدة
+DEFAULT_LEASE = 60.0
+
+# أقصى عدد لمحاولات الجزء الواحد قبل إيقاف المسح
+MAX_SHARD_ATTEMPTS = 3
+
+# انتظار العامل عندما تكون جميع الأجزاء المتبقية معارة
+WAIT_INTERVAL = 0.5
+
+# متغير البيئة لمفتاح المصادقة
+AUTHKEY_ENV = 'BASIL_SWEEP_AUTHKEY'
+
+DEFAULT_PORT = 50555
+
+
+def split_range(lo: int, hi: int, shards: int) -> List[Tuple[int, int]]:
+    """تقسيم [lo, hi) إلى أجزاء متجاورة متقاربة الطول"""
+    shards = max(1, min(shards, hi - lo))
+    bounds = [lo + (hi - lo) * i // shards for i in range(shards + 1)]
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if a < b]
+
+
+def _iter_prime_pairs(lo: int, hi: int):
+    """
+    الأعداد الأولية في [lo, hi) مع العدد الأولي التالي لكل منها، مقطعاً بعد مقطع
+
+    لا يُحتفظ إلا بمقطعين من الغربال في الذاكرة مهما كان طول الجزء.
+
+    Yields:
+        (الأعداد الأولية, الأعداد الأولية التالية) لكل مقطع غير فارغ
+    """
+    previous = None
+    for segment in prime_sieve.iter_segments(max(lo, 2), hi):
+        if segment.size == 0:
+            continue
+        if previous is not None:
+            yield previous, np.append(previous[1:], segment[0])
+        previous = segment
+    if previous is not None:
+        yield previous, np.append(previous[1:], primality.next_prime(int(previous[-1])))
+
+
+def process_shard(job: str, lo: int, hi: int, method: str = 'enhanced') -> Dict:
+    """
+    النتيجة الجزئية لجزء واحد
+
+    يمر على الجزء مقطعاً بعد مقطع من الغربال ويطوي كل مقطع في النتيجة
+    الجزئية، فتبقى الذاكرة محدودة مهما كان طول الجزء.
+
+    Args:
+        job: 'accuracy' (مُجمِّع دقة التنبؤ) أو 'gaps' (حالة GapStatistics)
+        lo, hi: حدود الجزء [lo, hi)
+        method: متنبئ اختبار الدقة ('enhanced' أو 'basil')
+
+    Returns:
+        قاموس قابل لـ pickle و JSON
+    """
+    if job == 'accuracy':
+        if method == 'enhanced':
+            from enhanced_prediction_algorithm import EnhancedPrimePrediction
+            predict = EnhancedPrimePrediction().predict_many
+        else:
+            from basil_prime_theory import BasilPrimeTheory
+            predict = BasilPrimeTheory.predict_next_prime_many
+
+        aggregator = PredictionAggregator()
+        for primes, following in _iter_prime_pairs(lo, hi):
+            predictions = predict(primes)
+            aggregator.merge(PredictionAggregator.from_arrays(
+                predictions['predicted_next'], following, predictions['confidence']))
+        return aggregator.to_state()
+
+    return range_gap_statistics(max(lo, 0), hi).to_state()
+
+
+def merge_partials(job: str, partials: List[Dict]) -> Dict:
+    """
+    دمج النتائج الجزئية بترتيبها
+
+    Returns:
+        ملخص المسح (مقاييس الدقة أو توزيع الفجوات)
+    """
+    if job == 'accuracy':
+        aggregator = PredictionAggregator()
+        for partial in partials:
+            aggregator.merge(PredictionAggregator.from_state(partial))
+        return aggregator.summary()
+
+    statistics = GapStatistics()
+    for partial in partials:
+        statistics.merge(GapStatistics.from_state(partial))
+    return statistics.summary()
+
+
+class ShardCoordinator:
+    """
+    جدول الأجزاء وإعاراتها (يُشارك مع العمال عبر SweepManager)
+
+    جميع الدوال العامة آمنة للاستدعاء من خيوط الخادم المتعددة.
+    """
+
+    def __init__(self, job: str, lo: int, hi: int, shards: int,
+                 method: str = 'enhanced', lease: float = DEFAULT_LEASE):
+        """
+        Args:
+            job: 'accuracy' أو 'gaps'
+            lo, hi: النطاق [lo, hi)
+            shards: عدد الأجزاء
+            method: متنبئ اختبار الدقة
+            lease: مدة إعارة الجزء بالثواني
+        """
+        if job not in JOBS:
+            raise ValueError(f"Unknown job: {job!r} (expected one of {JOBS})")
+        if method not in ('enhanced', 'basil'):
+            raise ValueError(f"Unknown method: {method!r} (expected 'enhanced' or 'basil')")
+        if hi <= lo:
+            raise ValueError("Empty range: hi must be greater than lo")
+
+        self.job = job
+        self.lo = lo
+        self.hi = hi
+        self.method = method
+        self.lease = lease
+        self._shards = [{'id': i, 'lo': a, 'hi': b, 'status': 'pending', 'worker': None,
+                         'deadline': 0.0, 'attempts': 0, 'error': None}
+                        for i, (a, b) in enumerate(split_range(lo, hi, shards))]
+        self._partials: Dict[int, Dict] = {}
+        self._completed_by: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self.reassignments = 0
+        self.failure: Optional[str] = None
+        self.started = time.time()
+
+    def _reap_expired(self, now: float):
+        """إعادة الأجزاء التي انتهت إعارتها (عامل متوقف) إلى قائمة الانتظار"""
+        for shard in self._shards:
+            if shard['status'] == 'leased' and shard['deadline'] < now:
+                shard['status'] = 'pending'
+                shard['worker'] = None
+                self.reassignments += 1
+
+    def request_shard(self, worker_id: str) -> Optional[Dict]:
+        """
+        إعارة الجزء التالي لعامل
+
+        Returns:
+            وصف الجزء، أو {'wait': ثوانٍ} إذا كانت الأجزاء المتبقية معارة،
+            أو None عند انتهاء المسح
+        """
+        with self._lock:
+            if self._finished.is_set():
+                return None
+            now = time.time()
+            self._reap_expired(now)
+            for shard in self._shards:
+                if shard['status'] == 'pending':
+                    shard['status'] = 'leased'
+                    shard['worker'] = worker_id
+                    shard['deadline'] = now + self.lease
+                    shard['attempts'] += 1
+                    return {'id': shard['id'], 'job': self.job, 'lo': shard['lo'],
+                            'hi': shard['hi'], 'method': self.method, 'lease': self.lease}
+            return {'wait': WAIT_INTERVAL}
+
+    def heartbeat(self, worker_id: str, shard_id: int) -> bool:
+        """تجديد إعارة الجزء؛ False إذا لم يعد الجزء معاراً لهذا العامل"""
+        with self._lock:
+            shard = self._shards[shard_id]
+            if shard['status'] != 'leased' or shard['worker'] != worker_id:
+                return False
+            shard['deadline'] = time.time() + self.lease
+            return True
+
+    def submit(self, worker_id: str, shard_id: int, partial: Dict) -> bool:
+        """
+        تسليم النتيجة الجزئية لجزء
+
+        Returns:
+            True إذا قُبلت (تُتجاهل النسخة الثانية لجزء أعيدت إعارته)
+        """
+        with self._lock:
+            shard = self._shards[shard_id]
+            if shard['status'] == 'done':
+                return False
+            shard['status'] = 'done'
+            shard['worker'] = worker_id
+            self._partials[shard_id] = partial
+            self._completed_by[worker_id] = self._completed_by.get(worker_id, 0) + 1
+            if len(self._partials) == len(self._shards):
+                self._finished.set()
+            return True
+
+    def fail(self, worker_id: str, shard_id: int, error: str):
+        """إبلاغ عن خطأ في حساب جزء (يُعاد للانتظار حتى MAX_SHARD_ATTEMPTS)"""
+        with self._lock:
+            shard = self._shards[shard_id]
+            if shard['status'] != 'leased' or shard['worker'] != worker_id:
+                return
+            shard['error'] = error
+            if shard['attempts'] >= MAX_SHARD_ATTEMPTS:
+                shard['status'] = 'failed'
+                self.failure = f"shard {shard_id} [{shard['lo']}, {shard['hi']}): {error}"
+                self._finished.set()
+            else:
+                shard['status'] = 'pending'
+                shard['worker'] = None
+
+    def progress(self) -> Dict:
+        """حالة المسح"""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for shard in self._shards:
+                counts[shard['status']] = counts.get(shard['status'], 0) + 1
+            return {'shards': len(self._shards), 'status': counts,
+                    'reassignments': self.reassignments,
+                    'workers': dict(self._completed_by)}
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """انتظار اكتمال جميع الأجزاء (في عملية المنسق)"""
+        return self._finished.wait(timeout)
+
+    def result(self) -> Dict:
+        """
+        النتيجة المدمجة بترتيب الأجزاء
+
+        Raises:
+            RuntimeError: إذا فشل جزء أو لم يكتمل المسح
+        """
+        with self._lock:
+            if self.failure is not None:
+                raise RuntimeError(f"Sweep failed: {self.failure}")
+            if len(self._partials) != len(self._shards):
+                raise RuntimeError("Sweep is not complete")
+            partials = [self._partials[i] for i in range(len(self._shards))]
+        summary = merge_partials(self.job, partials)
+        summary.update({
+            'job': self.job,
+            'lo': self.lo,
+            'hi': self.hi,
+            'shards': len(self._shards),
+            'reassignments': self.reassignments,
+            'workers': dict(self._completed_by),
+            'elapsed_s': time.time() - self.started
+        })
+        return summary
+
+
+class SweepManager(BaseManager):
+    """مدير TCP يعرض منسق الأجزاء للعمال"""
+
+
+_coordinator: Optional[ShardCoordinator] = None
+
+
+def _get_coordinator() -> ShardCoordinator:
+    return _coordinator
+
+
+SweepManager.register('coordinator', callable=_get_coordinator)
+
+
+def _resolve_authkey(authkey: Optional[str]) -> bytes:
+    authkey = authkey or os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        raise ValueError(f"An authkey is required (--authkey or {AUTHKEY_ENV})")
+    return authkey.encode('utf-8')
+
+
+def start_coordinator(coordinator: ShardCoordinator, host: str = '127.0.0.1',
+                      port: int = DEFAULT_PORT, authkey: Optional[str] = None):
+    """
+    بدء خادم المنسق في خيط خلفي
+
+    Args:
+        coordinator: جدول الأجزاء
+        host: عنوان الاستماع ('0.0.0.0' لقبول عمال من أجهزة أخرى)
+        port: المنفذ (0 لاختيار منفذ حر)
+        authkey: مفتاح المصادقة المشترك مع العمال
+
+    Returns:
+        (الخادم، العنوان الفعلي)
+    """
+    global _coordinator
+    _coordinator = coordinator
+
+    manager = SweepManager(address=(host, port), authkey=_resolve_authkey(authkey))
+    server = manager.get_server()
+    threading.Thread(target=server.serve_forever, name='sweep-coordinator', daemon=True).start()
+    return server, server.address
+
+
+def stop_coordinator(server):
+    """إيقاف خادم المنسق"""
+    server.stop_event.set()
+
+
+def run_coordinator(job: str, lo: int, hi: int, shards: int, host: str = '127.0.0.1',
+                    port: int = DEFAULT_PORT, authkey: Optional[str] = None,
+                    method: str = 'enhanced', lease: float = DEFAULT_LEASE,
+                    verbose: bool = True) -> Dict:
+    """
+    تشغيل المنسق حتى اكتمال جميع الأجزاء
+
+    Returns:
+        النتيجة المدمجة
+    """
+    coordinator = ShardCoordinator(job, lo, hi, shards, method, lease)
+    server, address = start_coordinator(coordinator, host, port, authkey)
+    if verbose:
+        print(f"🛰️ منسق {job} على {address[0]}:{address[1]}: "
+              f"{len(coordinator._shards)} جزء في [{lo}, {hi})")
+    try:
+        while not coordinator.wait(5.0):
+            if verbose:
+                progress = coordinator.progress()
+                print(f"  {progress['status']} (إعادة إعارة: {progress['reassignments']})")
+        return coordinator.result()
+    finally:
+        # مهلة قصيرة حتى يتلقى العمال المنتظرون إشارة الانتهاء
+        time.sleep(2 * WAIT_INTERVAL)
+        stop_coordinator(server)
+
+
+def _heartbeat_loop(coordinator, worker_id: str, shard_id: int, interval: float,
+                    stop: threading.Event):
+    while not stop.wait(interval):
+        try:
+            coordinator.heartbeat(worker_id, shard_id)
+        except (ConnectionError, EOFError, OSError):
+            return
+
+
+def run_worker(address: Tuple[str, int], authkey: Optional[str] = None,
+               worker_id: Optional[str] = None, max_shards: Optional[int] = None,
+               verbose: bool = True) -> int:
+    """
+    عامل: استعارة الأجزاء وحسابها وتسليمها حتى انتهاء المسح
+
+    Args:
+        address: عنوان المنسق (host, port)
+        authkey: مفتاح المصادقة
+        worker_id: معرف العامل (الافتراضي: الجهاز والعملية)
+        max_shards: أقصى عدد من الأجزاء (None حتى النهاية)
+        verbose: طباعة التقدم
+
+    Returns:
+        عدد الأجزاء المقبولة
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    manager = SweepManager(address=tuple(address), authkey=_resolve_authkey(authkey))
+    manager.connect()
+    coordinator = manager.coordinator()
+    accepted = 0
+    processed = 0
+
+    while max_shards is None or processed < max_shards:
+        try:
+            shard = coordinator.request_shard(worker_id)
+        except (ConnectionError, EOFError, OSError):
+            break   # المنسق أُغلق بعد انتهاء المسح
+        if shard is None:
+            break
+        if 'wait' in shard:
+            time.sleep(shard['wait'])
+            continue
+
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat_loop, daemon=True,
+                                args=(coordinator, worker_id, shard['id'], shard['lease'] / 4, stop))
+        beat.start()
+        try:
+            partial = process_shard(shard['job'], shard['lo'], shard['hi'], shard['method'])
+        except Exception as exc:
+            coordinator.fail(worker_id, shard['id'], f"{type(exc).__name__}: {exc}")
+            continue
+        finally:
+            stop.set()
+            beat.join()
+
+        processed += 1
+        if coordinator.submit(worker_id, shard['id'], partial):
+            accepted += 1
+        if verbose:
+            print(f"  {worker_id}: جزء {shard['id']} [{shard['lo']}, {shard['hi']})")
+    return accepted
+
+
+def _local_worker(address, authkey: str):
+    run_worker(address, authkey, verbose=False)
+
+
+def run_local(job: str, lo: int, hi: int, workers: int = 2, shards: Optional[int] = None,
+              method: str = 'enhanced', lease: float = DEFAULT_LEASE) -> Dict:
+    """
+    منسق وعمال محليون على نفس الجهاز (للاختبار والتشغيل على جهاز واحد)
+
+    Returns:
+        النتيجة المدمجة
+    """
+    import multiprocessing
+
+    authkey = secrets.token_hex(16)
+    coordinator = ShardCoordinator(job, lo, hi, shards or 4 * workers, method, lease)
+    server, address = start_coordinator(coordinator, '127.0.0.1', 0, authkey)
+    processes = [multiprocessing.Process(target=_local_worker, args=(address, authkey))
+                 for _ in range(workers)]
+    try:
+        for process in processes:
+            process.start()
+        coordinator.wait()
+        return coordinator.result()
+    finally:
+        for process in processes:
+            process.join(timeout=5 * WAIT_INTERVAL)
+            if process.is_alive():
+                process.terminate()
+        stop_coordinator(server)
+
+
+def _parse_address(text: str) -> Tuple[str, int]:
+    host, _, port = text.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def main(argv=None) -> int:
+    """واجهة سطر الأوامر: coordinator أو worker"""
+    parser = argparse.ArgumentParser(description='Distributed accuracy and gap sweeps')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    coordinator = commands.add_parser('coordinator', help='hand out shards and merge results')
+    coordinator.add_argument('job', choices=JOBS)
+    coordinator.add_argument('lo', type=int)
+    coordinator.add_argument('hi', type=int)
+    coordinator.add_argument('--shards', type=int, default=64)
+    coordinator.add_argument('--index', action='store_true',
+                             help='treat lo and hi as prime indices (1 for 2) instead of numbers')
+    coordinator.add_argument('--host', default='127.0.0.1',
+                             help="bind address ('0.0.0.0' to accept remote workers)")
+    coordinator.add_argument('--port', type=int, default=DEFAULT_PORT)
+    coordinator.add_argument('--authkey', help=f'shared secret (default: ${AUTHKEY_ENV})')
+    coordinator.add_argument('--method', choices=('enhanced', 'basil'), default='enhanced')
+    coordinator.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                             help='seconds before a silent worker loses its shard')
+
+    worker = commands.add_parser('worker', help='process shards from a coordinator')
+    worker.add_argument('--address', required=True, help='coordinator host:port')
+    worker.add_argument('--authkey', help=f'shared secret (default: ${AUTHKEY_ENV})')
+    worker.add_argument('--id', help='worker id (default: host:pid)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'worker':
+        accepted = run_worker(_parse_address(args.address), args.authkey, args.id)
+        print(f"✅ {accepted} جزء مقبول")
+        return 0
+
+    lo, hi = args.lo, args.hi
+    if args.index:
+        # [p_lo, p_hi): الأعداد الأولية ذات الفهارس lo .. hi - 1
+        lo, hi = nth_prime(lo), nth_prime(hi)
+        print(f"🔢 الفهارس [{args.lo}, {args.hi}) → النطاق [{lo}, {hi})")
+
+    result = run_coordinator(args.job, lo, hi, args.shards, args.host, args.port,
+                             args.authkey, args.method, args.lease)
+    if args.job == 'accuracy':
+        print(f"\n✅ الدقة: {result['accuracy']:.1%} "
+              f"({result['correct_predictions']}/{result['total_tests']})")
+        print(f"📏 متوسط خطأ الفجوة: {result['average_gap_error']:.3f}")
+    else:
+        print(f"\n📊 {result['primes']} عدد أولي، متوسط الفجوة {result['average_gap']:.3f}، "
+              f"أكبر فجوة {result['max_gap']} بعد {result['max_gap_prime']}")
+    print(f"🔁 إعادة إعارة: {result['reassignments']}، العمال: {result['workers']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())